@@ -0,0 +1,175 @@
+"""좌석 예약 락 경합 벤치마크 - 격리 수준 / 잠금 방식별 처리량과 지연 비교
+
+사용 예:
+    python benchmark_locking.py                                   # 기본 4가지 설정 비교
+    python benchmark_locking.py --users 500 --seats 50 --threads 32
+    python benchmark_locking.py --settings "READ COMMITTED/nowait" "READ COMMITTED/skip_locked"
+
+벤치마크용 공연(좌석 --seats석)과 사용자(bench1 ~)를 만든 뒤, 설정마다 좌석을 비우고
+--threads개 스레드가 사용자마다 임의의 좌석으로 reserve_seat_safe()를 최대 --attempts번
+(성공할 때까지) 호출합니다. 적은 좌석에 많은 사용자가 몰리는 인기 공연 상황입니다.
+nowait / skip_locked는 MySQL 8.0 이상이 필요합니다.
+"""
+import argparse
+import logging
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+DEFAULT_SETTINGS = [
+    "REPEATABLE READ/wait",
+    "READ COMMITTED/wait",
+    "READ COMMITTED/nowait",
+    "READ COMMITTED/skip_locked",
+]
+
+
+def percentile(values, p):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p / 100))]
+
+
+def prepare(args):
+    """벤치마크 공연 + 사용자 준비 -> (event_id, 좌석 id 목록, 사용자 id 목록)"""
+    from database import create_event, get_all_seats, bulk_create_users, get_user_id
+    from utils.user_import import generate_users
+
+    layout = {"sections": [{"name": "B", "rows": 1, "seats_per_row": args.seats}]}
+    event_id = create_event("락 경합 벤치마크", layout=layout)["event_id"]
+    seat_ids = [seat["id"] for seat in get_all_seats(event_id)]
+
+    # 해싱 비용은 측정 대상이 아니므로 scrypt N을 최소로
+    bulk_create_users(generate_users(args.prefix, args.users), scrypt_n=2)
+    user_ids = [get_user_id(f"{args.prefix}{i}") for i in range(1, args.users + 1)]
+    return event_id, seat_ids, user_ids
+
+
+def reset_seats(event_id):
+    from database import get_connection
+    from database.counters import init_event_occupancy
+    conn = get_connection()
+    cursor = conn.cursor()
+    cursor.execute('''
+        UPDATE seats SET status = 'available', reserved_by = NULL, reserved_at = NULL, held_until = NULL
+        WHERE event_id = %s
+    ''', (event_id,))
+    init_event_occupancy(cursor, event_id)
+    conn.commit()
+    conn.close()
+
+
+def count_violations(event_id) -> int:
+    """좌석을 두 개 이상 가진 사용자 수 (1인 1좌석 위반, 항상 0이어야 함)"""
+    from database import get_connection
+    conn = get_connection()
+    cursor = conn.cursor()
+    cursor.execute('''
+        SELECT COUNT(*) FROM (
+            SELECT reserved_by FROM seats WHERE event_id = %s AND reserved_by IS NOT NULL
+            GROUP BY reserved_by HAVING COUNT(*) > 1
+        ) t
+    ''', (event_id,))
+    count = cursor.fetchone()[0]
+    conn.close()
+    return count
+
+
+def run(setting, args, event_id, seat_ids, user_ids) -> dict:
+    """설정 하나로 경합 시나리오 실행"""
+    from database import (declare_transaction, reserve_seat_safe, get_query_stats, reset_query_stats,
+                          get_retry_stats, reset_retry_stats)
+    from database.seats import REJECT_MESSAGES
+
+    isolation, lock = setting.split("/")
+    declare_transaction("reserve_seat_safe", isolation=isolation, lock=lock)
+    reset_seats(event_id)
+    reset_query_stats()
+    reset_retry_stats()
+
+    latencies = []
+    outcomes = {"success": 0, "conflict": 0, "locked": 0, "busy": 0, "other": 0}
+    results_lock = threading.Lock()
+
+    def user_session(user_id):
+        rng = random.Random(user_id)
+        for _ in range(args.attempts):
+            start = time.perf_counter()
+            result = reserve_seat_safe(user_id, rng.choice(seat_ids), event_id)
+            elapsed = (time.perf_counter() - start) * 1000
+            if result["success"]:
+                outcome = "success"
+            elif result.get("retryable"):
+                outcome = "busy"
+            elif result["message"] == REJECT_MESSAGES["locked"]:
+                outcome = "locked"
+            elif result["message"] in (REJECT_MESSAGES["already_reserved"], REJECT_MESSAGES["held"]):
+                outcome = "conflict"
+            else:
+                outcome = "other"
+            with results_lock:
+                latencies.append(elapsed)
+                outcomes[outcome] += 1
+            if outcome == "success":
+                return
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.threads) as executor:
+        list(executor.map(user_session, user_ids))
+    seconds = time.perf_counter() - start
+
+    query = get_query_stats().get("reserve_seat_safe", {})
+    retry = get_retry_stats().get("reserve_seat_safe", {})
+    return dict(
+        outcomes,
+        setting=setting,
+        requests=len(latencies),
+        seconds=seconds,
+        throughput=len(latencies) / seconds if seconds else 0.0,
+        p50=percentile(latencies, 50),
+        p95=percentile(latencies, 95),
+        max=max(latencies, default=0.0),
+        locking_read_ms=query.get("locking_read_ms", 0.0),
+        deadlocks=query.get("deadlocks", 0),
+        lock_timeouts=query.get("lock_timeouts", 0),
+        retries=retry.get("retries", 0),
+        violations=count_violations(event_id),
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="좌석 예약 락 경합 벤치마크 (격리 수준 / 잠금 방식별)")
+    parser.add_argument("--users", type=int, default=200, help="동시에 예약하는 사용자 수")
+    parser.add_argument("--seats", type=int, default=20, help="경합 대상 좌석 수")
+    parser.add_argument("--threads", type=int, default=16, help="동시 실행 스레드 수 (DB 연결 수)")
+    parser.add_argument("--attempts", type=int, default=5, help="사용자당 최대 예약 시도 횟수")
+    parser.add_argument("--prefix", default="bench", help="벤치마크 사용자 이름 접두어")
+    parser.add_argument("--settings", nargs="+", default=DEFAULT_SETTINGS,
+                        help='비교할 설정 "격리 수준/잠금 방식" (잠금 방식: wait, nowait, skip_locked)')
+    args = parser.parse_args()
+
+    # 거절 로그(WARNING)가 결과를 덮지 않도록 ERROR만 출력
+    logging.basicConfig(level=logging.ERROR)
+    from database import init_db
+    init_db()
+
+    event_id, seat_ids, user_ids = prepare(args)
+    print(f"🎫 공연 {event_id}: 좌석 {len(seat_ids)}석, 사용자 {len(user_ids)}명, 스레드 {args.threads}개")
+
+    results = [run(setting, args, event_id, seat_ids, user_ids) for setting in args.settings]
+
+    print(f"\n{'설정':<28}{'req/s':>8}{'p50':>8}{'p95':>8}{'max':>8}  {'성공':>5}{'충돌':>6}{'잠김':>6}"
+          f"{'혼잡':>6}  {'잠금 읽기(ms)':>11}{'데드락':>7}{'타임아웃':>8}{'재시도':>7}{'위반':>5}")
+    for r in results:
+        print(f"{r['setting']:<28}{r['throughput']:>8.1f}{r['p50']:>8.1f}{r['p95']:>8.1f}{r['max']:>8.1f}  "
+              f"{r['success']:>5}{r['conflict']:>6}{r['locked']:>6}{r['busy']:>6}  "
+              f"{r['locking_read_ms']:>11.1f}{r['deadlocks']:>7}{r['lock_timeouts']:>8}{r['retries']:>7}"
+              f"{r['violations']:>5}")
+    print("\n충돌 = 이미 예약/선점된 좌석, 잠김 = NOWAIT/SKIP LOCKED로 기다리지 않고 거절, "
+          "혼잡 = 재시도 후에도 데드락/타임아웃, 잠금 읽기 = FOR UPDATE 문장 실행 시간 합 (락 대기 포함)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,29 @@
 """데이터베이스 함수 모음 - 모든 함수를 여기서 import"""
 
-from .base import get_connection
+from .base import (
+    get_connection,
+    get_read_connection,
+    declare_transaction,
+    begin_transaction,
+    get_transaction_options
+)
+from .instrumentation import get_query_stats, reset_query_stats
+from .singleflight import get_singleflight_stats, reset_singleflight_stats
+from .retry import get_retry_stats, reset_retry_stats
 from .init import init_db
+from .versions import get_version, refresh_versions, scoped_name
+from .idempotency import (
+    get_idempotency_record,
+    claim_idempotency_key,
+    complete_idempotency_key,
+    release_idempotency_key
+)
 from .users import (
     hash_password,
+    verify_password,
     create_user,
+    bulk_create_users,
+    authenticate_user,
     verify_user,
     get_user_id
 )
@@ -16,25 +35,74 @@ from .items import (
     purchase_item_safe,
     get_user_purchases
 )
+from .exports import (
+    PURCHASE_EXPORT_FIELDS,
+    RESERVATION_EXPORT_FIELDS,
+    iter_purchases,
+    iter_reservations
+)
+from .counters import (
+    rebuild_counters,
+    get_event_occupancy,
+    get_item_sales
+)
 from .seats import (
     init_sample_seats,
+    create_event,
+    get_all_events,
+    get_event,
     get_all_seats,
     reserve_seat_unsafe,
     reserve_seat_safe,
+    reserve_seats_group,
+    reserve_any_seat,
+    hold_seat,
+    expire_holds,
+    get_active_holds,
     cancel_reservation,
-    get_user_reservation
+    get_user_reservations
 )
 
 __all__ = [
     # base
     'get_connection',
+    'get_read_connection',
+    'declare_transaction',
+    'begin_transaction',
+    'get_transaction_options',
+    
+    # instrumentation
+    'get_query_stats',
+    'reset_query_stats',
+    
+    # singleflight
+    'get_singleflight_stats',
+    'reset_singleflight_stats',
+    
+    # retry
+    'get_retry_stats',
+    'reset_retry_stats',
     
     # init
     'init_db',
     
+    # versions
+    'get_version',
+    'refresh_versions',
+    'scoped_name',
+    
+    # idempotency
+    'get_idempotency_record',
+    'claim_idempotency_key',
+    'complete_idempotency_key',
+    'release_idempotency_key',
+    
     # users
     'hash_password',
+    'verify_password',
     'create_user',
+    'bulk_create_users',
+    'authenticate_user',
     'verify_user',
     'get_user_id',
     
@@ -46,11 +114,30 @@ __all__ = [
     'purchase_item_safe',
     'get_user_purchases',
     
+    # exports
+    'PURCHASE_EXPORT_FIELDS',
+    'RESERVATION_EXPORT_FIELDS',
+    'iter_purchases',
+    'iter_reservations',
+    
+    # counters
+    'rebuild_counters',
+    'get_event_occupancy',
+    'get_item_sales',
+    
     # seats
     'init_sample_seats',
+    'create_event',
+    'get_all_events',
+    'get_event',
     'get_all_seats',
     'reserve_seat_unsafe',
     'reserve_seat_safe',
+    'reserve_seats_group',
+    'reserve_any_seat',
+    'hold_seat',
+    'expire_holds',
+    'get_active_holds',
     'cancel_reservation',
-    'get_user_reservation',
+    'get_user_reservations',
 ]
@@ -1,8 +1,195 @@
-"""데이터베이스 연결 관리"""
+"""데이터베이스 연결 관리
+
+쓰기/트랜잭션은 항상 primary(get_connection)를 사용하고,
+읽기 전용 조회는 get_read_connection()으로 복제본(MYSQL_REPLICA_CONFIGS)에 분산합니다.
+
+read-your-writes: 쓰기 함수가 bump_version(..., {"user_id": ...})으로 남긴 버전을 기록해 두고,
+READ_YOUR_WRITES_SECONDS 동안은 복제본의 data_versions가 그 버전에 도달했는지 확인한 뒤 읽습니다.
+아직 반영되지 않았으면 primary에서 읽습니다.
+- user_id를 주는 조회(내 예약/구매 내역): 그 사용자의 최근 쓰기 기준
+- 전체 조회(좌석/아이템 목록): 이 워커의 최근 쓰기 기준 (쓰기 직후 브로드캐스트가 옛 상태를 보내지 않도록)
+
+트랜잭션 설정: 쓰기 작업은 모듈 로드 시 declare_transaction()으로 격리 수준 / 잠금 읽기 방식 /
+락 대기 제한을 선언하고, begin_transaction(작업 이름)으로 그 설정이 적용된 트랜잭션을 시작합니다.
+"""
+import itertools
+import logging
+import sys
+import threading
+import time
+
 import pymysql
-from config import MYSQL_CONFIG
+from config import MYSQL_CONFIG, MYSQL_REPLICA_CONFIGS, READ_YOUR_WRITES_SECONDS, TX_ISOLATION, TX_LOCK_WAIT_TIMEOUT
+from .instrumentation import InstrumentedConnection
+
+logger = logging.getLogger(__name__)
+
+_replicas = itertools.cycle(range(len(MYSQL_REPLICA_CONFIGS)))
+_replicas_lock = threading.Lock()
+
+# 최근 쓰기 버전: (데이터 이름, user_id 또는 None) -> (버전, 기록 시각)
+_write_floors = {}
+_write_floors_lock = threading.Lock()
+
+# 격리 수준 이름 -> transaction_isolation 세션 변수 값
+ISOLATION_LEVELS = {
+    "READ UNCOMMITTED": "READ-UNCOMMITTED",
+    "READ COMMITTED": "READ-COMMITTED",
+    "REPEATABLE READ": "REPEATABLE-READ",
+    "SERIALIZABLE": "SERIALIZABLE",
+}
+
+# 잠금 읽기 방식 -> SELECT 끝에 붙는 절 (nowait / skip_locked는 MySQL 8.0 이상)
+# - wait: 다른 트랜잭션이 잠근 행은 innodb_lock_wait_timeout까지 대기
+# - nowait: 잠긴 행을 만나면 바로 ER_LOCK_NOWAIT(3572) 오류
+# - skip_locked: 잠긴 행은 결과에서 빼고 반환 (빈 좌석 아무거나 고르기 등)
+LOCK_CLAUSES = {
+    "wait": "FOR UPDATE",
+    "nowait": "FOR UPDATE NOWAIT",
+    "skip_locked": "FOR UPDATE SKIP LOCKED",
+}
+
+# 작업 이름 -> 트랜잭션 설정 (declare_transaction)
+_transaction_options = {}
+
+
+def _isolation_name(isolation: str) -> str:
+    """'read-committed', 'READ_COMMITTED' 같은 표기도 허용"""
+    name = " ".join(isolation.replace("-", " ").replace("_", " ").upper().split())
+    if name not in ISOLATION_LEVELS:
+        raise ValueError(f"알 수 없는 격리 수준입니다: {isolation}")
+    return name
+
+
+def declare_transaction(name: str, isolation: str = TX_ISOLATION, lock: str = "wait",
+                        lock_wait_timeout: int = TX_LOCK_WAIT_TIMEOUT):
+    """
+    작업의 트랜잭션 설정 선언
+
+    isolation: ISOLATION_LEVELS 중 하나 (None이면 서버 기본값, 보통 REPEATABLE READ)
+    lock: LOCK_CLAUSES 중 하나 - 작업의 잠금 읽기에 붙는 절 (begin_transaction이 반환한 연결의 lock_clause)
+    lock_wait_timeout: 행 락 대기 최대 초 (None이면 서버 기본값)
+    같은 이름으로 다시 선언하면 설정이 바뀝니다 (벤치마크에서 설정별 비교).
+    """
+    if isolation is not None:
+        isolation = _isolation_name(isolation)
+    if lock not in LOCK_CLAUSES:
+        raise ValueError(f"알 수 없는 잠금 방식입니다: {lock}")
+    if lock_wait_timeout is not None and lock_wait_timeout < 1:
+        raise ValueError("lock_wait_timeout은 1초 이상이어야 합니다")
+    _transaction_options[name] = {"isolation": isolation, "lock": lock, "lock_wait_timeout": lock_wait_timeout}
+
+
+def get_transaction_options() -> dict:
+    """작업별 트랜잭션 설정"""
+    return {name: dict(options) for name, options in _transaction_options.items()}
+
+
+def begin_transaction(name: str):
+    """
+    선언된 설정으로 트랜잭션을 시작한 연결 (primary, 쿼리 계측 태그 = 작업 이름)
+
+    세션 변수는 SET 한 문장으로 바꾸고 바로 BEGIN 합니다.
+    잠금 읽기는 연결의 lock_clause를 붙여 작업에 선언된 방식을 따릅니다:
+        conn = begin_transaction("hold_seat")
+        cursor.execute("SELECT ... WHERE id = %s " + conn.lock_clause, (seat_id,))
+    """
+    options = _transaction_options.get(name)
+    if options is None:
+        raise KeyError(f"선언되지 않은 트랜잭션입니다: {name}")
+
+    conn = get_connection(name)
+    try:
+        settings, params = [], []
+        if options["isolation"] is not None:
+            settings.append("transaction_isolation = %s")
+            params.append(ISOLATION_LEVELS[options["isolation"]])
+        if options["lock_wait_timeout"] is not None:
+            settings.append("innodb_lock_wait_timeout = %s")
+            params.append(options["lock_wait_timeout"])
+        if settings:
+            conn.cursor().execute("SET SESSION " + ", ".join(settings), params)
+        conn.begin()
+    except Exception:
+        conn.close()
+        raise
+    conn.lock_mode = options["lock"]
+    conn.lock_clause = LOCK_CLAUSES[options["lock"]]
+    return conn
+
+
+def get_connection(tag: str = None, local_infile: bool = False):
+    """
+    MySQL 연결 생성 (primary)
+
+    반환되는 연결은 쿼리 계측 래퍼로 감싸져 있으며, tag를 생략하면
+    호출한 함수 이름(예: reserve_seat_safe)이 태그로 사용됩니다.
+    local_infile은 LOAD DATA LOCAL INFILE을 쓰는 대량 적재 연결에만 켭니다.
+    """
+    if tag is None:
+        tag = sys._getframe(1).f_code.co_name
+    return InstrumentedConnection(pymysql.connect(**MYSQL_CONFIG, local_infile=local_infile), tag)
+
+
+def record_write(name: str, version: int, user_id=None):
+    """쓰기로 올라간 데이터 버전 기록 (read-your-writes 판단용)"""
+    now = time.monotonic()
+    with _write_floors_lock:
+        _write_floors[(name, None)] = (version, now)
+        if user_id is not None:
+            _write_floors[(name, user_id)] = (version, now)
+        # 오래된 사용자 기록 정리 (사용자 수만큼 쌓이지 않도록)
+        if len(_write_floors) > 10000:
+            for key in [k for k, (_, at) in _write_floors.items() if now - at > READ_YOUR_WRITES_SECONDS]:
+                del _write_floors[key]
+
+
+def _write_floor(name: str, user_id) -> int:
+    """복제본이 도달해야 하는 최소 버전 (확인이 필요 없으면 0)"""
+    now = time.monotonic()
+    floor = 0
+    with _write_floors_lock:
+        for key in ((name, None), (name, user_id)) if user_id is not None else ((name, None),):
+            entry = _write_floors.get(key)
+            if entry and now - entry[1] <= READ_YOUR_WRITES_SECONDS:
+                floor = max(floor, entry[0])
+    return floor
+
+
+def _replica_connection(tag: str):
+    """복제본 연결 (라운드 로빈, 연결 실패 시 다음 복제본, 모두 실패하면 None)"""
+    for _ in range(len(MYSQL_REPLICA_CONFIGS)):
+        with _replicas_lock:
+            index = next(_replicas)
+        try:
+            return InstrumentedConnection(pymysql.connect(**MYSQL_REPLICA_CONFIGS[index]), tag)
+        except pymysql.MySQLError as e:
+            logger.warning("replica %d connect failed: %s", index, e)
+    return None
+
+
+def get_read_connection(name: str, user_id=None, tag: str = None):
+    """
+    읽기 전용 연결 (복제본이 없거나 최근 쓰기를 아직 반영하지 못했으면 primary)
+
+    name은 조회 대상 데이터 버전 이름("seats", "items")입니다.
+    """
+    if tag is None:
+        tag = sys._getframe(1).f_code.co_name
+    if not MYSQL_REPLICA_CONFIGS:
+        return get_connection(tag)
 
+    conn = _replica_connection(tag)
+    if conn is None:
+        return get_connection(tag)
 
-def get_connection():
-    """MySQL 연결 생성"""
-    return pymysql.connect(**MYSQL_CONFIG)
+    floor = _write_floor(name, user_id)
+    if floor:
+        cursor = conn.cursor()
+        cursor.execute("SELECT version FROM data_versions WHERE name = %s", (name,))
+        row = cursor.fetchone()
+        if not row or row[0] < floor:
+            # 복제 지연: 최근 쓰기가 아직 복제본에 없음
+            conn.close()
+            return get_connection(tag)
+    return conn
@@ -0,0 +1,159 @@
+"""판매 / 좌석 점유 집계 카운터
+
+구매 내역 COUNT/SUM이나 전체 좌석 필터링 대신, 쓰기와 같은 트랜잭션에서 증분으로 갱신하는 카운터입니다.
+- item_sales (item_id): 판매 수량 / 매출 / 구매 건수
+- seat_occupancy (event_id, row_num, slot): 행별 전체 / 예약 / 선점 좌석 수
+
+좌석 카운터는 행마다 OCCUPANCY_COUNTER_SLOTS개 슬롯(좌석 id % 슬롯 수)으로 나눠 두어,
+같은 행의 동시 예약이 카운터 행 하나의 락에 줄 서지 않게 하고 조회할 때 슬롯을 합산합니다.
+카운터 갱신은 쓰기 트랜잭션의 마지막(커밋 직전)에 (row_num, slot) 순서로 해서
+락을 잡는 시간을 줄이고, 여러 트랜잭션이 항상 같은 순서로 잠그게 합니다.
+카운터 테이블에는 외래 키를 두지 않습니다 (갱신마다 부모 행에 공유 락이 걸리지 않도록).
+증분 UPSERT는 VALUES() 대신 행 별칭(AS new)을 씁니다 (MySQL 8.0.19 이상).
+"""
+import logging
+
+from config import OCCUPANCY_COUNTER_SLOTS
+from .base import get_connection, get_read_connection
+from .versions import scoped_name
+from .singleflight import coalesced
+
+logger = logging.getLogger(__name__)
+
+# 카운터를 갱신하는 좌석 상태 (available은 전체 - 예약 - 선점)
+COUNTED_STATUSES = ("reserved", "held")
+
+
+def apply_seat_changes(cursor, event_id: int, changes):
+    """
+    좌석 상태 변화를 점유 카운터에 반영 (좌석 쓰기와 같은 트랜잭션, 커밋 직전에 호출)
+
+    changes: (seat_id, row_num, 이전 상태, 새 상태) 목록
+    """
+    deltas = {}
+    for seat_id, row_num, old_status, new_status in changes:
+        if old_status == new_status:
+            continue
+        delta = deltas.setdefault((row_num, seat_id % OCCUPANCY_COUNTER_SLOTS), {"reserved": 0, "held": 0})
+        if old_status in delta:
+            delta[old_status] -= 1
+        if new_status in delta:
+            delta[new_status] += 1
+
+    params = []
+    for (row_num, slot), delta in sorted(deltas.items()):
+        if delta["reserved"] or delta["held"]:
+            params += [event_id, row_num, slot, delta["reserved"], delta["held"]]
+    if not params:
+        return
+    cursor.execute(
+        "INSERT INTO seat_occupancy (event_id, row_num, slot, reserved, held) VALUES "
+        + ", ".join(["(%s, %s, %s, %s, %s)"] * (len(params) // 5))
+        + " AS new ON DUPLICATE KEY UPDATE reserved = reserved + new.reserved, held = held + new.held",
+        params
+    )
+
+
+def record_sale(cursor, item_id: int, quantity: int, unit_price: int):
+    """판매 카운터 증가 (구매 INSERT와 같은 트랜잭션)"""
+    cursor.execute('''
+        INSERT INTO item_sales (item_id, sold, revenue, purchases) VALUES (%s, %s, %s, 1) AS new
+        ON DUPLICATE KEY UPDATE sold = sold + new.sold, revenue = revenue + new.revenue,
+                                purchases = purchases + 1
+    ''', (item_id, quantity, quantity * unit_price))
+
+
+def init_event_occupancy(cursor, event_id: int):
+    """공연 좌석으로 점유 카운터를 새로 계산 (좌석 적재와 같은 트랜잭션)"""
+    cursor.execute("DELETE FROM seat_occupancy WHERE event_id = %s", (event_id,))
+    cursor.execute('''
+        INSERT INTO seat_occupancy (event_id, row_num, slot, total, reserved, held)
+        SELECT event_id, row_num, id %% %s, COUNT(*), SUM(status = 'reserved'), SUM(status = 'held')
+        FROM seats WHERE event_id = %s
+        GROUP BY event_id, row_num, id %% %s
+    ''', (OCCUPANCY_COUNTER_SLOTS, event_id, OCCUPANCY_COUNTER_SLOTS))
+
+
+def rebuild_counters():
+    """
+    원본 테이블(seats / purchases)에서 카운터 전체를 다시 계산 (카운터 테이블 최초 생성 / 복구용)
+
+    매출은 구매 시점 단가 기준이며, 단가 컬럼이 생기기 전 구매만 현재 아이템 가격으로 계산합니다.
+    계산하는 동안 들어온 쓰기는 반영되지 않을 수 있으므로 쓰기가 없을 때 실행합니다.
+    """
+    conn = get_connection()
+    cursor = conn.cursor()
+    try:
+        conn.begin()
+        cursor.execute("DELETE FROM seat_occupancy")
+        cursor.execute('''
+            INSERT INTO seat_occupancy (event_id, row_num, slot, total, reserved, held)
+            SELECT event_id, row_num, id %% %s, COUNT(*), SUM(status = 'reserved'), SUM(status = 'held')
+            FROM seats
+            GROUP BY event_id, row_num, id %% %s
+        ''', (OCCUPANCY_COUNTER_SLOTS, OCCUPANCY_COUNTER_SLOTS))
+        cursor.execute("DELETE FROM item_sales")
+        cursor.execute('''
+            INSERT INTO item_sales (item_id, sold, revenue, purchases)
+            SELECT p.item_id, SUM(p.quantity), SUM(p.quantity * COALESCE(p.unit_price, i.price)), COUNT(*)
+            FROM purchases p JOIN items i ON i.id = p.item_id
+            GROUP BY p.item_id
+        ''')
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        conn.close()
+        raise
+    conn.close()
+    logger.info("집계 카운터 재계산 완료")
+
+
+@coalesced("seats:{}")
+def get_event_occupancy(event_id: int) -> dict:
+    """공연 좌석 점유 현황 (행별 슬롯 합산, 복제본 사용)"""
+    conn = get_read_connection(scoped_name("seats", event_id))
+    cursor = conn.cursor()
+    cursor.execute('''
+        SELECT row_num, SUM(total), SUM(reserved), SUM(held) FROM seat_occupancy
+        WHERE event_id = %s
+        GROUP BY row_num
+        ORDER BY row_num
+    ''', (event_id,))
+    rows = cursor.fetchall()
+    conn.close()
+
+    occupancy = {"event_id": event_id, "total": 0, "reserved": 0, "held": 0, "available": 0, "rows": []}
+    for row_num, total, reserved, held in rows:
+        # SUM()은 DECIMAL로 오므로 int로 변환
+        total, reserved, held = int(total), int(reserved), int(held)
+        occupancy["rows"].append({"row_num": row_num, "total": total, "reserved": reserved, "held": held,
+                                  "available": total - reserved - held})
+        occupancy["total"] += total
+        occupancy["reserved"] += reserved
+        occupancy["held"] += held
+    occupancy["available"] = occupancy["total"] - occupancy["reserved"] - occupancy["held"]
+    return occupancy
+
+
+@coalesced("items")
+def get_item_sales() -> dict:
+    """아이템별 판매 수량 / 매출 / 구매 건수 + 합계 (판매가 없는 아이템은 0, 복제본 사용)"""
+    conn = get_read_connection("items")
+    cursor = conn.cursor()
+    cursor.execute('''
+        SELECT i.id, i.name, i.price, COALESCE(s.sold, 0), COALESCE(s.revenue, 0), COALESCE(s.purchases, 0)
+        FROM items i LEFT JOIN item_sales s ON s.item_id = i.id
+        ORDER BY i.id
+    ''')
+    rows = cursor.fetchall()
+    conn.close()
+
+    items = [{"item_id": item_id, "name": name, "price": price, "sold": int(sold),
+              "revenue": int(revenue), "purchases": int(purchases)}
+             for item_id, name, price, sold, revenue, purchases in rows]
+    return {
+        "items": items,
+        "sold": sum(item["sold"] for item in items),
+        "revenue": sum(item["revenue"] for item in items),
+        "purchases": sum(item["purchases"] for item in items),
+    }
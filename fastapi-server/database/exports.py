@@ -0,0 +1,99 @@
+"""판매/예약 데이터 내보내기 (관리자 export API용)
+
+결과를 fetchall()로 한꺼번에 받지 않고 서버 측 비버퍼 커서(SSCursor)로 한 행씩 읽으므로
+수백만 행도 일정한 메모리로 내보낼 수 있습니다. 조회는 복제본이 있으면 복제본에서 합니다.
+
+- 제너레이터를 끝까지 읽거나 닫으면(close / GC) 연결을 닫습니다.
+  비버퍼 커서의 cursor.close()는 남은 행을 모두 읽어 버리므로 연결만 닫습니다.
+- 읽는 쪽(HTTP 클라이언트)이 느리면 MySQL이 net_write_timeout 뒤에 쿼리를 끊으므로
+  내보내기 연결은 EXPORT_NET_WRITE_TIMEOUT으로 늘려 둡니다.
+"""
+import logging
+
+import pymysql.cursors
+
+from config import EXPORT_NET_WRITE_TIMEOUT
+from .base import get_read_connection
+from .versions import scoped_name
+
+logger = logging.getLogger(__name__)
+
+PURCHASE_EXPORT_FIELDS = ("purchase_id", "purchased_at", "user_id", "username", "item_id", "item_name",
+                          "quantity", "unit_price", "amount")
+RESERVATION_EXPORT_FIELDS = ("seat_id", "event_id", "event_name", "seat_number", "row_num", "col_num",
+                             "status", "user_id", "username", "reserved_at", "held_until")
+
+
+def _stream(name: str, tag: str, query: str, params):
+    """비버퍼 커서로 쿼리 결과를 한 행(튜플)씩 반환"""
+    conn = get_read_connection(name, tag=tag)
+    count = 0
+    try:
+        cursor = conn.cursor(pymysql.cursors.SSCursor)
+        cursor.execute("SET SESSION net_write_timeout = %s", (EXPORT_NET_WRITE_TIMEOUT,))
+        cursor.execute(query, params)
+        for row in cursor:
+            count += 1
+            yield row
+    finally:
+        conn.close()
+        logger.info("export [%s] %d rows", tag, count)
+
+
+def iter_purchases(item_id: int = None, since=None, until=None):
+    """
+    구매 내역 (PURCHASE_EXPORT_FIELDS 순서 튜플, 구매 id 순) - since 이상 until 미만
+
+    unit_price / amount는 구매 시점 단가 기준이며, 단가 컬럼이 생기기 전 구매는 비어 있습니다 (NULL).
+    """
+    conditions, params = [], []
+    if item_id is not None:
+        conditions.append("p.item_id = %s")
+        params.append(item_id)
+    if since is not None:
+        conditions.append("p.purchased_at >= %s")
+        params.append(since)
+    if until is not None:
+        conditions.append("p.purchased_at < %s")
+        params.append(until)
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    return _stream("items", "export_purchases", f'''
+        SELECT p.id, p.purchased_at, p.user_id, u.username, p.item_id, i.name,
+               p.quantity, p.unit_price, p.quantity * p.unit_price
+        FROM purchases p
+        JOIN users u ON u.id = p.user_id
+        JOIN items i ON i.id = p.item_id
+        {where}
+        ORDER BY p.id
+    ''', params)
+
+
+def iter_reservations(event_id: int = None, since=None, until=None, include_holds: bool = False):
+    """
+    좌석 예약 현황 (RESERVATION_EXPORT_FIELDS 순서 튜플, 공연/좌석 id 순)
+
+    since/until은 예약 시각(reserved_at) 범위이며, include_holds면 선점 중인 좌석도 포함합니다
+    (선점은 reserved_at이 없으므로 기간 조건을 주면 빠집니다).
+    """
+    statuses = ("reserved", "held") if include_holds else ("reserved",)
+    conditions = [f"s.status IN ({', '.join(['%s'] * len(statuses))})"]
+    params = list(statuses)
+    if event_id is not None:
+        conditions.append("s.event_id = %s")
+        params.append(event_id)
+    if since is not None:
+        conditions.append("s.reserved_at >= %s")
+        params.append(since)
+    if until is not None:
+        conditions.append("s.reserved_at < %s")
+        params.append(until)
+    name = scoped_name("seats", event_id) if event_id is not None else "seats"
+    return _stream(name, "export_reservations", f'''
+        SELECT s.id, s.event_id, e.name, s.seat_number, s.row_num, s.col_num,
+               s.status, s.reserved_by, u.username, s.reserved_at, s.held_until
+        FROM seats s
+        JOIN events e ON e.id = s.event_id
+        LEFT JOIN users u ON u.id = s.reserved_by
+        WHERE {' AND '.join(conditions)}
+        ORDER BY s.event_id, s.id
+    ''', params)
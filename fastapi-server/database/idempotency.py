@@ -0,0 +1,88 @@
+"""Idempotency-Key 처리 결과 저장 (워커/서버 간 재시도 중복 방지)
+
+utils.idempotency의 메모리 캐시 뒤에서, IDEMPOTENCY_PERSIST=True일 때만 사용합니다.
+- claim: 키를 먼저 '처리 중'(status_code NULL)으로 등록해 다른 워커의 동시 중복 요청을 막음
+- complete: 처리 결과(상태 코드 + 응답 JSON) 저장
+- release: 처리 중 예외가 나면 키를 지워 재시도할 수 있게 함
+"""
+import json
+import logging
+
+from .base import get_connection
+
+logger = logging.getLogger(__name__)
+
+
+def get_idempotency_record(idem_key, ttl_seconds):
+    """
+    저장된 처리 결과 조회 (만료된 키는 없는 것으로 취급)
+
+    반환: None 또는 {"fingerprint", "status_code", "response"} (처리 중이면 status_code가 None)
+    """
+    conn = get_connection()
+    cursor = conn.cursor()
+    cursor.execute('''
+        SELECT fingerprint, status_code, response FROM idempotency_keys
+        WHERE idem_key = %s AND created_at > NOW() - INTERVAL %s SECOND
+    ''', (idem_key, ttl_seconds))
+    row = cursor.fetchone()
+    conn.close()
+    
+    if not row:
+        return None
+    fingerprint, status_code, response = row
+    return {
+        "fingerprint": fingerprint,
+        "status_code": status_code,
+        "response": json.loads(response) if response else None
+    }
+
+
+def claim_idempotency_key(idem_key, fingerprint, ttl_seconds) -> bool:
+    """키를 처리 중으로 등록 (이미 유효한 키가 있으면 False)"""
+    conn = get_connection()
+    cursor = conn.cursor()
+    
+    try:
+        # 만료된 같은 키는 지우고 새로 등록
+        cursor.execute('''
+            DELETE FROM idempotency_keys
+            WHERE idem_key = %s AND created_at <= NOW() - INTERVAL %s SECOND
+        ''', (idem_key, ttl_seconds))
+        cursor.execute('''
+            INSERT IGNORE INTO idempotency_keys (idem_key, fingerprint) VALUES (%s, %s)
+        ''', (idem_key, fingerprint))
+        claimed = cursor.rowcount == 1
+        conn.commit()
+        conn.close()
+        return claimed
+        
+    except Exception as e:
+        conn.rollback()
+        conn.close()
+        raise
+
+
+def complete_idempotency_key(idem_key, status_code, response):
+    """처리 결과 저장"""
+    conn = get_connection()
+    cursor = conn.cursor()
+    cursor.execute('''
+        UPDATE idempotency_keys SET status_code = %s, response = %s
+        WHERE idem_key = %s
+    ''', (status_code, json.dumps(response, ensure_ascii=False, default=str), idem_key))
+    conn.commit()
+    conn.close()
+
+
+def release_idempotency_key(idem_key):
+    """처리 실패 시 키 삭제 (같은 키로 다시 시도 가능)"""
+    conn = get_connection()
+    cursor = conn.cursor()
+    try:
+        cursor.execute("DELETE FROM idempotency_keys WHERE idem_key = %s AND status_code IS NULL", (idem_key,))
+        conn.commit()
+    except Exception as e:
+        logger.warning("idempotency key release failed: %s", e)
+    finally:
+        conn.close()
@@ -1,5 +1,8 @@
 """데이터베이스 초기화"""
+from config import DEFAULT_EVENT_ID
 from .base import get_connection
+from .versions import VERSION_NAMES
+from .counters import rebuild_counters
 
 
 def init_db():
@@ -33,29 +36,138 @@ def init_db():
             user_id INT NOT NULL,
             item_id INT NOT NULL,
             quantity INT NOT NULL DEFAULT 1,
+            unit_price INT NULL,
             purchased_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
             FOREIGN KEY (user_id) REFERENCES users(id),
             FOREIGN KEY (item_id) REFERENCES items(id)
         )
     ''')
     
-    # seats 테이블 (좌석 예약)
+    # events 테이블 (공연, 좌석은 공연별로 따로 존재)
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS events (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            name VARCHAR(255) NOT NULL,
+            starts_at DATETIME NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    # 기본 공연 (event_id 없이 들어오는 요청과 기존 좌석 데이터가 속함)
+    cursor.execute(
+        "INSERT IGNORE INTO events (id, name) VALUES (%s, %s)",
+        (DEFAULT_EVENT_ID, "기본 공연")
+    )
+    
+    # seats 테이블 (좌석 예약, 공연별 좌석 - 모든 조회/락은 event_id 범위 안에서)
     cursor.execute('''
         CREATE TABLE IF NOT EXISTS seats (
             id INT AUTO_INCREMENT PRIMARY KEY,
-            seat_number VARCHAR(10) UNIQUE NOT NULL,
+            event_id INT NOT NULL,
+            seat_number VARCHAR(10) NOT NULL,
             row_num INT NOT NULL,
             col_num INT NOT NULL,
             x_pos INT NOT NULL,
             y_pos INT NOT NULL,
             width INT NOT NULL,
             height INT NOT NULL,
-            status ENUM('available', 'reserved') DEFAULT 'available',
+            status ENUM('available', 'reserved', 'held') DEFAULT 'available',
             reserved_by INT NULL,
             reserved_at TIMESTAMP NULL,
+            held_until DATETIME(3) NULL,
+            UNIQUE KEY uq_seats_event_number (event_id, seat_number),
+            INDEX idx_seats_event_position (event_id, row_num, col_num),
+            INDEX idx_seats_event_user (event_id, reserved_by),
+            INDEX idx_seats_hold (status, held_until),
+            INDEX idx_seats_event_status (event_id, status, row_num, col_num),
+            FOREIGN KEY (event_id) REFERENCES events(id),
             FOREIGN KEY (reserved_by) REFERENCES users(id)
         )
     ''')
     
+    # 기존 seats 테이블에 임시 선점(held) 컬럼 추가
+    cursor.execute("SHOW COLUMNS FROM seats LIKE 'held_until'")
+    if not cursor.fetchone():
+        cursor.execute('''
+            ALTER TABLE seats
+                MODIFY status ENUM('available', 'reserved', 'held') DEFAULT 'available',
+                ADD COLUMN held_until DATETIME(3) NULL,
+                ADD INDEX idx_seats_hold (status, held_until)
+        ''')
+    
+    # 기존 seats 테이블을 공연별 좌석으로 전환 (기존 좌석은 기본 공연 소속)
+    cursor.execute("SHOW COLUMNS FROM seats LIKE 'event_id'")
+    if not cursor.fetchone():
+        cursor.execute(f'''
+            ALTER TABLE seats
+                ADD COLUMN event_id INT NOT NULL DEFAULT {int(DEFAULT_EVENT_ID)} AFTER id,
+                DROP INDEX seat_number,
+                ADD UNIQUE KEY uq_seats_event_number (event_id, seat_number),
+                ADD INDEX idx_seats_event_position (event_id, row_num, col_num),
+                ADD INDEX idx_seats_event_user (event_id, reserved_by),
+                ADD FOREIGN KEY (event_id) REFERENCES events(id)
+        ''')
+        cursor.execute("ALTER TABLE seats ALTER COLUMN event_id DROP DEFAULT")
+    
+    # 기존 purchases 테이블에 구매 시점 단가 컬럼 추가 (이전 구매는 단가를 알 수 없어 NULL)
+    cursor.execute("SHOW COLUMNS FROM purchases LIKE 'unit_price'")
+    if not cursor.fetchone():
+        cursor.execute("ALTER TABLE purchases ADD COLUMN unit_price INT NULL AFTER quantity")
+    
+    # 빈 좌석 아무거나 예약(reserve_any_seat)용 인덱스 - 빈 좌석만 좌석 순서대로 훑음
+    cursor.execute("SHOW INDEX FROM seats WHERE Key_name = 'idx_seats_event_status'")
+    if not cursor.fetchone():
+        cursor.execute("ALTER TABLE seats ADD INDEX idx_seats_event_status (event_id, status, row_num, col_num)")
+    
+    # idempotency_keys 테이블 (Idempotency-Key 처리 결과, IDEMPOTENCY_PERSIST=True일 때 사용)
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS idempotency_keys (
+            idem_key CHAR(64) PRIMARY KEY,
+            fingerprint CHAR(64) NOT NULL,
+            status_code SMALLINT NULL,
+            response TEXT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            INDEX idx_idempotency_created (created_at)
+        )
+    ''')
+    
+    # 집계 카운터 테이블 (database.counters, 쓰기와 같은 트랜잭션에서 증분 갱신)
+    cursor.execute("SHOW TABLES LIKE 'seat_occupancy'")
+    counters_created = cursor.fetchone() is None
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS item_sales (
+            item_id INT PRIMARY KEY,
+            sold INT NOT NULL DEFAULT 0,
+            revenue BIGINT NOT NULL DEFAULT 0,
+            purchases INT NOT NULL DEFAULT 0
+        )
+    ''')
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS seat_occupancy (
+            event_id INT NOT NULL,
+            row_num INT NOT NULL,
+            slot SMALLINT NOT NULL,
+            total INT NOT NULL DEFAULT 0,
+            reserved INT NOT NULL DEFAULT 0,
+            held INT NOT NULL DEFAULT 0,
+            PRIMARY KEY (event_id, row_num, slot)
+        )
+    ''')
+    
+    # data_versions 테이블 (HTTP 캐시 ETag용 버전 카운터)
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS data_versions (
+            name VARCHAR(32) PRIMARY KEY,
+            version BIGINT NOT NULL DEFAULT 0
+        )
+    ''')
+    cursor.executemany(
+        "INSERT IGNORE INTO data_versions (name, version) VALUES (%s, 0)",
+        [(name,) for name in VERSION_NAMES]
+    )
+    
     conn.commit()
     conn.close()
+    
+    # 기존 데이터베이스에 카운터 테이블을 처음 만들었으면 기존 좌석/구매 내역으로 채움
+    if counters_created:
+        rebuild_counters()
@@ -0,0 +1,172 @@
+"""쿼리 계측 - 슬로우 쿼리 / 잠금 읽기(FOR UPDATE) / 데드락 / NOWAIT 충돌 기록
+
+get_connection()이 반환하는 연결을 감싸서 모든 execute 호출의 실행 시간을
+호출 함수(reserve_seat_safe, purchase_item_safe, ...) 단위로 집계합니다.
+
+locking_reads / locking_read_ms는 잠금 읽기 문장의 횟수와 전체 실행 시간입니다.
+락을 기다리지 않은 실행도 포함하므로 실제 락 대기 시간이 아니라 그 상한입니다
+(실제 대기는 performance_schema.data_lock_waits / Innodb_row_lock_time으로 확인).
+"""
+import logging
+import re
+import threading
+import time
+
+from config import SLOW_QUERY_MS, LOCKING_READ_WARN_MS
+
+logger = logging.getLogger("database.query")
+
+# MySQL 락 관련 에러 코드
+ER_LOCK_WAIT_TIMEOUT = 1205
+ER_LOCK_DEADLOCK = 1213
+ER_LOCK_NOWAIT = 3572  # FOR UPDATE NOWAIT 대상 행이 이미 잠겨 있음 (MySQL 8.0)
+
+_LOCKING_READ = re.compile(r"\bFOR\s+UPDATE\b|\bLOCK\s+IN\s+SHARE\s+MODE\b|\bFOR\s+SHARE\b", re.IGNORECASE)
+_WHITESPACE = re.compile(r"\s+")
+
+
+def _new_stat() -> dict:
+    return {
+        "count": 0,
+        "total_ms": 0.0,
+        "max_ms": 0.0,
+        "slow_count": 0,
+        "errors": 0,
+        "locking_reads": 0,
+        "locking_read_ms": 0.0,
+        "locking_read_max_ms": 0.0,
+        "deadlocks": 0,
+        "lock_timeouts": 0,
+        "lock_nowait": 0,
+    }
+
+
+_stats = {}
+_stats_lock = threading.Lock()
+
+
+def _redact(statement: str) -> str:
+    """로그용 SQL 정리 (파라미터 값은 남기지 않음)"""
+    return _WHITESPACE.sub(" ", statement).strip()
+
+
+def _record(tag: str, statement: str, params, elapsed_ms: float, error_code=None):
+    """실행 결과를 태그별 통계에 반영하고 필요하면 로그를 남김"""
+    is_locking = bool(_LOCKING_READ.search(statement))
+
+    with _stats_lock:
+        stat = _stats.get(tag)
+        if stat is None:
+            stat = _stats[tag] = _new_stat()
+        stat["count"] += 1
+        stat["total_ms"] += elapsed_ms
+        stat["max_ms"] = max(stat["max_ms"], elapsed_ms)
+        if elapsed_ms >= SLOW_QUERY_MS:
+            stat["slow_count"] += 1
+        if is_locking:
+            # 잠금 읽기 실행 시간 (락 대기 + 조회, 락을 기다리지 않은 실행도 포함)
+            stat["locking_reads"] += 1
+            stat["locking_read_ms"] += elapsed_ms
+            stat["locking_read_max_ms"] = max(stat["locking_read_max_ms"], elapsed_ms)
+        if error_code is not None:
+            stat["errors"] += 1
+            if error_code == ER_LOCK_DEADLOCK:
+                stat["deadlocks"] += 1
+            elif error_code == ER_LOCK_WAIT_TIMEOUT:
+                stat["lock_timeouts"] += 1
+            elif error_code == ER_LOCK_NOWAIT:
+                stat["lock_nowait"] += 1
+
+    if error_code in (ER_LOCK_DEADLOCK, ER_LOCK_WAIT_TIMEOUT):
+        kind = "deadlock" if error_code == ER_LOCK_DEADLOCK else "lock wait timeout"
+        logger.warning("%s [%s] %.1fms: %s", kind, tag, elapsed_ms, _redact(statement))
+    elif error_code == ER_LOCK_NOWAIT:
+        logger.info("lock nowait [%s]: %s", tag, _redact(statement))
+    elif elapsed_ms >= SLOW_QUERY_MS:
+        param_count = len(params) if isinstance(params, (list, tuple, dict)) else int(params is not None)
+        logger.warning("slow query [%s] %.1fms (params=%d redacted): %s",
+                       tag, elapsed_ms, param_count, _redact(statement))
+    elif is_locking and elapsed_ms >= LOCKING_READ_WARN_MS:
+        logger.info("slow locking read [%s] %.1fms: %s", tag, elapsed_ms, _redact(statement))
+
+
+def _error_code(exc: Exception):
+    args = getattr(exc, "args", ())
+    if args and isinstance(args[0], int):
+        return args[0]
+    return -1
+
+
+class InstrumentedCursor:
+    """execute/executemany 시간을 측정하는 커서 래퍼"""
+
+    def __init__(self, cursor, tag: str):
+        self._cursor = cursor
+        self._tag = tag
+
+    def execute(self, query, args=None):
+        start = time.perf_counter()
+        try:
+            result = self._cursor.execute(query, args)
+        except Exception as e:
+            _record(self._tag, query, args, (time.perf_counter() - start) * 1000, _error_code(e))
+            raise
+        _record(self._tag, query, args, (time.perf_counter() - start) * 1000)
+        return result
+
+    def executemany(self, query, args):
+        start = time.perf_counter()
+        try:
+            result = self._cursor.executemany(query, args)
+        except Exception as e:
+            _record(self._tag, query, args, (time.perf_counter() - start) * 1000, _error_code(e))
+            raise
+        _record(self._tag, query, args, (time.perf_counter() - start) * 1000)
+        return result
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self._cursor.close()
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+
+class InstrumentedConnection:
+    """cursor()가 InstrumentedCursor를 반환하는 연결 래퍼"""
+
+    def __init__(self, conn, tag: str):
+        self._conn = conn
+        self.tag = tag
+
+    def cursor(self, cursor=None):
+        return InstrumentedCursor(self._conn.cursor(cursor), self.tag)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self._conn.close()
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+
+def get_query_stats() -> dict:
+    """호출 함수별 쿼리 통계 스냅샷"""
+    with _stats_lock:
+        snapshot = {tag: dict(stat) for tag, stat in _stats.items()}
+    for stat in snapshot.values():
+        stat["avg_ms"] = round(stat["total_ms"] / stat["count"], 3) if stat["count"] else 0.0
+    return snapshot
+
+
+def reset_query_stats():
+    """쿼리 통계 초기화"""
+    with _stats_lock:
+        _stats.clear()
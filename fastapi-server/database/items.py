@@ -1,7 +1,14 @@
 """아이템 및 구매 관련 데이터베이스 함수"""
 import pymysql
 import logging
-from .base import get_connection
+from utils.log import log_event, audit
+from .base import get_connection, get_read_connection, declare_transaction, begin_transaction
+from .versions import bump_version
+from .singleflight import coalesced
+from .counters import record_sale
+from .retry import retry_transaction, is_retryable, is_lock_busy, busy_response
+
+logger = logging.getLogger(__name__)
 
 
 def init_sample_items():
@@ -21,13 +28,15 @@ def init_sample_items():
         ]
         cursor.executemany("INSERT INTO items (name, stock, price) VALUES (%s, %s, %s)", sample_items)
         conn.commit()
+        bump_version(conn, "items")
     
     conn.close()
 
 
+@coalesced("items")
 def get_all_items():
-    """모든 아이템 조회"""
-    conn = get_connection()
+    """모든 아이템 조회 (동시 호출은 한 번의 조회로 합침, 복제본 사용)"""
+    conn = get_read_connection("items")
     cursor = conn.cursor(pymysql.cursors.DictCursor)
     cursor.execute("SELECT * FROM items")
     items = cursor.fetchall()
@@ -55,19 +64,20 @@ def purchase_item_unsafe(user_id: int, item_id: int, quantity: int = 1) -> dict:
     
     try:
         # 1. 재고 확인
-        cursor.execute("SELECT stock FROM items WHERE id = %s", (item_id,))
+        cursor.execute("SELECT stock, price FROM items WHERE id = %s", (item_id,))
         result = cursor.fetchone()
         
         if not result:
             conn.close()
             return {"success": False, "message": "아이템을 찾을 수 없습니다"}
         
-        current_stock = result[0]
+        current_stock, price = result
         
         # 2. 재고 부족 체크
         if current_stock < quantity:
             conn.close()
-            logging.warning(f"❌ [UNSAFE] 구매 실패: user_id={user_id}, item_id={item_id}, 재고={current_stock}")
+            log_event(logger, logging.WARNING, "purchase_rejected", mode="unsafe",
+                      user_id=user_id, item_id=item_id, stock=current_stock)
             return {"success": False, "message": f"재고 부족 (현재: {current_stock}개)"}
         
         # ⚠️ 문제: 여기서 다른 요청이 끼어들 수 있음!
@@ -77,12 +87,19 @@ def purchase_item_unsafe(user_id: int, item_id: int, quantity: int = 1) -> dict:
         cursor.execute("UPDATE items SET stock = %s WHERE id = %s", (new_stock, item_id))
         
         # 4. 구매 내역 저장
-        cursor.execute("INSERT INTO purchases (user_id, item_id, quantity) VALUES (%s, %s, %s)",
-                      (user_id, item_id, quantity))
+        cursor.execute("INSERT INTO purchases (user_id, item_id, quantity, unit_price) VALUES (%s, %s, %s, %s)",
+                      (user_id, item_id, quantity, price))
+        
+        # 5. 판매 카운터 증가 (같은 트랜잭션)
+        record_sale(cursor, item_id, quantity, price)
         
         conn.commit()
+        bump_version(conn, "items", {"item_id": item_id, "user_id": user_id})
         conn.close()
-        logging.info(f"✅ [UNSAFE] 구매 성공: user_id={user_id}, item_id={item_id}, 남은재고={new_stock}")
+        log_event(logger, logging.INFO, "purchase_succeeded", sampled=True, mode="unsafe",
+                  user_id=user_id, item_id=item_id, remaining_stock=new_stock)
+        audit("purchase", mode="unsafe", user_id=user_id, item_id=item_id,
+              quantity=quantity, remaining_stock=new_stock)
         return {"success": True, "message": "구매 완료!", "remaining_stock": new_stock}
         
     except Exception as e:
@@ -91,20 +108,22 @@ def purchase_item_unsafe(user_id: int, item_id: int, quantity: int = 1) -> dict:
         return {"success": False, "message": f"오류 발생: {str(e)}"}
 
 
+# 재고 행 하나에 구매가 몰리므로 잠금 방식은 wait (nowait이면 대부분 바로 실패)
+declare_transaction("purchase_item_safe")
+
+
+@retry_transaction()
 def purchase_item_safe(user_id: int, item_id: int, quantity: int = 1) -> dict:
     """
     아이템 구매 (동시성 문제 해결 버전)
-    SELECT ... FOR UPDATE 사용
+    SELECT ... FOR UPDATE 사용 (트랜잭션 설정은 declare_transaction 참고)
     """
-    conn = get_connection()
+    conn = begin_transaction("purchase_item_safe")
     cursor = conn.cursor()
     
     try:
-        # 트랜잭션 시작
-        conn.begin()
-        
         # 1. 재고 확인 (비관적 락 사용)
-        cursor.execute("SELECT stock FROM items WHERE id = %s FOR UPDATE", (item_id,))
+        cursor.execute("SELECT stock, price FROM items WHERE id = %s " + conn.lock_clause, (item_id,))
         result = cursor.fetchone()
         
         if not result:
@@ -112,41 +131,54 @@ def purchase_item_safe(user_id: int, item_id: int, quantity: int = 1) -> dict:
             conn.close()
             return {"success": False, "message": "아이템을 찾을 수 없습니다"}
         
-        current_stock = result[0]
+        current_stock, price = result
         
         # 2. 재고 부족 체크
         if current_stock < quantity:
             conn.rollback()
             conn.close()
-            logging.warning(f"❌ [SAFE] 구매 실패: user_id={user_id}, item_id={item_id}, 재고={current_stock}")
+            log_event(logger, logging.WARNING, "purchase_rejected", mode="safe",
+                      user_id=user_id, item_id=item_id, stock=current_stock)
             return {"success": False, "message": f"재고 부족 (현재: {current_stock}개)"}
         
         # 3. 재고 감소 (원자적 연산)
         cursor.execute("UPDATE items SET stock = stock - %s WHERE id = %s", (quantity, item_id))
         
         # 4. 구매 내역 저장
-        cursor.execute("INSERT INTO purchases (user_id, item_id, quantity) VALUES (%s, %s, %s)",
-                      (user_id, item_id, quantity))
+        cursor.execute("INSERT INTO purchases (user_id, item_id, quantity, unit_price) VALUES (%s, %s, %s, %s)",
+                      (user_id, item_id, quantity, price))
+        
+        # 5. 판매 카운터 증가 (같은 트랜잭션)
+        record_sale(cursor, item_id, quantity, price)
         
         conn.commit()
+        bump_version(conn, "items", {"item_id": item_id, "user_id": user_id})
         conn.close()
         
         new_stock = current_stock - quantity
-        logging.info(f"✅ [SAFE] 구매 성공: user_id={user_id}, item_id={item_id}, 남은재고={new_stock}")
+        log_event(logger, logging.INFO, "purchase_succeeded", sampled=True, mode="safe",
+                  user_id=user_id, item_id=item_id, remaining_stock=new_stock)
+        audit("purchase", mode="safe", user_id=user_id, item_id=item_id,
+              quantity=quantity, remaining_stock=new_stock)
         return {"success": True, "message": "구매 완료!", "remaining_stock": new_stock}
         
     except Exception as e:
         conn.rollback()
         conn.close()
+        if is_retryable(e):
+            # 데드락 / 락 대기 타임아웃은 retry_transaction이 트랜잭션 전체를 다시 실행
+            raise
+        if is_lock_busy(e):
+            return busy_response(e)
         return {"success": False, "message": f"오류 발생: {str(e)}"}
 
 
 def get_user_purchases(user_id: int):
-    """사용자 구매 내역 조회"""
-    conn = get_connection()
+    """사용자 구매 내역 조회 (복제본 사용, 본인 구매 직후에는 반영 여부 확인)"""
+    conn = get_read_connection("items", user_id)
     cursor = conn.cursor(pymysql.cursors.DictCursor)
     cursor.execute('''
-        SELECT p.*, i.name as item_name, i.price
+        SELECT p.*, i.name as item_name, COALESCE(p.unit_price, i.price) as price
         FROM purchases p
         JOIN items i ON p.item_id = i.id
         WHERE p.user_id = %s
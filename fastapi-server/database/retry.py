@@ -0,0 +1,154 @@
+"""트랜잭션 재시도 (데드락 / 락 대기 타임아웃)
+
+경합이 심할 때 MySQL은 데드락(1213)이나 락 대기 타임아웃(1205)으로 트랜잭션 하나를 실패시키는데,
+이 오류는 같은 트랜잭션을 처음부터 다시 실행하면 대부분 성공합니다.
+@retry_transaction을 붙인 함수는 이 두 오류를 만나면 연결을 정리하고 예외를 그대로 올리기만 하면 되고,
+재시도는 데코레이터가 지수 백오프 + full jitter 간격으로 수행합니다.
+
+- 최대 TX_RETRY_ATTEMPTS회, 첫 시도부터 TX_RETRY_BUDGET_MS 안에서만 재시도
+- 재시도해도 실패하면 on_exhausted(예외)의 반환값으로 응답 (사용자에게는 "잠시 후 다시 시도")
+- 함수별 시도 횟수 분포 / 오류 종류 / 백오프 시간을 get_retry_stats()로 제공
+
+백오프는 time.sleep()이므로 재시도하는 함수는 이벤트 루프가 아닌 스레드풀에서 호출해야 합니다
+(async 라우트에서는 run_in_threadpool). 재시도하는 함수는 매번 새 연결에서 트랜잭션 전체를 다시 실행해야 하며,
+커밋 이후의 작업(bump_version 등)은 예외를 올리지 않아야 합니다 (커밋된 쓰기가 두 번 실행되지 않도록).
+"""
+import functools
+import logging
+import random
+import threading
+import time
+
+import pymysql
+
+from config import TX_RETRY_ATTEMPTS, TX_RETRY_BASE_DELAY_MS, TX_RETRY_MAX_DELAY_MS, TX_RETRY_BUDGET_MS
+from .instrumentation import ER_LOCK_DEADLOCK, ER_LOCK_WAIT_TIMEOUT, ER_LOCK_NOWAIT, _error_code
+
+logger = logging.getLogger(__name__)
+
+# 재시도 가능한 MySQL 오류 코드 -> 통계 이름
+RETRYABLE_ERRORS = {
+    ER_LOCK_DEADLOCK: "deadlocks",
+    ER_LOCK_WAIT_TIMEOUT: "lock_timeouts",
+}
+
+BUSY_MESSAGE = "요청이 몰려 처리하지 못했습니다. 잠시 후 다시 시도해 주세요"
+
+
+def is_retryable(exc: BaseException) -> bool:
+    """트랜잭션을 다시 실행하면 성공할 수 있는 오류인지 (데드락 / 락 대기 타임아웃)"""
+    return isinstance(exc, pymysql.MySQLError) and _error_code(exc) in RETRYABLE_ERRORS
+
+
+def is_lock_busy(exc: BaseException) -> bool:
+    """NOWAIT 잠금 읽기가 이미 잠긴 행을 만난 오류인지 (재시도하지 않고 바로 응답)"""
+    return isinstance(exc, pymysql.MySQLError) and _error_code(exc) == ER_LOCK_NOWAIT
+
+
+def busy_response(exc: BaseException) -> dict:
+    """재시도 후에도 실패한 요청의 기본 응답"""
+    return {"success": False, "message": BUSY_MESSAGE, "retryable": True}
+
+
+def backoff_delay(attempt: int) -> float:
+    """attempt번째 실패 후 대기 시간 (초, 지수 백오프 상한 안에서 full jitter)"""
+    cap = min(TX_RETRY_MAX_DELAY_MS, TX_RETRY_BASE_DELAY_MS * (2 ** (attempt - 1)))
+    return random.uniform(0, cap) / 1000
+
+
+class RetryStats:
+    """함수별 재시도 통계"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats = {}
+
+    def _stat(self, name: str) -> dict:
+        stat = self._stats.get(name)
+        if stat is None:
+            stat = self._stats[name] = {
+                "calls": 0, "retries": 0, "deadlocks": 0, "lock_timeouts": 0,
+                "recovered": 0, "exhausted": 0, "backoff_ms": 0.0, "attempts": {},
+            }
+        return stat
+
+    def record_retry(self, name: str, kind: str, delay: float):
+        with self._lock:
+            stat = self._stat(name)
+            stat["retries"] += 1
+            stat[kind] += 1
+            stat["backoff_ms"] += delay * 1000
+
+    def record_outcome(self, name: str, attempts: int, exhausted: bool = False, kind: str = None):
+        with self._lock:
+            stat = self._stat(name)
+            stat["calls"] += 1
+            stat["attempts"][attempts] = stat["attempts"].get(attempts, 0) + 1
+            if exhausted:
+                # 마지막 실패는 재시도하지 않았으므로 오류 종류만 집계
+                stat["exhausted"] += 1
+                stat[kind] += 1
+            elif attempts > 1:
+                stat["recovered"] += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                name: dict(stat, backoff_ms=round(stat["backoff_ms"], 2), attempts=dict(stat["attempts"]))
+                for name, stat in self._stats.items()
+            }
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+
+
+_stats = RetryStats()
+
+
+def retry_transaction(on_exhausted=busy_response):
+    """
+    트랜잭션 함수 데코레이터 - 데드락 / 락 대기 타임아웃이면 처음부터 다시 실행
+
+    on_exhausted가 None이면 재시도 후에도 실패한 예외를 그대로 올립니다.
+    """
+    def decorator(func):
+        name = func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.monotonic()
+            attempt = 0
+            while True:
+                attempt += 1
+                try:
+                    result = func(*args, **kwargs)
+                except pymysql.MySQLError as e:
+                    kind = RETRYABLE_ERRORS.get(_error_code(e))
+                    if kind is None:
+                        raise
+                    delay = backoff_delay(attempt)
+                    elapsed_ms = (time.monotonic() - start) * 1000
+                    if attempt >= TX_RETRY_ATTEMPTS or elapsed_ms + delay * 1000 > TX_RETRY_BUDGET_MS:
+                        _stats.record_outcome(name, attempt, exhausted=True, kind=kind)
+                        logger.warning("transaction retry exhausted [%s] %s after %d attempts, %.1fms",
+                                       name, kind, attempt, elapsed_ms)
+                        if on_exhausted is None:
+                            raise
+                        return on_exhausted(e)
+                    _stats.record_retry(name, kind, delay)
+                    time.sleep(delay)
+                    continue
+                _stats.record_outcome(name, attempt)
+                return result
+        return wrapper
+    return decorator
+
+
+def get_retry_stats() -> dict:
+    """함수별 호출 / 재시도 / 오류 종류 / 시도 횟수 분포"""
+    return _stats.snapshot()
+
+
+def reset_retry_stats():
+    _stats.reset()
@@ -1,29 +1,106 @@
-"""좌석 예약 관련 데이터베이스 함수"""
+"""좌석 예약 관련 데이터베이스 함수
+
+좌석은 공연(event)별로 따로 존재하며, 모든 조회/락은 한 공연의 좌석 범위 안에서만 일어납니다.
+(event_id가 앞에 오는 인덱스를 사용하므로 인기 공연의 FOR UPDATE가 다른 공연 좌석을 잠그지 않음)
+좌석 id는 전체에서 유일하지만, 쓰기 함수는 요청한 공연의 좌석인지도 함께 확인합니다.
+1인 1좌석 규칙은 공연마다 적용됩니다.
+
+좌석 상태를 바꾸는 쓰기는 커밋 직전에 점유 카운터(database.counters)도 같은 트랜잭션에서 갱신합니다.
+
+쓰기 트랜잭션의 격리 수준 / 잠금 읽기 방식 / 락 대기 제한은 함수마다 declare_transaction()으로 선언합니다.
+기본은 READ COMMITTED라서 잠금 읽기가 좌석 범위에 gap/next-key 락을 걸지 않고 읽은 행만 잠급니다.
+1인 1좌석 확인은 사용자 행 락(_lock_user)으로 같은 사용자의 트랜잭션을 직렬화해 보호합니다.
+"""
 import logging
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta
 import pymysql.cursors
-from .base import get_connection
+from config import DEFAULT_EVENT_ID, SEAT_BULK_LOAD_METHOD, SEAT_BULK_BATCH_SIZE
+from utils.log import log_event, audit
+from utils.venue_layout import iter_seats, validate_spec
+from .base import get_connection, get_read_connection, declare_transaction, begin_transaction
+from .versions import bump_version, scoped_name
+from .singleflight import coalesced
+from .retry import retry_transaction, is_retryable, is_lock_busy
+from .counters import apply_seat_changes, init_event_occupancy
 
+logger = logging.getLogger(__name__)
 
-def init_sample_seats():
-    """샘플 좌석 데이터 초기화 (최초 1회만)"""
-    conn = get_connection()
-    cursor = conn.cursor()
-    
-    # 이미 좌석이 있으면 스킵
-    cursor.execute("SELECT COUNT(*) FROM seats")
-    count = cursor.fetchone()[0]
-    
-    if count > 0:
-        conn.close()
-        return
-    
+SEAT_COLUMNS = "(event_id, seat_number, row_num, col_num, x_pos, y_pos, width, height)"
+SEAT_INSERT = f"INSERT INTO seats {SEAT_COLUMNS} VALUES "
+
+# 예약/선점 거절 사유별 메시지
+REJECT_MESSAGES = {
+    "already_reserved": "이미 예약된 좌석입니다",
+    "held": "다른 사용자가 선점 중인 좌석입니다",
+    "locked": "다른 사용자가 처리 중인 좌석입니다",
+}
+
+# 쓰기 트랜잭션 설정 (잠금 방식을 nowait / skip_locked로 바꾸면 잠긴 좌석은 기다리지 않고 "locked"로 거절)
+declare_transaction("reserve_seat_safe")
+declare_transaction("reserve_seats_group")
+declare_transaction("hold_seat")
+declare_transaction("expire_holds")
+declare_transaction("cancel_reservation")
+# 빈 좌석 아무거나: 다른 요청이 잠근 좌석은 건너뛰어야 하므로 항상 skip_locked (MySQL 8.0 이상)
+declare_transaction("reserve_any_seat", isolation="READ COMMITTED", lock="skip_locked")
+
+
+def _unavailable_reason(seat, user_id, now):
+    """
+    좌석을 이 사용자가 예약/선점할 수 없는 사유 (가능하면 None)
+
+    만료 시각이 지난 선점은 만료 처리 전이라도 빈 좌석으로 취급하고,
+    본인이 선점한 좌석은 그대로 예약 확정할 수 있습니다.
+    """
+    if seat['status'] == 'reserved':
+        return "already_reserved"
+    if seat['status'] == 'held' and seat['held_until'] > now and seat['reserved_by'] != user_id:
+        return "held"
+    return None
+
+
+def _lock_user(cursor, user_id) -> bool:
+    """
+    사용자 행 락 (사용자가 없으면 False)
+
+    같은 사용자의 예약/선점 트랜잭션이 여기서 차례로 진행되므로, 1인 1좌석 확인은
+    좌석 범위를 잠그는 COUNT ... FOR UPDATE 대신 잠금 없는 조회로 충분합니다.
+    락 순서는 항상 사용자 행 -> 좌석(id 오름차순)입니다.
+    """
+    cursor.execute("SELECT id FROM users WHERE id = %s FOR UPDATE", (user_id,))
+    return cursor.fetchone() is not None
+
+
+def _existing_seat_ids(cursor, seat_ids, event_id):
+    """잠금 없이 존재하는 좌석 id 조회 (SKIP LOCKED가 건너뛴 좌석과 없는 좌석 구분)"""
+    placeholders = ", ".join(["%s"] * len(seat_ids))
+    cursor.execute(f"SELECT id FROM seats WHERE event_id = %s AND id IN ({placeholders})",
+                   [event_id] + list(seat_ids))
+    return {row['id'] for row in cursor.fetchall()}
+
+
+def _has_other_seat(cursor, user_id, event_id, seat_ids, now) -> bool:
+    """사용자가 seat_ids 밖의 좌석을 예약(선점)했는지 - 사용자 행 락을 잡은 뒤 잠금 없이 확인"""
+    excluded = f"AND id NOT IN ({', '.join(['%s'] * len(seat_ids))})" if seat_ids else ""
+    cursor.execute(f'''
+        SELECT COUNT(*) as count FROM seats
+        WHERE event_id = %s AND reserved_by = %s {excluded}
+          AND (status = 'reserved' OR held_until > %s)
+    ''', [event_id, user_id] + list(seat_ids) + [now])
+    return cursor.fetchone()['count'] > 0
+
+
+def _sample_hall_seats():
+    """샘플 공연장 좌석 데이터 (8행 x 10열 = 80석, 배경 이미지 seats.png와 같은 좌표)"""
     # 8행 x 10열 = 80개 좌석 생성
     # 이미지 정밀 분석 결과 좌표
     seats_data = []
     
     # 좌석 레이아웃: 5개 블록 x 8행 x 2열
     block_start_x = [8, 184, 364, 544, 744]  # 각 블록의 시작 X 좌표
-    seat_start_y = 250  # 첫 번째 행 Y 좌표
     seat_width = 48   # 좌석 너비
     seat_height = 58  # 좌석 높이
     
@@ -50,59 +127,197 @@ def init_sample_seats():
                     seat_height
                 ))
                 seat_id += 1
+    return seats_data
+
+
+def _insert_batches(cursor, event_id, seats, batch_size):
+    """다중 행 INSERT (batch_size행을 한 문장으로), 적재한 좌석 수 반환"""
+    values = ", ".join(["(%s, %s, %s, %s, %s, %s, %s, %s)"] * batch_size)
+    count = 0
+    batch = []
+    for seat in seats:
+        batch.append((event_id, *seat))
+        if len(batch) == batch_size:
+            cursor.execute(SEAT_INSERT + values, [value for row in batch for value in row])
+            count += len(batch)
+            batch = []
+    if batch:
+        tail = ", ".join(["(%s, %s, %s, %s, %s, %s, %s, %s)"] * len(batch))
+        cursor.execute(SEAT_INSERT + tail, [value for row in batch for value in row])
+        count += len(batch)
+    return count
+
+
+def _load_infile(cursor, event_id, seats):
+    """임시 TSV 파일을 LOAD DATA LOCAL INFILE로 적재, 적재한 좌석 수 반환"""
+    count = 0
+    with tempfile.NamedTemporaryFile("w", suffix=".tsv", encoding="utf-8", newline="", delete=False) as f:
+        for seat in seats:
+            f.write("\t".join(str(value) for value in (event_id, *seat)) + "\n")
+            count += 1
+    try:
+        cursor.execute(f'''
+            LOAD DATA LOCAL INFILE %s INTO TABLE seats
+            CHARACTER SET utf8mb4
+            FIELDS TERMINATED BY '\\t' LINES TERMINATED BY '\\n'
+            {SEAT_COLUMNS}
+        ''', (f.name,))
+    finally:
+        os.unlink(f.name)
+    return count
+
+
+def _load_seats(cursor, event_id, seats, method, batch_size):
+    if method == "infile":
+        return _load_infile(cursor, event_id, seats)
+    if method == "insert":
+        return _insert_batches(cursor, event_id, seats, batch_size)
+    raise ValueError(f"지원하지 않는 적재 방식입니다: {method}")
+
+
+def init_sample_seats():
+    """기본 공연의 샘플 좌석 데이터 초기화 (최초 1회만)"""
+    conn = get_connection()
+    cursor = conn.cursor()
+    
+    # 이미 좌석이 있으면 스킵
+    cursor.execute("SELECT COUNT(*) FROM seats WHERE event_id = %s", (DEFAULT_EVENT_ID,))
+    count = cursor.fetchone()[0]
+    
+    if count > 0:
+        conn.close()
+        return
     
     # 좌석 데이터 삽입
-    cursor.executemany('''
-        INSERT INTO seats (seat_number, row_num, col_num, x_pos, y_pos, width, height)
-        VALUES (%s, %s, %s, %s, %s, %s, %s)
-    ''', seats_data)
+    count = _insert_batches(cursor, DEFAULT_EVENT_ID, _sample_hall_seats(), SEAT_BULK_BATCH_SIZE)
+    init_event_occupancy(cursor, DEFAULT_EVENT_ID)
     
     conn.commit()
+    bump_version(conn, scoped_name("seats", DEFAULT_EVENT_ID))
+    bump_version(conn, scoped_name("layout", DEFAULT_EVENT_ID))
     conn.close()
-    logging.info(f"✅ {len(seats_data)}개의 샘플 좌석이 생성되었습니다")
+    logger.info("샘플 좌석 %d개 생성", count)
 
 
-def get_all_seats():
-    """모든 좌석 조회 (예약자 username 포함)"""
-    conn = get_connection()
+def create_event(name, starts_at=None, layout=None, method=None, batch_size=None):
+    """
+    공연 생성 + 좌석 대량 적재 (한 트랜잭션)
+
+    layout은 utils.venue_layout 스펙이며, 생략하면 샘플 공연장(80석) 배치를 사용합니다.
+    method는 "insert"(다중 행 INSERT 배치) 또는 "infile"(LOAD DATA LOCAL INFILE)입니다.
+    {"event_id", "seats", "method", "load_seconds", "rows_per_second"}를 반환합니다.
+    """
+    method = method or SEAT_BULK_LOAD_METHOD
+    batch_size = batch_size or SEAT_BULK_BATCH_SIZE
+    if layout is not None:
+        validate_spec(layout)
+    seats = iter_seats(layout) if layout is not None else _sample_hall_seats()
+    
+    conn = get_connection(local_infile=method == "infile")
+    cursor = conn.cursor()
+    
+    try:
+        conn.begin()
+        cursor.execute("INSERT INTO events (name, starts_at) VALUES (%s, %s)", (name, starts_at))
+        event_id = cursor.lastrowid
+        start = time.perf_counter()
+        count = _load_seats(cursor, event_id, seats, method, batch_size)
+        init_event_occupancy(cursor, event_id)
+        conn.commit()
+        elapsed = time.perf_counter() - start
+    except Exception:
+        conn.rollback()
+        conn.close()
+        raise
+    
+    bump_version(conn, "events")
+    bump_version(conn, scoped_name("seats", event_id))
+    bump_version(conn, scoped_name("layout", event_id))
+    conn.close()
+    
+    rows_per_second = round(count / elapsed) if elapsed > 0 else None
+    logger.info("event %s created: %d seats loaded via %s in %.2fs (%s rows/s)",
+                event_id, count, method, elapsed, rows_per_second)
+    audit("event_created", event_id=event_id, name=name, seats=count)
+    return {"event_id": event_id, "seats": count, "method": method,
+            "load_seconds": round(elapsed, 3), "rows_per_second": rows_per_second}
+
+
+@coalesced("events")
+def get_all_events():
+    """공연 목록 조회 (시작 시각 순, 복제본 사용)"""
+    conn = get_read_connection("events")
+    cursor = conn.cursor(pymysql.cursors.DictCursor)
+    cursor.execute("SELECT id, name, starts_at FROM events ORDER BY starts_at IS NULL, starts_at, id")
+    events = cursor.fetchall()
+    conn.close()
+    return events
+
+
+def get_event(event_id):
+    """공연 한 건 조회 (없으면 None)"""
+    conn = get_read_connection("events")
+    cursor = conn.cursor(pymysql.cursors.DictCursor)
+    cursor.execute("SELECT id, name, starts_at FROM events WHERE id = %s", (event_id,))
+    event = cursor.fetchone()
+    conn.close()
+    return event
+
+
+@coalesced("seats:{}")
+def get_all_seats(event_id):
+    """공연의 모든 좌석 조회 (예약자 username 포함, 동시 호출은 한 번의 조회로 합침, 복제본 사용)"""
+    conn = get_read_connection(scoped_name("seats", event_id))
     cursor = conn.cursor(pymysql.cursors.DictCursor)
     
     cursor.execute('''
         SELECT s.id, s.seat_number, s.row_num, s.col_num, s.x_pos, s.y_pos, 
-               s.width, s.height, s.status, s.reserved_by,
+               s.width, s.height, s.status, s.reserved_by, s.held_until,
                u.username as reserved_by_username
         FROM seats s
         LEFT JOIN users u ON s.reserved_by = u.id
+        WHERE s.event_id = %s
         ORDER BY s.row_num, s.col_num
-    ''')
+    ''', (event_id,))
     
     seats = cursor.fetchall()
     conn.close()
     return seats
 
 
-def reserve_seat_unsafe(user_id, seat_id):
+def reserve_seat_unsafe(user_id, seat_id, event_id):
     """좌석 예약 (Race Condition 발생 가능)"""
     conn = get_connection()
     cursor = conn.cursor(pymysql.cursors.DictCursor)
     
     try:
+        now = datetime.now()
+        
         # 1. 좌석 상태 확인
-        cursor.execute("SELECT status, reserved_by FROM seats WHERE id = %s", (seat_id,))
+        cursor.execute(
+            "SELECT status, row_num, reserved_by, held_until FROM seats WHERE id = %s AND event_id = %s",
+            (seat_id, event_id)
+        )
         seat = cursor.fetchone()
         
         if not seat:
             conn.close()
             return {"success": False, "message": "존재하지 않는 좌석입니다"}
         
-        # 2. 이미 예약된 좌석인지 확인
-        if seat['status'] == 'reserved':
+        # 2. 이미 예약(또는 다른 사용자가 선점)된 좌석인지 확인
+        reason = _unavailable_reason(seat, user_id, now)
+        if reason:
             conn.close()
-            logging.warning(f"❌ [UNSAFE] 예약 실패: user_id={user_id}, seat_id={seat_id} (이미 예약됨)")
-            return {"success": False, "message": "이미 예약된 좌석입니다"}
+            log_event(logger, logging.WARNING, "reservation_rejected", mode="unsafe",
+                      user_id=user_id, seat_id=seat_id, reason=reason)
+            return {"success": False, "message": REJECT_MESSAGES[reason]}
         
-        # 3. 해당 사용자가 이미 다른 좌석을 예약했는지 확인
-        cursor.execute("SELECT COUNT(*) as count FROM seats WHERE reserved_by = %s", (user_id,))
+        # 3. 해당 사용자가 이미 다른 좌석을 예약(선점)했는지 확인
+        cursor.execute('''
+            SELECT COUNT(*) as count FROM seats
+            WHERE event_id = %s AND reserved_by = %s AND id <> %s
+              AND (status = 'reserved' OR held_until > %s)
+        ''', (event_id, user_id, seat_id, now))
         user_reservation = cursor.fetchone()
         
         if user_reservation['count'] > 0:
@@ -111,137 +326,497 @@ def reserve_seat_unsafe(user_id, seat_id):
         
         # ⚠️ Race Condition 발생 구간: 여기서 다른 요청이 끼어들 수 있음
         
-        # 4. 좌석 예약
-        cursor.execute('''
+        # 4. 좌석 예약 (점유 카운터는 이 UPDATE가 실제로 예약 상태로 바꿨을 때만 반영)
+        changed = cursor.execute('''
             UPDATE seats 
-            SET status = 'reserved', reserved_by = %s, reserved_at = NOW()
-            WHERE id = %s
+            SET status = 'reserved', reserved_by = %s, reserved_at = NOW(), held_until = NULL
+            WHERE id = %s AND status <> 'reserved'
         ''', (user_id, seat_id))
+        if changed:
+            apply_seat_changes(cursor, event_id, [(seat_id, seat['row_num'], seat['status'], 'reserved')])
+        else:
+            # 그 사이 다른 요청이 먼저 예약함 - 예약자만 덮어써서 Race Condition은 그대로 재현
+            cursor.execute("UPDATE seats SET reserved_by = %s, reserved_at = NOW() WHERE id = %s",
+                           (user_id, seat_id))
         
         conn.commit()
+        bump_version(conn, scoped_name("seats", event_id),
+                     {"seat_ids": [seat_id], "status": "reserved", "user_id": user_id, "event_id": event_id})
         conn.close()
         
-        logging.info(f"✅ [UNSAFE] 예약 성공: user_id={user_id}, seat_id={seat_id}")
+        log_event(logger, logging.INFO, "reservation_succeeded", sampled=True, mode="unsafe",
+                  user_id=user_id, seat_id=seat_id)
+        audit("reservation", mode="unsafe", user_id=user_id, seat_id=seat_id)
         return {"success": True, "message": "좌석 예약 성공"}
         
     except Exception as e:
         conn.rollback()
         conn.close()
-        logging.error(f"❌ [UNSAFE] 예약 오류: {str(e)}")
+        logger.exception("reservation_failed mode=%s user_id=%s seat_id=%s", "unsafe", user_id, seat_id)
         return {"success": False, "message": "예약 중 오류 발생"}
 
 
-def reserve_seat_safe(user_id, seat_id):
-    """좌석 예약 (FOR UPDATE 락 사용)"""
-    conn = get_connection()
+@retry_transaction()
+def reserve_seat_safe(user_id, seat_id, event_id):
+    """좌석 예약 (사용자 행 락 + 좌석 행 락, 트랜잭션 설정은 declare_transaction 참고)"""
+    conn = begin_transaction("reserve_seat_safe")
     cursor = conn.cursor(pymysql.cursors.DictCursor)
     
     try:
-        # 트랜잭션 시작
-        conn.start_transaction()
+        now = datetime.now()
         
-        # 1. 좌석 상태 확인 (FOR UPDATE 락)
-        cursor.execute('''
-            SELECT status, reserved_by FROM seats 
-            WHERE id = %s 
-            FOR UPDATE
-        ''', (seat_id,))
+        # 1. 사용자 행 락 (같은 사용자의 동시 예약/선점 직렬화)
+        if not _lock_user(cursor, user_id):
+            conn.rollback()
+            conn.close()
+            return {"success": False, "message": "존재하지 않는 사용자입니다"}
+        
+        # 2. 좌석 상태 확인 (잠금 읽기)
+        cursor.execute(f'''
+            SELECT status, row_num, reserved_by, held_until FROM seats 
+            WHERE id = %s AND event_id = %s
+            {conn.lock_clause}
+        ''', (seat_id, event_id))
         seat = cursor.fetchone()
         
         if not seat:
+            # SKIP LOCKED는 다른 트랜잭션이 잠근 좌석을 결과에서 뺌
+            locked = conn.lock_mode == "skip_locked" and _existing_seat_ids(cursor, [seat_id], event_id)
             conn.rollback()
             conn.close()
+            if locked:
+                return {"success": False, "message": REJECT_MESSAGES["locked"]}
             return {"success": False, "message": "존재하지 않는 좌석입니다"}
         
-        # 2. 이미 예약된 좌석인지 확인
-        if seat['status'] == 'reserved':
+        # 3. 이미 예약(또는 다른 사용자가 선점)된 좌석인지 확인
+        reason = _unavailable_reason(seat, user_id, now)
+        if reason:
             conn.rollback()
             conn.close()
-            logging.warning(f"❌ [SAFE] 예약 실패: user_id={user_id}, seat_id={seat_id} (이미 예약됨)")
-            return {"success": False, "message": "이미 예약된 좌석입니다"}
-        
-        # 3. 해당 사용자가 이미 다른 좌석을 예약했는지 확인 (FOR UPDATE 락)
-        cursor.execute('''
-            SELECT COUNT(*) as count FROM seats 
-            WHERE reserved_by = %s 
-            FOR UPDATE
-        ''', (user_id,))
-        user_reservation = cursor.fetchone()
+            log_event(logger, logging.WARNING, "reservation_rejected", mode="safe",
+                      user_id=user_id, seat_id=seat_id, reason=reason)
+            return {"success": False, "message": REJECT_MESSAGES[reason]}
         
-        if user_reservation['count'] > 0:
+        # 4. 해당 사용자가 이미 다른 좌석을 예약(선점)했는지 확인 (사용자 행 락으로 보호)
+        if _has_other_seat(cursor, user_id, event_id, [seat_id], now):
             conn.rollback()
             conn.close()
             return {"success": False, "message": "이미 좌석을 예약했습니다"}
         
-        # 4. 좌석 예약 (락이 걸려있어 다른 요청은 대기)
+        # 5. 좌석 예약 (락이 걸려있어 다른 요청은 대기)
         cursor.execute('''
             UPDATE seats 
-            SET status = 'reserved', reserved_by = %s, reserved_at = NOW()
+            SET status = 'reserved', reserved_by = %s, reserved_at = NOW(), held_until = NULL
             WHERE id = %s
         ''', (user_id, seat_id))
+        apply_seat_changes(cursor, event_id, [(seat_id, seat['row_num'], seat['status'], 'reserved')])
         
         conn.commit()
+        bump_version(conn, scoped_name("seats", event_id),
+                     {"seat_ids": [seat_id], "status": "reserved", "user_id": user_id, "event_id": event_id})
         conn.close()
         
-        logging.info(f"✅ [SAFE] 예약 성공: user_id={user_id}, seat_id={seat_id}")
+        log_event(logger, logging.INFO, "reservation_succeeded", sampled=True, mode="safe",
+                  user_id=user_id, seat_id=seat_id)
+        audit("reservation", mode="safe", user_id=user_id, seat_id=seat_id)
         return {"success": True, "message": "좌석 예약 성공"}
         
     except Exception as e:
         conn.rollback()
         conn.close()
-        logging.error(f"❌ [SAFE] 예약 오류: {str(e)}")
+        if is_retryable(e):
+            # 데드락 / 락 대기 타임아웃은 retry_transaction이 트랜잭션 전체를 다시 실행
+            raise
+        if is_lock_busy(e):
+            log_event(logger, logging.WARNING, "reservation_rejected", mode="safe",
+                      user_id=user_id, seat_id=seat_id, reason="locked")
+            return {"success": False, "message": REJECT_MESSAGES["locked"]}
+        logger.exception("reservation_failed mode=%s user_id=%s seat_id=%s", "safe", user_id, seat_id)
         return {"success": False, "message": "예약 중 오류 발생"}
 
 
-def cancel_reservation(user_id, seat_id):
-    """좌석 예약 취소"""
-    conn = get_connection()
+@retry_transaction()
+def reserve_seats_group(user_id, seat_ids, event_id):
+    """
+    단체 좌석 일괄 예약 (한 트랜잭션, 전부 성공 또는 전부 실패)
+
+    사용자 행 다음에 좌석 id 오름차순으로 락을 잡아 여러 단체 예약이 겹쳐도 데드락이 나지 않게 합니다.
+    1인 1좌석 규칙 대신 '이미 예약이 있는 사용자는 단체 예약 불가'를 적용합니다.
+    선점된 좌석(SKIP LOCKED면 다른 트랜잭션이 잠근 좌석 포함)이 있으면
+    unavailable_seat_ids에 담아 반환합니다 (인덱스 보정용).
+    """
+    seat_ids = sorted(set(seat_ids))
+    placeholders = ", ".join(["%s"] * len(seat_ids))
+    conn = begin_transaction("reserve_seats_group")
     cursor = conn.cursor(pymysql.cursors.DictCursor)
     
     try:
-        # 해당 좌석이 이 사용자가 예약한 것인지 확인
+        now = datetime.now()
+        
+        # 1. 사용자 행 락
+        if not _lock_user(cursor, user_id):
+            conn.rollback()
+            conn.close()
+            return {"success": False, "message": "존재하지 않는 사용자입니다"}
+        
+        # 2. 좌석 락 (id 순서로 고정)
+        cursor.execute(f'''
+            SELECT id, status, row_num, reserved_by, held_until FROM seats
+            WHERE event_id = %s AND id IN ({placeholders})
+            ORDER BY id
+            {conn.lock_clause}
+        ''', [event_id] + seat_ids)
+        seats = cursor.fetchall()
+        
+        unavailable = [seat['id'] for seat in seats if _unavailable_reason(seat, user_id, now)]
+        missing = set(seat_ids) - {seat['id'] for seat in seats}
+        if missing and conn.lock_mode == "skip_locked":
+            locked = _existing_seat_ids(cursor, missing, event_id)
+            unavailable = sorted(unavailable + list(locked))
+            missing -= locked
+        if missing or unavailable:
+            conn.rollback()
+            conn.close()
+            log_event(logger, logging.WARNING, "group_reservation_rejected", user_id=user_id,
+                      seat_ids=seat_ids, reason="seat_unavailable")
+            return {"success": False, "message": "이미 예약된 좌석이 포함되어 있습니다",
+                    "unavailable_seat_ids": unavailable}
+        
+        # 3. 사용자의 기존 예약(선점) 확인 (사용자 행 락으로 보호)
+        if _has_other_seat(cursor, user_id, event_id, seat_ids, now):
+            conn.rollback()
+            conn.close()
+            return {"success": False, "message": "이미 좌석을 예약했습니다"}
+        
+        # 4. 일괄 예약
+        cursor.execute(f'''
+            UPDATE seats 
+            SET status = 'reserved', reserved_by = %s, reserved_at = NOW(), held_until = NULL
+            WHERE id IN ({placeholders})
+        ''', [user_id] + seat_ids)
+        apply_seat_changes(cursor, event_id,
+                           [(seat['id'], seat['row_num'], seat['status'], 'reserved') for seat in seats])
+        
+        conn.commit()
+        bump_version(conn, scoped_name("seats", event_id),
+                     {"seat_ids": seat_ids, "status": "reserved", "user_id": user_id, "event_id": event_id})
+        conn.close()
+        
+        log_event(logger, logging.INFO, "group_reservation_succeeded", sampled=True,
+                  user_id=user_id, seat_ids=seat_ids)
+        audit("group_reservation", user_id=user_id, seat_ids=seat_ids)
+        return {"success": True, "message": f"{len(seat_ids)}석 예약 성공", "seat_ids": seat_ids}
+        
+    except Exception as e:
+        conn.rollback()
+        conn.close()
+        if is_retryable(e):
+            # 데드락 / 락 대기 타임아웃은 retry_transaction이 트랜잭션 전체를 다시 실행
+            raise
+        if is_lock_busy(e):
+            # NOWAIT: 어느 좌석이 잠겼는지 알 수 없으므로 인덱스 보정 없이 거절
+            log_event(logger, logging.WARNING, "group_reservation_rejected", user_id=user_id,
+                      seat_ids=seat_ids, reason="locked")
+            return {"success": False, "message": REJECT_MESSAGES["locked"]}
+        logger.exception("group_reservation_failed user_id=%s seat_ids=%s", user_id, seat_ids)
+        return {"success": False, "message": "예약 중 오류 발생"}
+
+
+@retry_transaction()
+def reserve_any_seat(user_id, event_id, row_from=None, row_to=None):
+    """
+    조건(행 범위)에 맞는 빈 좌석 아무거나 예약
+
+    좌석을 지정하지 않고 앞쪽 행부터 첫 빈 좌석을 FOR UPDATE SKIP LOCKED로 잡으므로,
+    동시에 몰린 요청은 같은 좌석의 락을 기다리지 않고 서로 다른 좌석으로 흩어집니다.
+    (event_id, status, row_num, col_num) 인덱스를 순서대로 훑어 정렬 없이 첫 행에서 멈추며,
+    READ COMMITTED라서 조건에 맞지 않는 행은 잠그지 않습니다.
+    만료 시각이 지났지만 아직 해제되지 않은 선점 좌석은 후보에서 빠집니다 (곧 스케줄러가 해제).
+    """
+    conn = begin_transaction("reserve_any_seat")
+    cursor = conn.cursor(pymysql.cursors.DictCursor)
+    
+    try:
+        now = datetime.now()
+        
+        # 1. 사용자 행 락 + 1인 1좌석 확인
+        if not _lock_user(cursor, user_id):
+            conn.rollback()
+            conn.close()
+            return {"success": False, "message": "존재하지 않는 사용자입니다"}
+        if _has_other_seat(cursor, user_id, event_id, [], now):
+            conn.rollback()
+            conn.close()
+            return {"success": False, "message": "이미 좌석을 예약했습니다"}
+        
+        # 2. 다른 요청이 잠그지 않은 첫 빈 좌석
+        conditions, params = ["event_id = %s", "status = 'available'"], [event_id]
+        if row_from is not None:
+            conditions.append("row_num >= %s")
+            params.append(row_from)
+        if row_to is not None:
+            conditions.append("row_num <= %s")
+            params.append(row_to)
+        cursor.execute(f'''
+            SELECT id, seat_number, row_num, col_num FROM seats
+            WHERE {" AND ".join(conditions)}
+            ORDER BY row_num, col_num
+            LIMIT 1
+            {conn.lock_clause}
+        ''', params)
+        seat = cursor.fetchone()
+        
+        if not seat:
+            conn.rollback()
+            conn.close()
+            log_event(logger, logging.WARNING, "reservation_rejected", mode="any",
+                      user_id=user_id, event_id=event_id, reason="sold_out")
+            return {"success": False, "message": "조건에 맞는 빈 좌석이 없습니다"}
+        
+        # 3. 예약
         cursor.execute('''
-            SELECT reserved_by FROM seats 
-            WHERE id = %s AND reserved_by = %s
-        ''', (seat_id, user_id))
+            UPDATE seats 
+            SET status = 'reserved', reserved_by = %s, reserved_at = NOW(), held_until = NULL
+            WHERE id = %s
+        ''', (user_id, seat['id']))
+        apply_seat_changes(cursor, event_id, [(seat['id'], seat['row_num'], 'available', 'reserved')])
+        
+        conn.commit()
+        bump_version(conn, scoped_name("seats", event_id),
+                     {"seat_ids": [seat['id']], "status": "reserved", "user_id": user_id, "event_id": event_id})
+        conn.close()
+        
+        log_event(logger, logging.INFO, "reservation_succeeded", sampled=True, mode="any",
+                  user_id=user_id, seat_id=seat['id'])
+        audit("reservation", mode="any", user_id=user_id, seat_id=seat['id'])
+        return {"success": True, "message": f"{seat['seat_number']} 좌석 예약 성공",
+                "seat_id": seat['id'], "seat_number": seat['seat_number'],
+                "row_num": seat['row_num'], "col_num": seat['col_num']}
         
+    except Exception as e:
+        conn.rollback()
+        conn.close()
+        if is_retryable(e):
+            # 데드락 / 락 대기 타임아웃은 retry_transaction이 트랜잭션 전체를 다시 실행
+            raise
+        logger.exception("reservation_failed mode=%s user_id=%s event_id=%s", "any", user_id, event_id)
+        return {"success": False, "message": "예약 중 오류 발생"}
+
+
+@retry_transaction()
+def hold_seat(user_id, seat_id, event_id, ttl_seconds):
+    """
+    좌석 임시 선점 (ttl_seconds 동안 다른 사용자가 예약할 수 없음)
+
+    선점한 좌석은 같은 사용자가 reserve_seat_*()로 확정하거나 cancel_reservation()으로 풀 수 있고,
+    확정하지 않으면 utils.seat_holds 스케줄러가 만료 시각에 expire_holds()로 되돌립니다.
+    """
+    conn = begin_transaction("hold_seat")
+    cursor = conn.cursor(pymysql.cursors.DictCursor)
+    
+    try:
+        now = datetime.now()
+        held_until = now + timedelta(seconds=ttl_seconds)
+        
+        # 1. 사용자 행 락
+        if not _lock_user(cursor, user_id):
+            conn.rollback()
+            conn.close()
+            return {"success": False, "message": "존재하지 않는 사용자입니다"}
+        
+        # 2. 좌석 상태 확인 (잠금 읽기)
+        cursor.execute(f'''
+            SELECT status, row_num, reserved_by, held_until FROM seats
+            WHERE id = %s AND event_id = %s
+            {conn.lock_clause}
+        ''', (seat_id, event_id))
         seat = cursor.fetchone()
         
         if not seat:
+            locked = conn.lock_mode == "skip_locked" and _existing_seat_ids(cursor, [seat_id], event_id)
+            conn.rollback()
+            conn.close()
+            if locked:
+                return {"success": False, "message": REJECT_MESSAGES["locked"]}
+            return {"success": False, "message": "존재하지 않는 좌석입니다"}
+        
+        reason = _unavailable_reason(seat, user_id, now)
+        if reason:
+            conn.rollback()
+            conn.close()
+            log_event(logger, logging.WARNING, "hold_rejected", user_id=user_id, seat_id=seat_id, reason=reason)
+            return {"success": False, "message": REJECT_MESSAGES[reason]}
+        
+        # 3. 해당 사용자가 이미 다른 좌석을 예약(선점)했는지 확인 (사용자 행 락으로 보호)
+        if _has_other_seat(cursor, user_id, event_id, [seat_id], now):
+            conn.rollback()
+            conn.close()
+            return {"success": False, "message": "이미 좌석을 예약했습니다"}
+        
+        # 4. 선점 (본인 선점이면 만료 시각만 연장)
+        cursor.execute('''
+            UPDATE seats
+            SET status = 'held', reserved_by = %s, held_until = %s
+            WHERE id = %s
+        ''', (user_id, held_until, seat_id))
+        apply_seat_changes(cursor, event_id, [(seat_id, seat['row_num'], seat['status'], 'held')])
+        
+        conn.commit()
+        bump_version(conn, scoped_name("seats", event_id),
+                     {"seat_ids": [seat_id], "status": "held", "held_until": held_until,
+                      "user_id": user_id, "event_id": event_id})
+        conn.close()
+        
+        log_event(logger, logging.INFO, "hold_succeeded", sampled=True,
+                  user_id=user_id, seat_id=seat_id, ttl=ttl_seconds)
+        return {"success": True, "message": "좌석 선점 성공", "held_until": held_until.isoformat()}
+        
+    except Exception as e:
+        conn.rollback()
+        conn.close()
+        if is_retryable(e):
+            # 데드락 / 락 대기 타임아웃은 retry_transaction이 트랜잭션 전체를 다시 실행
+            raise
+        if is_lock_busy(e):
+            log_event(logger, logging.WARNING, "hold_rejected", user_id=user_id, seat_id=seat_id, reason="locked")
+            return {"success": False, "message": REJECT_MESSAGES["locked"]}
+        logger.exception("hold_failed user_id=%s seat_id=%s", user_id, seat_id)
+        return {"success": False, "message": "선점 중 오류 발생"}
+
+
+# 재시도해도 실패하면 None (hold_scheduler가 다음 주기에 다시 시도)
+@retry_transaction(on_exhausted=lambda e: None)
+def expire_holds(seat_ids):
+    """
+    만료된 선점 일괄 해제 (한 트랜잭션, UPDATE 1회)
+
+    seat_ids 중 아직 선점 상태이고 만료 시각이 지난 좌석만 되돌립니다.
+    그 사이 확정/취소/연장된 좌석은 조건에서 걸러지므로 스케줄러는 오래된 항목을 지우지 않아도 됩니다.
+    실제로 해제된 좌석을 {event_id: [좌석 id, ...]}로 반환하며, 오류 시 None을 반환합니다 (스케줄러가 재시도).
+    잠금 방식이 skip_locked면 예약 확정 중인 좌석은 건너뛰고, 확정되지 않았으면 다음 주기에 해제됩니다.
+    """
+    seat_ids = sorted(set(seat_ids))
+    if not seat_ids:
+        return {}
+    placeholders = ", ".join(["%s"] * len(seat_ids))
+    conn = begin_transaction("expire_holds")
+    cursor = conn.cursor()
+    
+    try:
+        now = datetime.now()
+        cursor.execute(f'''
+            SELECT id, event_id, row_num FROM seats
+            WHERE id IN ({placeholders}) AND status = 'held' AND held_until <= %s
+            ORDER BY id
+            {conn.lock_clause}
+        ''', seat_ids + [now])
+        rows = cursor.fetchall()
+        expired = [row[0] for row in rows]
+        
+        if expired:
+            cursor.execute(f'''
+                UPDATE seats
+                SET status = 'available', reserved_by = NULL, held_until = NULL
+                WHERE id IN ({", ".join(["%s"] * len(expired))})
+            ''', expired)
+        released = {}
+        for seat_id, event_id, row_num in rows:
+            released.setdefault(event_id, []).append((seat_id, row_num, 'held', 'available'))
+        for event_id, changes in released.items():
+            apply_seat_changes(cursor, event_id, changes)
+        conn.commit()
+        
+        released = {event_id: [change[0] for change in changes] for event_id, changes in released.items()}
+        for event_id, event_seat_ids in released.items():
+            bump_version(conn, scoped_name("seats", event_id),
+                         {"seat_ids": event_seat_ids, "status": "available", "event_id": event_id})
+        conn.close()
+        return released
+        
+    except Exception as e:
+        conn.rollback()
+        conn.close()
+        if is_retryable(e):
+            # 데드락 / 락 대기 타임아웃은 retry_transaction이 트랜잭션 전체를 다시 실행
+            raise
+        if not is_lock_busy(e):
+            logger.exception("hold_expiry_failed seat_ids=%d", len(seat_ids))
+        return None
+
+
+def get_active_holds():
+    """선점 중인 좌석 (id, held_until) 목록 - 워커 시작 시 만료 스케줄 복구용"""
+    conn = get_connection()
+    cursor = conn.cursor()
+    cursor.execute("SELECT id, held_until FROM seats WHERE status = 'held'")
+    holds = cursor.fetchall()
+    conn.close()
+    return holds
+
+
+@retry_transaction()
+def cancel_reservation(user_id, seat_id, event_id):
+    """좌석 예약(선점) 취소"""
+    conn = begin_transaction("cancel_reservation")
+    cursor = conn.cursor(pymysql.cursors.DictCursor)
+    
+    try:
+        # 이 사용자가 예약(선점)한 좌석인지 확인 (잠금 읽기, 이전 상태는 점유 카운터 갱신용)
+        cursor.execute(f'''
+            SELECT status, row_num FROM seats 
+            WHERE id = %s AND event_id = %s AND reserved_by = %s
+            {conn.lock_clause}
+        ''', (seat_id, event_id, user_id))
+        seat = cursor.fetchone()
+        
+        if not seat:
+            conn.rollback()
             conn.close()
             return {"success": False, "message": "예약 취소 권한이 없습니다"}
         
-        # 예약 취소
         cursor.execute('''
             UPDATE seats 
-            SET status = 'available', reserved_by = NULL, reserved_at = NULL
+            SET status = 'available', reserved_by = NULL, reserved_at = NULL, held_until = NULL
             WHERE id = %s
         ''', (seat_id,))
+        apply_seat_changes(cursor, event_id, [(seat_id, seat['row_num'], seat['status'], 'available')])
         
         conn.commit()
+        bump_version(conn, scoped_name("seats", event_id),
+                     {"seat_ids": [seat_id], "status": "available", "user_id": user_id, "event_id": event_id})
         conn.close()
         
-        logging.info(f"✅ 예약 취소: user_id={user_id}, seat_id={seat_id}")
+        log_event(logger, logging.INFO, "reservation_cancelled", sampled=True,
+                  user_id=user_id, seat_id=seat_id)
+        audit("reservation_cancel", user_id=user_id, seat_id=seat_id)
         return {"success": True, "message": "예약이 취소되었습니다"}
         
     except Exception as e:
         conn.rollback()
         conn.close()
-        logging.error(f"❌ 예약 취소 오류: {str(e)}")
+        if is_retryable(e):
+            # 데드락 / 락 대기 타임아웃은 retry_transaction이 트랜잭션 전체를 다시 실행
+            raise
+        logger.exception("cancel_failed user_id=%s seat_id=%s", user_id, seat_id)
         return {"success": False, "message": "예약 취소 중 오류 발생"}
 
 
-def get_user_reservation(user_id):
-    """사용자의 예약 좌석 조회"""
-    conn = get_connection()
+def get_user_reservations(user_id, event_id):
+    """
+    공연에서 사용자의 예약(선점) 좌석 목록 조회 (복제본 사용, 본인 쓰기 직후에는 반영 여부 확인)
+
+    단체 예매로 한 사용자가 여러 좌석을 가질 수 있으므로 행/열 순서의 목록을 반환합니다.
+    """
+    conn = get_read_connection(scoped_name("seats", event_id), user_id)
     cursor = conn.cursor(pymysql.cursors.DictCursor)
     
     cursor.execute('''
-        SELECT id, seat_number, row_num, col_num, reserved_at
+        SELECT id, seat_number, row_num, col_num, status, reserved_at, held_until
         FROM seats
-        WHERE reserved_by = %s
-    ''', (user_id,))
+        WHERE event_id = %s AND reserved_by = %s
+        ORDER BY row_num, col_num
+    ''', (event_id, user_id))
     
-    seat = cursor.fetchone()
+    seats = cursor.fetchall()
     conn.close()
-    return seat
+    return seats
@@ -0,0 +1,111 @@
+"""동시 동일 조회 합치기 (single-flight)
+
+같은 키의 조회가 이미 실행 중이면 새로 쿼리하지 않고 실행 중인 조회의 결과를 함께 받습니다.
+브로드캐스트 직후 수많은 클라이언트가 동시에 get_all_seats(event_id)를 부르는 상황에서
+DB 조회 수를 동시 요청 수와 무관하게 1회로 줄입니다.
+
+키에는 데이터 버전(database.versions)을 포함해, 이 워커의 쓰기 이후 호출이
+쓰기 이전에 시작된 조회 결과를 받지 않도록 합니다 (read-after-write 보장).
+결과 객체는 호출자끼리 공유되므로 호출자는 결과를 수정하지 않아야 합니다.
+"""
+import functools
+import threading
+import time
+
+from .versions import get_version
+
+
+class _Call:
+    __slots__ = ("event", "result", "error")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """키별 실행 중 조회 공유 + 키별 통계"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self._stats = {}
+
+    def do(self, key, stats_key: str, func, *args):
+        with self._lock:
+            stats = self._stats.setdefault(stats_key, {"executed": 0, "shared": 0, "total_ms": 0.0, "max_ms": 0.0})
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                stats["executed"] += 1
+            else:
+                stats["shared"] += 1
+
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        start = time.perf_counter()
+        try:
+            call.result = func(*args)
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            with self._lock:
+                del self._calls[key]
+                stats["total_ms"] += elapsed_ms
+                stats["max_ms"] = max(stats["max_ms"], elapsed_ms)
+            call.event.set()
+
+    def stats(self) -> dict:
+        with self._lock:
+            result = {}
+            for key, stats in self._stats.items():
+                calls = stats["executed"] + stats["shared"]
+                result[key] = dict(
+                    stats,
+                    total_ms=round(stats["total_ms"], 2),
+                    max_ms=round(stats["max_ms"], 2),
+                    avg_ms=round(stats["total_ms"] / stats["executed"], 2) if stats["executed"] else 0.0,
+                    shared_ratio=round(stats["shared"] / calls, 3) if calls else 0.0,
+                )
+            return result
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+
+
+_flight = SingleFlight()
+
+
+def coalesced(version_name: str = None):
+    """
+    조회 함수 데코레이터 - 같은 인자의 동시 호출을 한 번의 실행으로 합침
+
+    version_name을 주면 해당 데이터 버전이 바뀐 뒤의 호출은 새 조회로 실행됩니다.
+    공연별 버전은 "seats:{}"처럼 쓰면 첫 번째 인자(event_id)로 이름을 채웁니다.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args):
+            version = get_version(version_name.format(*args)) if version_name else None
+            return _flight.do((func.__name__, args, version), func.__name__, func, *args)
+        return wrapper
+    return decorator
+
+
+def get_singleflight_stats() -> dict:
+    """함수별 실행 / 공유 횟수, 실행 시간"""
+    return _flight.stats()
+
+
+def reset_singleflight_stats():
+    _flight.reset()
@@ -1,22 +1,78 @@
 """사용자 관련 데이터베이스 함수"""
 import pymysql
 import hashlib
+import hmac
+import itertools
+import multiprocessing
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from config import PASSWORD_SCRYPT_N, PASSWORD_SCRYPT_R, PASSWORD_SCRYPT_P, USER_BULK_BATCH_SIZE
+from utils.log import audit
 from .base import get_connection
 
+# 저장 형식: scrypt$n$r$p$salt(hex)$hash(hex)
+SCRYPT_PREFIX = "scrypt$"
+SCRYPT_DKLEN = 64
 
-def hash_password(password: str) -> str:
-    """비밀번호 해싱"""
+# 존재하지 않는 사용자 로그인 시에도 같은 비용의 해싱을 수행하기 위한 더미 해시
+_DUMMY_HASH = None
+
+
+def _scrypt(password: str, salt: bytes, n: int, r: int, p: int) -> bytes:
+    return hashlib.scrypt(password.encode(), salt=salt, n=n, r=r, p=p,
+                          maxmem=256 * n * r + 1024 * 1024, dklen=SCRYPT_DKLEN)
+
+
+def _legacy_hash(password: str) -> str:
+    """기존 SHA-256 해시 (마이그레이션 전 저장된 비밀번호 검증용)"""
     return hashlib.sha256(password.encode()).hexdigest()
 
 
+def hash_password(password: str, n: int = PASSWORD_SCRYPT_N) -> str:
+    """
+    비밀번호 해싱 (scrypt)
+
+    CPU와 메모리를 많이 쓰므로 이벤트 루프가 아닌 스레드 풀에서 호출해야 합니다.
+    n은 대량 생성하는 부하 테스트 계정에만 낮춰 씁니다 (첫 로그인에서 현재 설정으로 재해싱).
+    """
+    salt = os.urandom(16)
+    digest = _scrypt(password, salt, n, PASSWORD_SCRYPT_R, PASSWORD_SCRYPT_P)
+    return f"{SCRYPT_PREFIX}{n}${PASSWORD_SCRYPT_R}${PASSWORD_SCRYPT_P}${salt.hex()}${digest.hex()}"
+
+
+def verify_password(password: str, stored: str) -> tuple:
+    """
+    저장된 해시와 비밀번호 비교 (상수 시간 비교)
+
+    반환값: (일치 여부, 재해싱 필요 여부)
+    레거시 SHA-256 해시이거나 scrypt 파라미터가 현재 설정과 다르면 재해싱 대상입니다.
+    """
+    if not stored.startswith(SCRYPT_PREFIX):
+        matched = hmac.compare_digest(_legacy_hash(password), stored)
+        return matched, matched
+
+    try:
+        _, n, r, p, salt_hex, hash_hex = stored.split("$")
+        n, r, p = int(n), int(r), int(p)
+        salt, expected = bytes.fromhex(salt_hex), bytes.fromhex(hash_hex)
+    except ValueError:
+        return False, False
+
+    matched = hmac.compare_digest(_scrypt(password, salt, n, r, p), expected)
+    outdated = (n, r, p) != (PASSWORD_SCRYPT_N, PASSWORD_SCRYPT_R, PASSWORD_SCRYPT_P)
+    return matched, matched and outdated
+
+
 def create_user(username: str, password: str) -> bool:
     """사용자 생성"""
+    hashed_pw = hash_password(password)
     conn = get_connection()
     cursor = conn.cursor()
-    
+
     try:
-        hashed_pw = hash_password(password)
-        cursor.execute("INSERT INTO users (username, password) VALUES (%s, %s)", 
+        cursor.execute("INSERT INTO users (username, password) VALUES (%s, %s)",
                       (username, hashed_pw))
         conn.commit()
         conn.close()
@@ -26,18 +82,136 @@ def create_user(username: str, password: str) -> bool:
         return False
 
 
-def verify_user(username: str, password: str) -> bool:
-    """사용자 인증"""
+def _hash_batch(batch, n: int):
+    """프로세스 풀 작업 - (username, password) 목록을 (username, 해시) 목록으로"""
+    return [(username, hash_password(password, n)) for username, password in batch]
+
+
+def _insert_users(cursor, rows, on_duplicate: str) -> int:
+    """다중 행 INSERT 한 문장, 영향받은 행 수 반환 (update는 행 별칭 new 사용, MySQL 8.0.19 이상)"""
+    values = ", ".join(["(%s, %s)"] * len(rows))
+    params = [value for row in rows for value in row]
+    if on_duplicate == "update":
+        return cursor.execute("INSERT INTO users (username, password) VALUES " + values
+                              + " AS new ON DUPLICATE KEY UPDATE password = new.password", params)
+    return cursor.execute("INSERT IGNORE INTO users (username, password) VALUES " + values, params)
+
+
+def bulk_create_users(users, batch_size: int = None, workers: int = None,
+                      on_duplicate: str = "skip", scrypt_n: int = None) -> dict:
+    """
+    사용자 대량 생성 (부하 테스트 계정 / 마이그레이션)
+
+    users는 (username, password) 이터러블이며 batch_size개씩 끊어 읽으므로 파일이나 제너레이터를
+    그대로 흘려 보낼 수 있습니다. 배치마다 workers개 프로세스 중 하나가 비밀번호를 해싱하고,
+    해싱이 끝난 배치부터 순서대로 다중 행 INSERT 한 문장 + 커밋 한 번으로 넣습니다.
+    해싱과 INSERT는 겹쳐서 진행하며, 메모리에 올라가는 배치는 workers * 2개까지입니다.
+
+    on_duplicate: skip = 이미 있는 사용자는 건너뜀 / update = 비밀번호를 새 해시로 덮어씀
+    scrypt_n: 부하 테스트 계정용 scrypt 비용 (생략하면 PASSWORD_SCRYPT_N)
+    """
+    if on_duplicate not in ("skip", "update"):
+        raise ValueError(f"지원하지 않는 중복 처리 방식입니다: {on_duplicate}")
+    scrypt_n = scrypt_n or PASSWORD_SCRYPT_N
+    if scrypt_n < 2 or scrypt_n & (scrypt_n - 1):
+        raise ValueError(f"scrypt N은 2 이상의 2의 거듭제곱이어야 합니다: {scrypt_n}")
+    batch_size = batch_size or USER_BULK_BATCH_SIZE
+    workers = workers or os.cpu_count() or 1
+
+    result = {"created": 0, "updated": 0, "skipped": 0, "invalid": 0}
+
+    def valid_users():
+        for username, password in users:
+            username = str(username)
+            if 0 < len(username) <= 255:
+                yield username, str(password)
+            else:
+                result["invalid"] += 1
+
+    stream = valid_users()
+    batches = iter(lambda: list(itertools.islice(stream, batch_size)), [])
+    pending = deque()
+
+    def insert_pending(limit: int):
+        """대기 배치가 limit개 이하가 될 때까지 가장 오래된 배치부터 INSERT + 커밋"""
+        while len(pending) > limit:
+            count, future = pending.popleft()
+            affected = _insert_users(cursor, future.result(), on_duplicate)
+            conn.commit()
+            if on_duplicate == "update":
+                # ON DUPLICATE KEY UPDATE는 새 행 1, 갱신된 행 2로 셈
+                result["updated"] += affected - count
+                result["created"] += 2 * count - affected
+            else:
+                result["created"] += affected
+                result["skipped"] += count - affected
+
+    start = time.perf_counter()
     conn = get_connection()
     cursor = conn.cursor()
-    
-    hashed_pw = hash_password(password)
-    cursor.execute("SELECT * FROM users WHERE username = %s AND password = %s", 
-                  (username, hashed_pw))
-    user = cursor.fetchone()
-    conn.close()
-    
-    return user is not None
+    # 서버 워커(스레드 사용 중)에서 호출해도 안전하도록 fork 대신 spawn
+    executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+    try:
+        for batch in batches:
+            pending.append((len(batch), executor.submit(_hash_batch, batch, scrypt_n)))
+            insert_pending(workers * 2 - 1)
+        insert_pending(0)
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        executor.shutdown(cancel_futures=True)
+        conn.close()
+
+    seconds = time.perf_counter() - start
+    processed = result["created"] + result["updated"] + result["skipped"]
+    result.update(seconds=round(seconds, 3),
+                  users_per_second=round(processed / seconds) if seconds > 0 else processed)
+    audit("users_bulk_created", **result)
+    return result
+
+
+def authenticate_user(username: str, password: str):
+    """
+    사용자 인증 - 성공 시 user_id, 실패 시 None
+
+    id와 비밀번호 해시를 한 번의 쿼리로 조회하고, 레거시 해시로 로그인에
+    성공하면 같은 연결에서 scrypt 해시로 교체합니다.
+    """
+    global _DUMMY_HASH
+
+    conn = get_connection()
+    cursor = conn.cursor()
+
+    try:
+        cursor.execute("SELECT id, password FROM users WHERE username = %s", (username,))
+        row = cursor.fetchone()
+
+        if not row:
+            # 사용자 존재 여부가 응답 시간으로 드러나지 않도록 동일한 해싱 수행
+            if _DUMMY_HASH is None:
+                _DUMMY_HASH = hash_password("")
+            verify_password(password, _DUMMY_HASH)
+            return None
+
+        user_id, stored = row
+        matched, needs_rehash = verify_password(password, stored)
+        if not matched:
+            return None
+
+        if needs_rehash:
+            cursor.execute("UPDATE users SET password = %s WHERE id = %s AND password = %s",
+                          (hash_password(password), user_id, stored))
+            conn.commit()
+
+        return user_id
+    finally:
+        conn.close()
+
+
+def verify_user(username: str, password: str) -> bool:
+    """사용자 인증"""
+    return authenticate_user(username, password) is not None
 
 
 def get_user_id(username: str) -> int:
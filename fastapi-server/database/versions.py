@@ -0,0 +1,106 @@
+"""데이터 버전 관리 - HTTP 캐시(ETag) 검증용
+
+아이템/좌석 상태가 바뀔 때마다 data_versions 테이블의 버전을 올리고,
+각 워커는 메모리에 버전 스냅샷을 들고 있다가 주기적으로 DB와 동기화합니다.
+조건부 요청(If-None-Match)은 이 스냅샷만으로 판단하므로 DB를 조회하지 않습니다.
+
+메모리 인덱스(utils.seat_index 등)는 add_change_listener()로 이 워커의 쓰기 변경분을
+받아 증분 반영하고, 다른 워커의 쓰기는 버전 차이로 감지해 다시 적재합니다.
+
+좌석/레이아웃 버전은 공연별로 나뉩니다 ("seats:3", "layout:3" - scoped_name()).
+한 공연의 예약이 다른 공연의 ETag/조회 캐시/인덱스를 무효화하지 않으며,
+공연별 행은 첫 bump_version() 때 만들어집니다.
+"""
+import logging
+import threading
+
+from .base import get_connection, record_write
+
+logger = logging.getLogger(__name__)
+
+# init_db()가 미리 만들어 두는 버전 (공연별 버전은 scoped_name()으로 필요할 때 생성)
+VERSION_NAMES = ("items", "events")
+
+_versions = {name: 0 for name in VERSION_NAMES}
+_lock = threading.Lock()
+_synced = threading.Event()
+_listeners = {}
+
+
+def scoped_name(name: str, event_id: int) -> str:
+    """공연별 버전 이름 (예: scoped_name("seats", 3) -> "seats:3")"""
+    return f"{name}:{event_id}"
+
+
+def _apply(name: str, version: int):
+    with _lock:
+        if version > _versions.get(name, 0):
+            _versions[name] = version
+
+
+def add_change_listener(name: str, listener):
+    """
+    버전 변경 리스너 등록
+
+    listener(version, change)는 이 워커에서 bump_version()이 성공할 때마다 호출됩니다.
+    공연별 이름("seats:3")에 등록하면 그 공연의 변경만, 종류 이름("seats")에 등록하면
+    모든 공연의 변경을 받습니다.
+    change는 쓰기 함수가 넘긴 변경 내용(dict)이며 없으면 None입니다.
+    change["user_id"]가 있으면 그 사용자의 read-your-writes 기준으로도 기록됩니다 (database.base).
+    """
+    _listeners.setdefault(name, []).append(listener)
+
+
+def bump_version(conn, name: str, change: dict = None) -> int:
+    """
+    버전 1 증가 (쓰기 트랜잭션 커밋 직후 같은 연결에서 호출)
+
+    짧은 단일 쿼리로 끝나도록 트랜잭션 밖에서 실행하며 (행이 없으면 1로 생성),
+    LAST_INSERT_ID()로 증가된 값을 받아 이 워커의 스냅샷에 즉시 반영합니다.
+    본 트랜잭션은 이미 커밋된 상태이므로 실패해도 예외를 올리지 않고 경고만 남깁니다.
+    """
+    try:
+        cursor = conn.cursor()
+        cursor.execute('''
+            INSERT INTO data_versions (name, version) VALUES (%s, LAST_INSERT_ID(1))
+            ON DUPLICATE KEY UPDATE version = LAST_INSERT_ID(version + 1)
+        ''', (name,))
+        cursor.execute("SELECT LAST_INSERT_ID()")
+        version = cursor.fetchone()[0]
+        conn.commit()
+    except Exception as e:
+        logger.warning("version bump failed for %s: %s", name, e)
+        return None
+    _apply(name, version)
+    record_write(name, version, change.get("user_id") if change else None)
+    kind = name.partition(":")[0]
+    listeners = _listeners.get(name, []) + (_listeners.get(kind, []) if kind != name else [])
+    for listener in listeners:
+        try:
+            listener(version, change)
+        except Exception:
+            logger.exception("version listener failed for %s", name)
+    return version
+
+
+def refresh_versions():
+    """DB의 최신 버전으로 스냅샷 갱신 (다른 워커의 쓰기 반영)"""
+    conn = get_connection()
+    cursor = conn.cursor()
+    cursor.execute("SELECT name, version FROM data_versions")
+    rows = cursor.fetchall()
+    conn.close()
+    for name, version in rows:
+        _apply(name, version)
+    _synced.set()
+
+
+def versions_ready() -> bool:
+    """DB와 한 번 이상 동기화되었는지 (그 전에는 ETag를 발급하지 않음)"""
+    return _synced.is_set()
+
+
+def get_version(name: str) -> int:
+    """메모리 스냅샷의 현재 버전 (DB 조회 없음)"""
+    return _versions.get(name, 0)
+
@@ -0,0 +1,58 @@
+"""공연장 생성 스크립트 - 스펙(또는 프리셋)으로 좌석을 만들어 새 공연으로 대량 적재
+
+사용 예:
+    python generate_venue.py --preset stadium --name "스타디움 테스트"
+    python generate_venue.py --spec venue.json --name "아레나" --method infile
+    python generate_venue.py --preset stadium --dry-run        # DB 없이 생성 시간/좌석 수만 확인
+"""
+import argparse
+import json
+import logging
+import time
+
+from config import SEAT_BULK_LOAD_METHOD, SEAT_BULK_BATCH_SIZE
+from utils.venue_layout import PRESETS, iter_seats, validate_spec
+
+
+def load_spec(args) -> dict:
+    if args.spec:
+        with open(args.spec, encoding="utf-8") as f:
+            return json.load(f)
+    return PRESETS[args.preset]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="공연장 좌석 배치 생성 + 대량 적재")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--preset", choices=sorted(PRESETS), help="기본 공연장 스펙")
+    source.add_argument("--spec", help="스펙 JSON 파일 경로 (utils/venue_layout.py 참고)")
+    parser.add_argument("--name", help="공연 이름 (기본: 프리셋/파일 이름)")
+    parser.add_argument("--starts-at", help="공연 시작 시각 (YYYY-MM-DD HH:MM)")
+    parser.add_argument("--method", choices=["insert", "infile"], default=SEAT_BULK_LOAD_METHOD,
+                        help="적재 방식 (insert = 다중 행 INSERT 배치, infile = LOAD DATA LOCAL INFILE)")
+    parser.add_argument("--batch-size", type=int, default=SEAT_BULK_BATCH_SIZE, help="INSERT 한 문장당 행 수")
+    parser.add_argument("--dry-run", action="store_true", help="DB에 적재하지 않고 좌석 생성만 측정")
+    args = parser.parse_args()
+
+    spec = load_spec(args)
+    total = validate_spec(spec)
+    print(f"📐 구역 {len(spec['sections'])}개, 좌석 {total:,}석")
+
+    start = time.perf_counter()
+    generated = sum(1 for _ in iter_seats(spec))
+    print(f"⏱️  좌석 생성: {generated:,}석 / {time.perf_counter() - start:.3f}초")
+    if args.dry_run:
+        return
+
+    # DB 모듈은 적재할 때만 import (dry-run은 DB 연결 불필요)
+    logging.basicConfig(level=logging.WARNING)
+    from database import init_db, create_event
+    init_db()
+    result = create_event(args.name or args.preset or args.spec, starts_at=args.starts_at,
+                          layout=spec, method=args.method, batch_size=args.batch_size)
+    print(f"✅ 공연 {result['event_id']} 생성: {result['seats']:,}석, {result['method']} 적재 "
+          f"{result['load_seconds']:.3f}초 ({result['rows_per_second']:,} rows/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,20 +1,93 @@
 """FastAPI 애플리케이션 메인 진입점"""
+import asyncio
+import importlib.util
+import logging
+import os
+import sys
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
-from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
+from starlette.concurrency import run_in_threadpool
 import uvicorn
 
-from config import HOST, PORT, RELOAD, STATIC_DIR, SPRING_BOOT_URL
-from database import init_db
+from config import (
+    HOST, PORT, RELOAD, STATIC_BUILD_DIR, SPRING_BOOT_URL, DEFAULT_EVENT_ID,
+    SERVER_MODE, WORKERS, BACKLOG, KEEPALIVE_TIMEOUT, LIMIT_CONCURRENCY,
+    WS_PING_INTERVAL, WS_PING_TIMEOUT, ACCESS_LOG
+)
+from utils import (
+    setup_logging, HttpCacheMiddleware, version_refresh_loop, precompile_templates,
+    build_static_assets, load_static_manifest, PrecompressedStaticFiles, availability_index, hold_scheduler, waiting_room,
+    check_waiting_room_secret
+)
+from database import init_db, init_sample_items, init_sample_seats, get_all_items, get_active_holds
 from routes.auth import router as auth_router
 from routes.shop import router as shop_router
-from routes.seats import router as seats_router
+from routes.seats import router as seats_router, broadcast_released_holds
+from routes.waiting_room import router as waiting_room_router
+from routes.admin import router as admin_router
+
+
+# 로깅 설정 (큐 기반 비동기 로깅)
+setup_logging()
+logger = logging.getLogger(__name__)
+
+
+def prepare():
+    """
+    워커를 띄우기 전에 한 번만 실행하는 준비 작업 - 정적 파일 빌드, 테이블 생성/마이그레이션, 샘플 데이터
+
+    마이그레이션은 확인(SHOW COLUMNS/INDEX) 후 ALTER TABLE이고 샘플 데이터도 확인 후 INSERT이므로
+    워커마다 동시에 실행하면 서로 충돌합니다. run_server()가 uvicorn 시작 전에 호출하며,
+    uvicorn/gunicorn을 직접 띄우는 배포는 먼저 `python main.py prepare`를 실행합니다.
+    """
+    build_static_assets()
+    init_db()
+    init_sample_items()
+    init_sample_seats()
+
+
+def warmup():
+    """
+    워커 프로세스 워밍업
+
+    첫 요청이 템플릿 컴파일/연결 수립/쿼리 캐시 미스 비용을 떠안지 않도록
+    템플릿을 사전 컴파일하고 자주 쓰는 조회를 미리 한 번 실행합니다.
+    """
+    logger.info("worker %d precompiled %d templates", os.getpid(), precompile_templates())
+    try:
+        get_all_items()
+        # 기본 공연의 좌석 조회 결과로 빈자리 인덱스 적재 (다른 공연은 처음 조회될 때 적재)
+        availability_index.get(DEFAULT_EVENT_ID)
+        # 진행 중인 좌석 선점의 만료 일정 복구
+        hold_scheduler.load(get_active_holds())
+        logger.info("worker %d warmup complete", os.getpid())
+    except Exception as e:
+        logger.warning("worker %d warmup failed: %s", os.getpid(), e)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """워커 시작 시 워밍업, 캐시 버전 동기화, 선점 만료/대기실 입장 루프 실행 (워커마다 1회)"""
+    check_waiting_room_secret()
+    await run_in_threadpool(warmup)
+    refresh_task = asyncio.create_task(version_refresh_loop())
+    hold_task = asyncio.create_task(hold_scheduler.run(broadcast_released_holds))
+    admission_task = asyncio.create_task(waiting_room.run())
+    yield
+    refresh_task.cancel()
+    hold_task.cancel()
+    admission_task.cancel()
 
 
 # FastAPI 앱 생성
-app = FastAPI(title="간단한 로그인 시스템")
+app = FastAPI(title="간단한 로그인 시스템", lifespan=lifespan)
 
-# CORS 설정 (Spring Boot와 통신)
+# HTTP 캐시 (ETag / Cache-Control, 조건부 요청 304 처리)
+app.add_middleware(HttpCacheMiddleware)
+
+# CORS 설정 (Spring Boot와 통신, 304 응답에도 적용되도록 가장 바깥에 등록)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=[SPRING_BOOT_URL],
@@ -23,24 +96,61 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# 정적 파일 설정
-app.mount("/static", StaticFiles(directory=STATIC_DIR), name="static")
+# 정적 파일 설정 (지문 + 사전 압축 빌드 결과를 서빙)
+# 빌드는 prepare()에서 한 번만 하고 워커는 지문 이름 목록만 계산합니다.
+# dev 모드는 단일 프로세스이므로 리로드마다 다시 빌드해 수정한 파일을 바로 반영합니다.
+if SERVER_MODE == "dev":
+    build_static_assets()
+else:
+    load_static_manifest()
+app.mount("/static", PrecompressedStaticFiles(directory=STATIC_BUILD_DIR, check_dir=False), name="static")
 
 # 라우터 등록
 app.include_router(auth_router)
 app.include_router(shop_router)
 app.include_router(seats_router)
+app.include_router(waiting_room_router)
+app.include_router(admin_router)
 
-# 데이터베이스 초기화
-init_db()
 
+def _pick(module: str, fallback: str) -> str:
+    """선택적 고성능 구현(uvloop/httptools)이 설치되어 있으면 사용"""
+    return module if importlib.util.find_spec(module) else fallback
 
-if __name__ == "__main__":
-    # python main.py로 직접 실행 가능
+
+def run_server():
+    """준비 작업(prepare) 후 SERVER_MODE에 따라 개발/운영 모드로 uvicorn 실행"""
+    prepare()
+    if SERVER_MODE == "dev":
+        # 개발 모드: 단일 프로세스 + 파일 변경 감지 리로드
+        uvicorn.run("main:app", host=HOST, port=PORT, reload=RELOAD)
+        return
+
+    # 운영 모드: 멀티 워커, 리로더 없음
+    if WORKERS > 1:
+        logger.warning("WORKERS=%d: 실시간 상태(WebSocket 브로드캐스트, 대기실, 속도 제한, 멱등성 캐시, "
+                       "좌석 인덱스, 선점 만료)는 워커 사이에 공유되지 않습니다", WORKERS)
     uvicorn.run(
         "main:app",
         host=HOST,
         port=PORT,
-        reload=RELOAD
+        workers=WORKERS,
+        loop=_pick("uvloop", "asyncio"),
+        http=_pick("httptools", "h11"),
+        backlog=BACKLOG,
+        timeout_keep_alive=KEEPALIVE_TIMEOUT,
+        limit_concurrency=LIMIT_CONCURRENCY,
+        ws_ping_interval=WS_PING_INTERVAL,
+        ws_ping_timeout=WS_PING_TIMEOUT,
+        access_log=ACCESS_LOG,
+        proxy_headers=True,
+        forwarded_allow_ips="127.0.0.1",
     )
 
+
+if __name__ == "__main__":
+    # python main.py로 직접 실행 가능 (SERVER_MODE=dev|prod), python main.py prepare는 준비 작업만 실행
+    if sys.argv[1:] == ["prepare"]:
+        prepare()
+    else:
+        run_server()
@@ -0,0 +1,52 @@
+"""사용자 대량 생성 스크립트 - 부하 테스트 계정 / 기존 사용자 마이그레이션
+
+사용 예:
+    python provision_users.py --prefix test --count 10                       # 동시성 테스트용 test1 ~ test10
+    python provision_users.py --prefix load --count 1000000 --scrypt-n 1024  # 부하 테스트 계정 100만 명
+    python provision_users.py --file users.csv --on-duplicate update         # username,password CSV 마이그레이션
+
+--scrypt-n을 낮추면 해싱 비용이 줄어 대량 생성이 빨라집니다.
+저장된 해시에 파라미터가 남으므로 해당 계정은 첫 로그인 때 현재 설정(PASSWORD_SCRYPT_N)으로 재해싱됩니다.
+"""
+import argparse
+import logging
+
+from config import USER_BULK_BATCH_SIZE
+from utils.user_import import iter_csv_users, generate_users
+
+
+def main():
+    parser = argparse.ArgumentParser(description="사용자 대량 생성 (병렬 해싱 + 배치 INSERT)")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--file", help="username,password CSV 파일 (첫 줄 헤더 허용)")
+    source.add_argument("--prefix", help="생성할 사용자 이름 접두어 (prefix1, prefix2, ...)")
+    parser.add_argument("--count", type=int, default=10, help="--prefix로 생성할 사용자 수")
+    parser.add_argument("--start", type=int, default=1, help="--prefix 사용자 번호 시작값")
+    parser.add_argument("--password", default="1234", help="--prefix 사용자의 비밀번호")
+    parser.add_argument("--on-duplicate", choices=["skip", "update"], default="skip",
+                        help="이미 있는 사용자 처리 (skip = 건너뜀, update = 비밀번호 덮어씀)")
+    parser.add_argument("--batch-size", type=int, default=USER_BULK_BATCH_SIZE, help="INSERT 한 문장 + 커밋 한 번당 사용자 수")
+    parser.add_argument("--workers", type=int, help="해싱 프로세스 수 (기본: CPU 코어 수)")
+    parser.add_argument("--scrypt-n", type=int, help="scrypt N (기본: PASSWORD_SCRYPT_N, 2의 거듭제곱)")
+    args = parser.parse_args()
+
+    # DB 모듈은 인자 확인 후 import
+    logging.basicConfig(level=logging.WARNING)
+    from database import init_db, bulk_create_users
+    init_db()
+
+    if args.file:
+        with open(args.file, encoding="utf-8", newline="") as f:
+            result = bulk_create_users(iter_csv_users(f), batch_size=args.batch_size, workers=args.workers,
+                                       on_duplicate=args.on_duplicate, scrypt_n=args.scrypt_n)
+    else:
+        users = generate_users(args.prefix, args.count, args.start, args.password)
+        result = bulk_create_users(users, batch_size=args.batch_size, workers=args.workers,
+                                   on_duplicate=args.on_duplicate, scrypt_n=args.scrypt_n)
+
+    print(f"✅ 생성 {result['created']:,}명, 갱신 {result['updated']:,}명, 중복 건너뜀 {result['skipped']:,}명, "
+          f"잘못된 행 {result['invalid']:,}개 / {result['seconds']:.3f}초 ({result['users_per_second']:,} users/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+"""관리자 라우트 (부하 테스트/마이그레이션용)
+
+모든 요청에 X-Admin-Token 헤더가 필요하며, ADMIN_TOKEN이 비어 있으면 관리자 API 전체가 비활성화됩니다.
+"""
+import hmac
+import io
+import logging
+import tempfile
+from datetime import datetime
+from typing import List, Optional
+
+from fastapi import APIRouter, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import BaseModel, Field, ValidationError
+from starlette.concurrency import run_in_threadpool
+
+from config import ADMIN_TOKEN
+from database import (bulk_create_users, get_query_stats, get_singleflight_stats, get_retry_stats,
+                      get_transaction_options, iter_purchases, iter_reservations,
+                      PURCHASE_EXPORT_FIELDS, RESERVATION_EXPORT_FIELDS)
+from utils.user_import import iter_csv_users, generate_users
+from utils.export import EXPORT_FORMATS, encode_rows
+from utils.log import audit
+from utils.rate_limit import get_rate_limit_stats
+from utils.idempotency import get_idempotency_stats
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+# 생성기 요청 한 번으로 만들 수 있는 최대 사용자 수
+MAX_GENERATED_USERS = 1_000_000
+
+
+def admin_denied_response(request: Request):
+    """관리자 토큰 확인 (통과하면 None)"""
+    if not ADMIN_TOKEN:
+        return JSONResponse(status_code=404, content={"success": False, "message": "관리자 API가 비활성화되어 있습니다"})
+    token = request.headers.get("x-admin-token", "")
+    if not hmac.compare_digest(token.encode(), ADMIN_TOKEN.encode()):
+        return JSONResponse(status_code=403, content={"success": False, "message": "관리자 토큰이 올바르지 않습니다"})
+    return None
+
+
+# ===== Pydantic 모델 =====
+class BulkUser(BaseModel):
+    username: str
+    password: str
+
+
+class BulkUsersRequest(BaseModel):
+    # users를 직접 주거나, prefix/count로 prefix{start} ~ 사용자를 생성
+    users: List[BulkUser] = []
+    prefix: Optional[str] = None
+    count: int = Field(0, ge=0, le=MAX_GENERATED_USERS)
+    start: int = 1
+    password: str = "1234"
+    on_duplicate: str = "skip"
+    scrypt_n: Optional[int] = None
+    batch_size: Optional[int] = Field(None, ge=1, le=50000)
+
+
+async def _run_bulk(users, on_duplicate: str, scrypt_n: Optional[int], batch_size: Optional[int]):
+    try:
+        result = await run_in_threadpool(bulk_create_users, users, batch_size=batch_size,
+                                         on_duplicate=on_duplicate, scrypt_n=scrypt_n)
+    except ValueError as e:
+        return JSONResponse(status_code=400, content={"success": False, "message": str(e)})
+    logger.info("bulk users created: %s", result)
+    return JSONResponse(content=dict(result, success=True))
+
+
+def export_response(name: str, rows, fields, fmt: str, filters: dict):
+    """행 제너레이터를 CSV / NDJSON 스트리밍 응답으로 (첨부 파일)"""
+    filename = f"{name}-{datetime.now():%Y%m%d-%H%M%S}.{fmt}"
+    audit("admin_export", kind=name, format=fmt, **filters)
+    return StreamingResponse(
+        encode_rows(rows, fields, fmt),
+        media_type=EXPORT_FORMATS[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"', "Cache-Control": "no-store"},
+    )
+
+
+def invalid_format_response(fmt: str):
+    return JSONResponse(status_code=422, content={
+        "success": False, "message": f"format은 {', '.join(EXPORT_FORMATS)} 중 하나여야 합니다: {fmt}"})
+
+
+# ===== REST API 엔드포인트 =====
+@router.get("/api/admin/stats")
+async def stats_api(request: Request):
+    """이 워커의 쿼리 / 조회 합치기 / 트랜잭션 재시도 / 속도 제한 / Idempotency 통계 + 트랜잭션 설정"""
+    denied = admin_denied_response(request)
+    if denied:
+        return denied
+    return JSONResponse(content={
+        "queries": get_query_stats(),
+        "singleflight": get_singleflight_stats(),
+        "transaction_retries": get_retry_stats(),
+        "transaction_options": get_transaction_options(),
+        "rate_limit": get_rate_limit_stats(),
+        "idempotency": get_idempotency_stats(),
+    })
+
+
+@router.get("/api/admin/export/purchases")
+async def export_purchases_api(request: Request, format: str = "csv", item_id: int = None,
+                               since: datetime = None, until: datetime = None):
+    """
+    구매 내역 내보내기 (구매 id 순, since 이상 until 미만)
+
+    비버퍼 커서로 읽어 EXPORT_CHUNK_ROWS행씩 보내므로 행 수와 관계없이 메모리 사용량이 일정합니다.
+    """
+    denied = admin_denied_response(request)
+    if denied:
+        return denied
+    if format not in EXPORT_FORMATS:
+        return invalid_format_response(format)
+    rows = iter_purchases(item_id=item_id, since=since, until=until)
+    return export_response("purchases", rows, PURCHASE_EXPORT_FIELDS, format,
+                           {"item_id": item_id, "since": since, "until": until})
+
+
+@router.get("/api/admin/export/reservations")
+async def export_reservations_api(request: Request, format: str = "csv", event_id: int = None,
+                                  since: datetime = None, until: datetime = None,
+                                  include_holds: bool = False):
+    """좌석 예약 현황 내보내기 (공연/좌석 id 순, 기간은 예약 시각 기준, include_holds면 선점 좌석 포함)"""
+    denied = admin_denied_response(request)
+    if denied:
+        return denied
+    if format not in EXPORT_FORMATS:
+        return invalid_format_response(format)
+    rows = iter_reservations(event_id=event_id, since=since, until=until, include_holds=include_holds)
+    return export_response("reservations", rows, RESERVATION_EXPORT_FIELDS, format,
+                           {"event_id": event_id, "since": since, "until": until})
+
+
+@router.post("/api/admin/users/bulk")
+async def bulk_create_users_api(request: Request, on_duplicate: str = "skip",
+                                scrypt_n: int = None, batch_size: int = None):
+    """
+    사용자 대량 생성 API
+
+    - Content-Type: application/json -> BulkUsersRequest (옵션도 본문에)
+    - Content-Type: text/csv -> username,password 줄 (옵션은 쿼리 파라미터)
+      본문은 메모리에 올리지 않고 임시 파일로 받은 뒤 배치 단위로 읽습니다.
+    """
+    denied = admin_denied_response(request)
+    if denied:
+        return denied
+
+    if request.headers.get("content-type", "").startswith("text/csv"):
+        if batch_size is not None and not 1 <= batch_size <= 50000:
+            return JSONResponse(status_code=422, content={"success": False, "message": "batch_size는 1~50000이어야 합니다"})
+        with tempfile.TemporaryFile() as f:
+            async for chunk in request.stream():
+                f.write(chunk)
+            f.seek(0)
+            lines = io.TextIOWrapper(f, encoding="utf-8", newline="")
+            return await _run_bulk(iter_csv_users(lines), on_duplicate, scrypt_n, batch_size)
+
+    try:
+        body = BulkUsersRequest(**await request.json())
+    except (ValueError, ValidationError) as e:
+        return JSONResponse(status_code=422, content={"success": False, "message": f"잘못된 요청입니다: {e}"})
+    if body.prefix is not None and body.count:
+        users = generate_users(body.prefix, body.count, body.start, body.password)
+    else:
+        users = ((user.username, user.password) for user in body.users)
+    return await _run_bulk(users, body.on_duplicate, body.scrypt_n, body.batch_size)
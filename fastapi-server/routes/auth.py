@@ -1,12 +1,28 @@
 """인증 관련 라우트"""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
 from fastapi import APIRouter, HTTPException, Request, Response
 from fastapi.responses import HTMLResponse, RedirectResponse, JSONResponse
-from fastapi.templating import Jinja2Templates
 from pydantic import BaseModel
-from database import create_user, verify_user, get_user_id
+from starlette.concurrency import run_in_threadpool
+from config import PASSWORD_HASH_WORKERS
+from database import create_user, authenticate_user, get_user_id
+from utils.templating import templates, render_static_page
+from utils.rate_limit import check_login_limit, client_ip, rate_limited_response
 
 router = APIRouter()
-templates = Jinja2Templates(directory="templates")
+
+# 비밀번호 해싱 전용 스레드 풀 (scrypt는 GIL을 해제하므로 스레드로 충분)
+# 로그인 폭주가 다른 엔드포인트의 기본 스레드 풀까지 점유하지 않도록 분리
+_password_executor = ThreadPoolExecutor(max_workers=PASSWORD_HASH_WORKERS,
+                                        thread_name_prefix="password-hash")
+
+
+async def _run_password_task(func, *args):
+    """해싱이 포함된 DB 함수를 이벤트 루프 밖에서 실행"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_password_executor, func, *args)
 
 
 # ===== Pydantic 모델 =====
@@ -24,14 +40,14 @@ class LoginRequest(BaseModel):
 
 @router.get("/", response_class=HTMLResponse)
 async def home(request: Request):
-    """회원가입 페이지"""
-    return templates.TemplateResponse("signup.html", {"request": request})
+    """회원가입 페이지 (렌더링 결과 캐시)"""
+    return render_static_page("signup.html")
 
 
 @router.get("/login", response_class=HTMLResponse)
 async def login_page(request: Request):
-    """로그인 페이지"""
-    return templates.TemplateResponse("login.html", {"request": request})
+    """로그인 페이지 (렌더링 결과 캐시)"""
+    return render_static_page("login.html")
 
 
 @router.get("/welcome", response_class=HTMLResponse)
@@ -61,7 +77,7 @@ async def logout():
 @router.post("/api/signup")
 async def signup_api(signup_data: SignupRequest):
     """회원가입 API"""
-    success = create_user(signup_data.username, signup_data.password)
+    success = await _run_password_task(create_user, signup_data.username, signup_data.password)
     
     if success:
         return JSONResponse(
@@ -76,10 +92,16 @@ async def signup_api(signup_data: SignupRequest):
 
 
 @router.post("/api/login")
-async def login_api(login_data: LoginRequest):
+async def login_api(request: Request, login_data: LoginRequest):
     """로그인 API"""
-    if verify_user(login_data.username, login_data.password):
-        user_id = get_user_id(login_data.username)
+    # 해싱/DB 조회 전에 시도 횟수 제한
+    retry_after = check_login_limit(login_data.username, client_ip(request))
+    if retry_after:
+        return rate_limited_response(retry_after)
+    
+    user_id = await _run_password_task(authenticate_user, login_data.username, login_data.password)
+
+    if user_id is not None:
         response = JSONResponse(
             status_code=200,
             content={
@@ -110,7 +132,7 @@ async def verify_session(request: Request):
     username = request.cookies.get("username")
     
     if username:
-        user_id = get_user_id(username)
+        user_id = await run_in_threadpool(get_user_id, username)
         return JSONResponse(
             status_code=200,
             content={
@@ -1,113 +1,253 @@
-"""좌석 예약 관련 라우트"""
-from fastapi import APIRouter, Request, WebSocket, WebSocketDisconnect
-from fastapi.responses import HTMLResponse, RedirectResponse, JSONResponse
-from fastapi.templating import Jinja2Templates
-from pydantic import BaseModel
+"""좌석 예약 관련 라우트
+
+모든 좌석 API/페이지/WebSocket은 공연(event_id) 단위입니다.
+event_id를 생략하면 기본 공연(DEFAULT_EVENT_ID)으로 처리합니다.
+"""
+from fastapi import APIRouter, Query, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import HTMLResponse, RedirectResponse, JSONResponse, Response
+from pydantic import BaseModel, ValidationError
+from starlette.concurrency import run_in_threadpool
 import json
-from typing import List
+import logging
+import math
+from typing import Dict, List, Optional, Set
+from urllib.parse import quote
 
 from database import (
+    get_all_events,
+    get_event,
     get_all_seats,
     reserve_seat_unsafe,
     reserve_seat_safe,
+    reserve_any_seat,
+    hold_seat,
     cancel_reservation,
-    get_user_reservation,
+    get_user_reservations,
     get_user_id,
-    init_sample_seats,
     get_all_items,
-    get_user_purchases
+    get_user_purchases,
+    get_event_occupancy
+)
+from utils.templating import templates
+from utils.seat_codec import build_layout, encode_state
+from utils.seat_index import availability_index, find_adjacent_seats, allocate_group
+from utils.seat_grid import TILE_FIELDS, seat_grids, get_seat_grid_meta, get_seat_tile
+from utils.waiting_room import has_admission
+from utils.rate_limit import check_action_limit, client_ip, rate_limited_response, retry_after_seconds
+from utils.idempotency import idempotent_response
+from config import (
+    DEFAULT_EVENT_ID, GROUP_MAX_SIZE, SEAT_HOLD_TTL_SECONDS, SEAT_TILE_MAX_ZOOM, SEAT_VIEWPORT_MAX_SEATS
 )
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter()
-templates = Jinja2Templates(directory="templates")
+
+
+def waiting_room_url(event_id: int) -> str:
+    """공연 좌석 페이지로 돌아오는 대기실 URL"""
+    return "/waiting-room?next=" + quote(f"/seats?event_id={event_id}")
+
+
+def admission_required_response(event_id: int = DEFAULT_EVENT_ID):
+    """대기실을 거치지 않은 요청에 대한 응답 (DB 작업 전에 반환)"""
+    return JSONResponse(
+        status_code=403,
+        content={"success": False, "message": "대기열을 통해 입장해 주세요",
+                 "waiting_room": waiting_room_url(event_id)}
+    )
+
+
+def event_not_found_response():
+    return HTMLResponse(status_code=404, content="존재하지 않는 공연입니다")
 
 
 # ===== Pydantic 모델 =====
 class ReserveRequest(BaseModel):
     username: str
     seat_id: int
+    event_id: int = DEFAULT_EVENT_ID
     use_safe: bool = False
 
 
+class HoldRequest(BaseModel):
+    username: str
+    seat_id: int
+    event_id: int = DEFAULT_EVENT_ID
+
+
+class GroupReserveRequest(BaseModel):
+    username: str
+    event_id: int = DEFAULT_EVENT_ID
+    count: int
+    row_from: Optional[int] = None
+    row_to: Optional[int] = None
+    block: Optional[int] = None
+    allow_split: bool = True
+
+
+class AnySeatReserveRequest(BaseModel):
+    username: str
+    event_id: int = DEFAULT_EVENT_ID
+    row_from: Optional[int] = None
+    row_to: Optional[int] = None
+
+
 class CancelRequest(BaseModel):
     username: str
     seat_id: int
+    event_id: int = DEFAULT_EVENT_ID
 
 
 # ===== HTML 페이지 엔드포인트 =====
 @router.get("/dashboard", response_class=HTMLResponse)
-async def dashboard_page(request: Request):
-    """실시간 대시보드 페이지"""
+async def dashboard_page(request: Request, event_id: int = DEFAULT_EVENT_ID):
+    """실시간 대시보드 페이지 (공연별)"""
     username = request.cookies.get("username")
     
     if not username:
         return RedirectResponse(url="/login", status_code=303)
     
-    # 초기 좌석 데이터 가져오기
-    seats = get_all_seats()
-    seats_safe = []
-    for seat in seats:
-        seat_dict = dict(seat)
-        for key, value in seat_dict.items():
-            if hasattr(value, 'isoformat'):
-                seat_dict[key] = str(value)
-        seats_safe.append(seat_dict)
+    event = await run_in_threadpool(get_event, event_id)
+    if not event:
+        return event_not_found_response()
     
+    # 초기 좌석 데이터는 페이지에 넣지 않고 클라이언트가 /api/seats(ETag 캐시)로 조회
     return templates.TemplateResponse("dashboard.html", {
         "request": request,
         "username": username,
-        "initial_seats": json.dumps(seats_safe)
+        "event": event
     })
 
 
 @router.get("/seats", response_class=HTMLResponse)
-async def seats_page(request: Request):
-    """좌석 예약 페이지"""
-    # 샘플 좌석 초기화 (최초 1회)
-    init_sample_seats()
-    
+async def seats_page(request: Request, event_id: int = DEFAULT_EVENT_ID):
+    """좌석 예약 페이지 (공연별)"""
     username = request.cookies.get("username")
     
     if not username:
         return RedirectResponse(url="/login", status_code=303)
     
-    seats = get_all_seats()
-    user_id = get_user_id(username)
-    my_reservation = get_user_reservation(user_id) if user_id else None
+    if not has_admission(request.cookies):
+        return RedirectResponse(url=waiting_room_url(event_id), status_code=303)
     
-    # datetime 객체를 문자열로 변환 (JSON 직렬화 가능하도록)
-    seats_safe = []
-    for seat in seats:
-        seat_dict = dict(seat)
-        # 모든 datetime 객체를 문자열로 변환
-        for key, value in seat_dict.items():
-            if hasattr(value, 'isoformat'):  # datetime 객체인 경우
-                seat_dict[key] = str(value)
-        seats_safe.append(seat_dict)
+    event = await run_in_threadpool(get_event, event_id)
+    if not event:
+        return event_not_found_response()
     
-    if my_reservation and my_reservation.get('reserved_at'):
-        my_reservation['reserved_at'] = str(my_reservation['reserved_at'])
+    user_id = await run_in_threadpool(get_user_id, username)
+    # 단체 예매로 여러 좌석일 수 있음
+    my_reservations = await run_in_threadpool(get_user_reservations, user_id, event_id) if user_id else []
+    events = await run_in_threadpool(get_all_events)
     
+    # 전체 좌석 데이터는 클라이언트가 /api/seats(ETag 캐시)로 조회
     return templates.TemplateResponse("seats.html", {
         "request": request,
         "username": username,
-        "seats_json": json.dumps(seats_safe),
-        "my_reservation_json": json.dumps(my_reservation) if my_reservation else "null"
+        "user_id": user_id,
+        "event": event,
+        "events": events,
+        "my_reservations_json": json.dumps(my_reservations, default=str)
     })
 
 
 # ===== REST API 엔드포인트 =====
+@router.get("/api/events")
+async def get_events_api():
+    """공연 목록 조회 API"""
+    events = await run_in_threadpool(get_all_events)
+    return JSONResponse(content={"events": [
+        dict(event, starts_at=event["starts_at"].isoformat() if event["starts_at"] else None)
+        for event in events
+    ]})
+
+
 @router.get("/api/seats")
-async def get_seats_api():
-    """좌석 목록 조회 API"""
-    seats = get_all_seats()
-    return JSONResponse(content={"seats": seats})
+async def get_seats_api(event_id: int = DEFAULT_EVENT_ID, format: str = "json"):
+    """공연 좌석 목록 조회 API (format=binary면 utils.seat_codec 바이너리 상태)"""
+    # 동시 요청은 하나의 조회를 공유 (database.singleflight, 공연별)
+    seats = await run_in_threadpool(get_all_seats, event_id)
+    if format == "binary":
+        return Response(content=encode_state(seats, event_id), media_type="application/octet-stream")
+    # 선점 좌석의 held_until(datetime)은 문자열로 (공유 조회 결과이므로 복사본을 변환)
+    return JSONResponse(content={"seats": serialize_seats(seats)})
+
+
+@router.get("/api/seats/layout")
+async def get_seat_layout_api(event_id: int = DEFAULT_EVENT_ID):
+    """공연의 정적 좌석 레이아웃 API (바이너리 상태와 함께 사용, 레이아웃 버전 기반 캐시)"""
+    return JSONResponse(content=build_layout(await run_in_threadpool(get_all_seats, event_id)))
+
+
+@router.get("/api/seats/grid")
+async def get_seat_grid_api(event_id: int = DEFAULT_EVENT_ID):
+    """공연 좌석 격자 정보 API (타일 크기/최대 줌/좌석 범위, 레이아웃 버전 기반 캐시)"""
+    meta = await run_in_threadpool(get_seat_grid_meta, event_id)
+    if meta is None:
+        return JSONResponse(status_code=404, content={"success": False, "message": "존재하지 않는 공연입니다"})
+    return JSONResponse(content=meta)
+
+
+@router.get("/api/seats/tile")
+async def get_seat_tile_api(
+    x: int,
+    y: int,
+    event_id: int = DEFAULT_EVENT_ID,
+    z: int = Query(SEAT_TILE_MAX_ZOOM, ge=0, le=SEAT_TILE_MAX_ZOOM)
+):
+    """
+    좌석 타일 API (utils.seat_grid 격자 인덱스)
+
+    최대 줌이면 타일과 겹치는 좌석만, 그보다 작은 줌이면 격자 칸별 좌석 수를 반환합니다.
+    공연별 좌석/레이아웃 버전 기반 ETag로 캐시됩니다.
+    """
+    return JSONResponse(content=await run_in_threadpool(get_seat_tile, event_id, z, x, y))
+
+
+@router.get("/api/seats/available")
+async def find_available_seats_api(
+    event_id: int = DEFAULT_EVENT_ID,
+    count: int = Query(1, ge=1, le=20),
+    row: int = None,
+    block: int = None,
+    limit: int = Query(10, ge=1, le=100)
+):
+    """연속 빈자리 검색 API (행/블록 지정 가능, utils.seat_index 비트셋 인덱스 사용)"""
+    return JSONResponse(content={
+        "event_id": event_id,
+        "count": count,
+        "blocks": await run_in_threadpool(find_adjacent_seats, event_id, count, row, block, limit)
+    })
+
+
+@router.get("/api/seats/occupancy")
+async def get_seat_occupancy_api(event_id: int = DEFAULT_EVENT_ID, blocks: bool = False):
+    """
+    공연 좌석 점유 현황 API (database.counters 점유 카운터, 좌석 목록을 훑지 않음)
+
+    전체 / 행별 예약·선점·잔여 좌석 수를 반환하고, blocks면 행/블록별 잔여 좌석 수를
+    utils.seat_index 비트셋 인덱스에서 계산해 덧붙입니다. 공연별 좌석 버전 기반 ETag로 캐시됩니다.
+    """
+    if not await run_in_threadpool(get_event, event_id):
+        return JSONResponse(status_code=404, content={"success": False, "message": "존재하지 않는 공연입니다"})
+    occupancy = await run_in_threadpool(get_event_occupancy, event_id)
+    if blocks:
+        index = await run_in_threadpool(availability_index.get, event_id)
+        occupancy = dict(occupancy, blocks=index.block_occupancy())
+    return JSONResponse(content=occupancy)
 
 
 @router.post("/api/seats/reserve")
-async def reserve_seat_api(reserve_data: ReserveRequest):
+async def reserve_seat_api(request: Request, reserve_data: ReserveRequest):
     """좌석 예약 API"""
-    user_id = get_user_id(reserve_data.username)
+    if not has_admission(request.cookies, reserve_data.username):
+        return admission_required_response(reserve_data.event_id)
+    
+    retry_after = check_action_limit(reserve_data.username, client_ip(request))
+    if retry_after:
+        return rate_limited_response(retry_after)
+    
+    user_id = await run_in_threadpool(get_user_id, reserve_data.username)
     
     if not user_id:
         return JSONResponse(
@@ -115,20 +255,108 @@ async def reserve_seat_api(reserve_data: ReserveRequest):
             content={"success": False, "message": "로그인이 필요합니다"}
         )
     
-    # 안전한 버전 vs 불안전한 버전 선택
-    if reserve_data.use_safe:
-        result = reserve_seat_safe(user_id, reserve_data.seat_id)
-    else:
-        result = reserve_seat_unsafe(user_id, reserve_data.seat_id)
+    def reserve():
+        # 안전한 버전 vs 불안전한 버전 선택
+        if reserve_data.use_safe:
+            result = reserve_seat_safe(user_id, reserve_data.seat_id, reserve_data.event_id)
+        else:
+            result = reserve_seat_unsafe(user_id, reserve_data.seat_id, reserve_data.event_id)
+        return (200 if result["success"] else (503 if result.get("retryable") else 400)), result
+    
+    # Idempotency-Key가 있으면 재시도/동시 중복 요청은 첫 요청의 결과를 재사용
+    return await idempotent_response(request, reserve_data.username, reserve_data.model_dump(), reserve)
+
+
+@router.post("/api/seats/hold")
+async def hold_seat_api(request: Request, hold_data: HoldRequest):
+    """좌석 임시 선점 API (SEAT_HOLD_TTL_SECONDS 안에 /api/seats/reserve로 확정)"""
+    if not has_admission(request.cookies, hold_data.username):
+        return admission_required_response(hold_data.event_id)
+    
+    retry_after = check_action_limit(hold_data.username, client_ip(request))
+    if retry_after:
+        return rate_limited_response(retry_after)
     
-    status_code = 200 if result["success"] else 400
+    user_id = await run_in_threadpool(get_user_id, hold_data.username)
+    
+    if not user_id:
+        return JSONResponse(
+            status_code=401,
+            content={"success": False, "message": "로그인이 필요합니다"}
+        )
+    
+    result = await run_in_threadpool(hold_seat, user_id, hold_data.seat_id, hold_data.event_id,
+                                     SEAT_HOLD_TTL_SECONDS)
+    status_code = 200 if result["success"] else (503 if result.get("retryable") else 400)
     return JSONResponse(status_code=status_code, content=result)
 
 
+@router.post("/api/seats/reserve-group")
+async def reserve_group_api(request: Request, group_data: GroupReserveRequest):
+    """단체 예매 API - 조건에 맞는 최적의 연속 좌석을 자동 배정해 한 번에 예약"""
+    if not has_admission(request.cookies, group_data.username):
+        return admission_required_response(group_data.event_id)
+    
+    retry_after = check_action_limit(group_data.username, client_ip(request))
+    if retry_after:
+        return rate_limited_response(retry_after)
+    
+    user_id = await run_in_threadpool(get_user_id, group_data.username)
+    
+    if not user_id:
+        return JSONResponse(
+            status_code=401,
+            content={"success": False, "message": "로그인이 필요합니다"}
+        )
+    
+    if not 1 <= group_data.count <= GROUP_MAX_SIZE:
+        return JSONResponse(
+            status_code=400,
+            content={"success": False, "message": f"인원은 1~{GROUP_MAX_SIZE}명이어야 합니다"}
+        )
+    
+    def reserve_group():
+        result = allocate_group(user_id, group_data.event_id, group_data.count,
+                                row_from=group_data.row_from, row_to=group_data.row_to,
+                                block=group_data.block, allow_split=group_data.allow_split)
+        return (200 if result["success"] else (503 if result.get("retryable") else 409)), result
+    
+    return await idempotent_response(request, group_data.username, group_data.model_dump(), reserve_group)
+
+
+@router.post("/api/seats/reserve-any")
+async def reserve_any_seat_api(request: Request, any_data: AnySeatReserveRequest):
+    """빠른 예매 API - 행 범위 안의 빈 좌석 아무거나 예약 (다른 요청이 잡은 좌석은 기다리지 않고 건너뜀)"""
+    if not has_admission(request.cookies, any_data.username):
+        return admission_required_response(any_data.event_id)
+    
+    retry_after = check_action_limit(any_data.username, client_ip(request))
+    if retry_after:
+        return rate_limited_response(retry_after)
+    
+    user_id = await run_in_threadpool(get_user_id, any_data.username)
+    
+    if not user_id:
+        return JSONResponse(
+            status_code=401,
+            content={"success": False, "message": "로그인이 필요합니다"}
+        )
+    
+    def reserve_any():
+        result = reserve_any_seat(user_id, any_data.event_id, row_from=any_data.row_from, row_to=any_data.row_to)
+        return (200 if result["success"] else (503 if result.get("retryable") else 409)), result
+    
+    return await idempotent_response(request, any_data.username, any_data.model_dump(), reserve_any)
+
+
 @router.post("/api/seats/cancel")
-async def cancel_seat_api(cancel_data: CancelRequest):
+async def cancel_seat_api(request: Request, cancel_data: CancelRequest):
     """좌석 예약 취소 API"""
-    user_id = get_user_id(cancel_data.username)
+    retry_after = check_action_limit(cancel_data.username, client_ip(request))
+    if retry_after:
+        return rate_limited_response(retry_after)
+    
+    user_id = await run_in_threadpool(get_user_id, cancel_data.username)
     
     if not user_id:
         return JSONResponse(
@@ -136,40 +364,175 @@ async def cancel_seat_api(cancel_data: CancelRequest):
             content={"success": False, "message": "로그인이 필요합니다"}
         )
     
-    result = cancel_reservation(user_id, cancel_data.seat_id)
-    status_code = 200 if result["success"] else 400
+    result = await run_in_threadpool(cancel_reservation, user_id, cancel_data.seat_id, cancel_data.event_id)
+    status_code = 200 if result["success"] else (503 if result.get("retryable") else 400)
     return JSONResponse(status_code=status_code, content=result)
 
 
 # ===== WebSocket 실시간 업데이트 (기존 HTTP 방식과 비교) =====
+def serialize_seats(seats):
+    """datetime 객체를 문자열로 변환 (JSON 직렬화 가능하도록)"""
+    seats_safe = []
+    for seat in seats:
+        seat_dict = dict(seat)
+        for key, value in seat_dict.items():
+            if hasattr(value, 'isoformat'):  # datetime 객체인 경우
+                seat_dict[key] = str(value)
+        seats_safe.append(seat_dict)
+    return seats_safe
+
+
+def valid_viewport(rect) -> bool:
+    """[x0, y0, x1, y1] 형식이고 x0 < x1, y0 < y1인지"""
+    if not isinstance(rect, list) or len(rect) != 4:
+        return False
+    if not all(isinstance(v, (int, float)) and not isinstance(v, bool) and math.isfinite(v) for v in rect):
+        return False
+    return rect[0] < rect[2] and rect[1] < rect[3]
+
+
 class ConnectionManager:
-    """WebSocket 연결 관리 클래스 - 여러 클라이언트의 실시간 연결을 관리"""
+    """WebSocket 연결 관리 클래스 - 공연(event_id)별 토픽으로 실시간 연결을 관리"""
     def __init__(self):
-        self.active_connections: List[WebSocket] = []
+        # 공연별 연결 (좌석 변경은 같은 공연을 보는 연결에만 전송)
+        self.topics: Dict[int, List[WebSocket]] = {}
+        # 바이너리 좌석 상태(utils.seat_codec)를 협상한 연결
+        self.binary_connections: Set[WebSocket] = set()
+        # 화면 범위를 구독한 연결 -> (x0, y0, x1, y1), 범위 안 좌석 변경분만 전송
+        self.viewports: Dict[WebSocket, tuple] = {}
+        # 점유 현황(stream=occupancy)만 구독한 연결 (대시보드), 좌석 목록 대신 점유 카운터를 받음
+        self.occupancy_connections: Set[WebSocket] = set()
     
-    async def connect(self, websocket: WebSocket):
-        """새로운 클라이언트 연결"""
+    async def connect(self, websocket: WebSocket, event_id: int, binary: bool = False, stream: str = None):
+        """새로운 클라이언트 연결 (공연 토픽 구독)"""
         await websocket.accept()
-        self.active_connections.append(websocket)
-        print(f"✅ WebSocket 연결됨. 현재 접속자: {len(self.active_connections)}명")
+        self.topics.setdefault(event_id, []).append(websocket)
+        if binary:
+            self.binary_connections.add(websocket)
+        if stream == "occupancy":
+            self.occupancy_connections.add(websocket)
+        logger.debug("websocket connected: event %s, %d active", event_id, len(self.topics[event_id]))
     
-    def disconnect(self, websocket: WebSocket):
+    def disconnect(self, websocket: WebSocket, event_id: int):
         """클라이언트 연결 해제"""
-        self.active_connections.remove(websocket)
-        print(f"❌ WebSocket 연결 끊김. 현재 접속자: {len(self.active_connections)}명")
+        connections = self.topics.get(event_id, [])
+        if websocket in connections:
+            connections.remove(websocket)
+        if not connections:
+            self.topics.pop(event_id, None)
+        self.binary_connections.discard(websocket)
+        self.viewports.pop(websocket, None)
+        self.occupancy_connections.discard(websocket)
+        logger.debug("websocket disconnected: event %s, %d active", event_id, len(connections))
     
-    async def broadcast(self, message: dict):
-        """모든 연결된 클라이언트에게 메시지 브로드캐스트 (실시간 업데이트)"""
-        for connection in self.active_connections:
+    async def broadcast(self, event_id: int, message: dict):
+        """공연을 보고 있는 클라이언트에게 메시지 브로드캐스트 (실시간 업데이트)"""
+        for connection in list(self.topics.get(event_id, [])):
             try:
                 await connection.send_json(message)
             except Exception as e:
-                print(f"⚠️ 메시지 전송 실패: {e}")
+                logger.warning("websocket send failed: %s", e)
+    
+    def set_viewport(self, websocket: WebSocket, rect):
+        """화면 범위 구독 설정 (None이면 해제하고 전체 좌석 상태를 다시 받음)"""
+        if rect is None:
+            self.viewports.pop(websocket, None)
+        else:
+            self.viewports[websocket] = tuple(rect)
+    
+    async def broadcast_seats(self, event_id: int, message: dict):
+        """
+        공연 좌석 상태를 포함한 브로드캐스트
+        
+        JSON 클라이언트에는 message + seats를, 바이너리 클라이언트에는 message(메타데이터)와
+        바이너리 상태 프레임을 보냅니다. 인코딩은 브로드캐스트당 한 번만 수행합니다.
+        화면 범위를 구독한 클라이언트에는 범위 안에서 바뀐 좌석만 viewport_update로 보내며 (범위 밖
+        변경이면 보내지 않음), 전체 상태를 받는 연결이 없으면 전체 좌석을 조회하지 않습니다.
+        점유 현황 구독 연결에는 message와 occupancy 메시지(점유 카운터)를 보냅니다.
+        """
+        message = dict(message, event_id=event_id)
+        connections = list(self.topics.get(event_id, []))
+        seat_ids = message.get("seat_ids") or [message.get("seat_id")]
+        seats = None
+        if any(connection not in self.viewports and connection not in self.occupancy_connections
+               for connection in connections):
+            seats = await run_in_threadpool(get_all_seats, event_id)
+        grid = None
+        if any(connection in self.viewports for connection in connections):
+            grid = await run_in_threadpool(seat_grids.get, event_id)
+        occupancy_message = None
+        if any(connection in self.occupancy_connections for connection in connections):
+            occupancy_message = await self.occupancy_message(event_id)
+        
+        json_message = None
+        state_frame = None
+        for connection in connections:
+            try:
+                viewport = self.viewports.get(connection)
+                if connection in self.occupancy_connections:
+                    await connection.send_json(message)
+                    await connection.send_json(occupancy_message)
+                elif viewport is not None:
+                    changed = grid.changed_in(seat_ids, *viewport)
+                    if changed:
+                        await connection.send_json(dict(message, type="viewport_update", seats=changed))
+                elif connection in self.binary_connections:
+                    if state_frame is None:
+                        state_frame = encode_state(seats, event_id)
+                    await connection.send_json(message)
+                    await connection.send_bytes(state_frame)
+                else:
+                    if json_message is None:
+                        json_message = dict(message, seats=serialize_seats(seats))
+                    await connection.send_json(json_message)
+            except Exception as e:
+                logger.warning("websocket send failed: %s", e)
+    
+    async def occupancy_message(self, event_id: int) -> dict:
+        """점유 현황 메시지 (database.counters, 공유 결과이므로 복사해서 사용)"""
+        occupancy = await run_in_threadpool(get_event_occupancy, event_id)
+        return dict(occupancy, type="occupancy")
+    
+    async def send_seats(self, websocket: WebSocket, event_id: int, seats):
+        """한 클라이언트에게 전체 좌석 상태 전송"""
+        if websocket in self.binary_connections:
+            await websocket.send_bytes(encode_state(seats, event_id))
+        else:
+            await websocket.send_json({"type": "all_seats", "seats": serialize_seats(seats)})
+    
+    async def send_viewport(self, websocket: WebSocket, event_id: int, rect, snapshot: bool = True) -> bool:
+        """
+        화면 범위 구독 응답 (snapshot이면 범위 안 좌석 포함)
+        
+        범위 안 좌석이 SEAT_VIEWPORT_MAX_SEATS를 넘으면 구독하지 않고 False를 반환합니다.
+        version은 응답 시점의 좌석 버전으로, 타일을 먼저 받은 클라이언트는 타일의 version과 다르면
+        그 사이의 변경을 놓친 것이므로 타일을 다시 받습니다.
+        """
+        grid = await run_in_threadpool(seat_grids.get, event_id)
+        reply = {"type": "viewport", "event_id": event_id, "rect": list(rect), "version": grid.version}
+        if snapshot:
+            seats = grid.viewport(*rect, limit=SEAT_VIEWPORT_MAX_SEATS)
+            if seats is None:
+                return False
+            reply.update(fields=list(TILE_FIELDS), seats=seats)
+        self.set_viewport(websocket, rect)
+        await websocket.send_json(reply)
+        return True
 
 # WebSocket 연결 관리자 인스턴스
 manager = ConnectionManager()
 
 
+async def broadcast_released_holds(event_id, seat_ids):
+    """선점 만료로 해제된 좌석 브로드캐스트 (utils.seat_holds 스케줄러 콜백)"""
+    await manager.broadcast_seats(event_id, {
+        "type": "seat_update",
+        "action": "released",
+        "seat_ids": seat_ids,
+        "message": f"선점이 만료된 좌석 {len(seat_ids)}개가 해제되었습니다"
+    })
+
+
 @router.websocket("/ws/seats")
 async def websocket_endpoint(websocket: WebSocket):
     """
@@ -178,9 +541,20 @@ async def websocket_endpoint(websocket: WebSocket):
     기존 HTTP 방식과의 차이:
     - HTTP: 클라이언트가 새로고침해야 다른 사람의 예약을 확인
     - WebSocket: 서버가 자동으로 모든 클라이언트에게 변경사항 푸시
+    
+    /ws/seats?event_id=3으로 연결하면 그 공연의 좌석 변경만 받고, 액션도 그 공연 좌석에만 적용됩니다.
+    /ws/seats?encoding=binary로 연결하면 좌석 상태를 바이너리 프레임으로 받습니다.
+    /ws/seats?stream=occupancy로 연결하면 좌석 목록 대신 점유 현황(occupancy 메시지)을 받습니다 (대시보드).
     """
-    await manager.connect(websocket)
+    event_id = websocket.query_params.get("event_id", str(DEFAULT_EVENT_ID))
+    if not event_id.isdigit() or not await run_in_threadpool(get_event, int(event_id)):
+        # 존재하지 않는 공연은 핸드셰이크 단계에서 거절
+        await websocket.close(code=1008)
+        return
+    event_id = int(event_id)
     
+    await manager.connect(websocket, event_id, binary=websocket.query_params.get("encoding") == "binary",
+                          stream=websocket.query_params.get("stream"))
     try:
         while True:
             # 클라이언트로부터 메시지 수신 (예약/취소 요청)
@@ -190,7 +564,53 @@ async def websocket_endpoint(websocket: WebSocket):
             seat_id = data.get("seat_id")
             use_safe = data.get("use_safe", True)
             
-            user_id = get_user_id(username)
+            if action == "viewport":
+                # 화면 범위 구독 (로그인 불필요): {"rect": [x0, y0, x1, y1], "snapshot": true}
+                # 이후 범위 안 좌석 변경분만 받고, rect가 null이면 구독을 풀고 전체 상태를 다시 받음
+                rect = data.get("rect")
+                if rect is None:
+                    manager.set_viewport(websocket, None)
+                    await manager.send_seats(websocket, event_id, await run_in_threadpool(get_all_seats, event_id))
+                elif not valid_viewport(rect):
+                    await websocket.send_json({"type": "error", "message": "잘못된 화면 범위입니다"})
+                elif not await manager.send_viewport(websocket, event_id, rect, bool(data.get("snapshot", True))):
+                    await websocket.send_json({
+                        "type": "error",
+                        "message": "화면 범위의 좌석이 너무 많습니다. 확대해서 다시 시도해 주세요"
+                    })
+                continue
+            
+            if action == "refresh" or action == "get_all":
+                # 전체 좌석 정보 새로고침 또는 초기 데이터 요청 (로그인 불필요)
+                if websocket in manager.occupancy_connections:
+                    await websocket.send_json(await manager.occupancy_message(event_id))
+                elif websocket in manager.viewports:
+                    await manager.send_viewport(websocket, event_id, manager.viewports[websocket])
+                else:
+                    await manager.send_seats(websocket, event_id, await run_in_threadpool(get_all_seats, event_id))
+                continue
+            
+            # 예약/선점/취소 액션만 속도 제한 (조회 액션은 위에서 처리, DB 조회 전에 거절)
+            retry_after = check_action_limit(username, client_ip(websocket))
+            if retry_after:
+                await websocket.send_json({
+                    "type": "error",
+                    "message": f"요청이 너무 많습니다. {retry_after_seconds(retry_after)}초 후 다시 시도해 주세요",
+                    "retry_after": retry_after_seconds(retry_after)
+                })
+                continue
+            
+            # 대기실 입장권은 예약/선점 액션에만 적용 (서명만 확인, 메시지의 username이 입장권 주인이어야 함)
+            if action in ("reserve", "hold", "reserve_group") and not has_admission(websocket.cookies, username):
+                await websocket.send_json({
+                    "type": "error",
+                    "message": "대기열을 통해 입장해 주세요",
+                    "waiting_room": waiting_room_url(event_id)
+                })
+                continue
+            
+            # DB 작업(재시도 백오프 포함)은 스레드풀에서 실행해 다른 연결을 막지 않음
+            user_id = await run_in_threadpool(get_user_id, username)
             
             if not user_id:
                 await websocket.send_json({
@@ -201,38 +621,37 @@ async def websocket_endpoint(websocket: WebSocket):
             
             # 액션에 따라 처리
             if action == "reserve":
-                # 좌석 예약
-                print(f"📥 예약 요청: user={username}, seat={seat_id}, safe={use_safe}")
-                if use_safe:
-                    result = reserve_seat_safe(user_id, seat_id)
+                # 좌석 예약 (seat_id 없이 보내면 row_from/row_to 범위의 빈 좌석 아무거나)
+                if seat_id is None:
+                    # 행 범위는 REST API와 같은 모델로 검증
+                    try:
+                        any_data = AnySeatReserveRequest(
+                            username=username, event_id=event_id,
+                            row_from=data.get("row_from"), row_to=data.get("row_to")
+                        )
+                    except ValidationError:
+                        await websocket.send_json({
+                            "type": "error",
+                            "message": "빠른 예매 조건이 올바르지 않습니다"
+                        })
+                        continue
+                    result = await run_in_threadpool(reserve_any_seat, user_id, event_id,
+                                                     any_data.row_from, any_data.row_to)
+                    seat_id = result.get("seat_id")
+                elif use_safe:
+                    result = await run_in_threadpool(reserve_seat_safe, user_id, seat_id, event_id)
                 else:
-                    result = reserve_seat_unsafe(user_id, seat_id)
+                    result = await run_in_threadpool(reserve_seat_unsafe, user_id, seat_id, event_id)
                 
-                print(f"📋 예약 결과: {result}")
                 if result["success"]:
-                    # 예약 성공 시 모든 클라이언트에게 브로드캐스트
-                    print(f"📢 브로드캐스트 전송 중... 접속자 {len(manager.active_connections)}명")
-                    
-                    # 최신 좌석 정보 가져오기
-                    seats = get_all_seats()
-                    seats_safe = []
-                    for seat in seats:
-                        seat_dict = dict(seat)
-                        for key, value in seat_dict.items():
-                            if hasattr(value, 'isoformat'):
-                                seat_dict[key] = str(value)
-                        seats_safe.append(seat_dict)
-                    
-                    # 모든 클라이언트에게 업데이트된 좌석 정보 전송
-                    await manager.broadcast({
+                    # 예약 성공 시 같은 공연을 보는 클라이언트에게 최신 좌석 정보 브로드캐스트
+                    await manager.broadcast_seats(event_id, {
                         "type": "seat_update",
                         "action": "reserved",
                         "seat_id": seat_id,
                         "username": username,
-                        "message": result["message"],
-                        "seats": seats_safe  # 최신 좌석 정보 포함
+                        "message": result["message"]
                     })
-                    print("✅ 브로드캐스트 완료")
                 else:
                     # 실패 시 해당 클라이언트에게만 응답
                     await websocket.send_json({
@@ -240,29 +659,18 @@ async def websocket_endpoint(websocket: WebSocket):
                         "message": result["message"]
                     })
             
-            elif action == "cancel":
-                # 예약 취소
-                result = cancel_reservation(user_id, seat_id)
+            elif action == "hold":
+                # 좌석 임시 선점 (만료되면 hold_scheduler가 해제 후 브로드캐스트)
+                result = await run_in_threadpool(hold_seat, user_id, seat_id, event_id, SEAT_HOLD_TTL_SECONDS)
                 
                 if result["success"]:
-                    # 최신 좌석 정보 가져오기
-                    seats = get_all_seats()
-                    seats_safe = []
-                    for seat in seats:
-                        seat_dict = dict(seat)
-                        for key, value in seat_dict.items():
-                            if hasattr(value, 'isoformat'):
-                                seat_dict[key] = str(value)
-                        seats_safe.append(seat_dict)
-                    
-                    # 취소 성공 시 모든 클라이언트에게 브로드캐스트
-                    await manager.broadcast({
+                    await manager.broadcast_seats(event_id, {
                         "type": "seat_update",
-                        "action": "cancelled",
+                        "action": "held",
                         "seat_id": seat_id,
                         "username": username,
-                        "message": result["message"],
-                        "seats": seats_safe  # 최신 좌석 정보 포함
+                        "held_until": result["held_until"],
+                        "message": result["message"]
                     })
                 else:
                     await websocket.send_json({
@@ -270,27 +678,68 @@ async def websocket_endpoint(websocket: WebSocket):
                         "message": result["message"]
                     })
             
-            elif action == "refresh" or action == "get_all":
-                # 전체 좌석 정보 새로고침 또는 초기 데이터 요청
-                seats = get_all_seats()
+            elif action == "reserve_group":
+                # 단체 예매 (자동 배정), 조건은 REST API와 같은 모델로 검증
+                try:
+                    group_data = GroupReserveRequest(
+                        username=username, event_id=event_id, count=data.get("count", 0),
+                        row_from=data.get("row_from"), row_to=data.get("row_to"),
+                        block=data.get("block"), allow_split=data.get("allow_split", True)
+                    )
+                except ValidationError:
+                    await websocket.send_json({
+                        "type": "error",
+                        "message": "단체 예매 조건이 올바르지 않습니다"
+                    })
+                    continue
+                if not 1 <= group_data.count <= GROUP_MAX_SIZE:
+                    await websocket.send_json({
+                        "type": "error",
+                        "message": f"인원은 1~{GROUP_MAX_SIZE}명이어야 합니다"
+                    })
+                    continue
                 
-                # datetime 객체를 문자열로 변환 (JSON 직렬화 가능하도록)
-                seats_safe = []
-                for seat in seats:
-                    seat_dict = dict(seat)
-                    for key, value in seat_dict.items():
-                        if hasattr(value, 'isoformat'):  # datetime 객체인 경우
-                            seat_dict[key] = str(value)
-                    seats_safe.append(seat_dict)
+                result = await run_in_threadpool(
+                    allocate_group, user_id, event_id, group_data.count,
+                    row_from=group_data.row_from, row_to=group_data.row_to,
+                    block=group_data.block, allow_split=group_data.allow_split
+                )
                 
-                print(f"📤 좌석 정보 전송: {len(seats_safe)}개 (action: {action})")
-                await websocket.send_json({
-                    "type": "all_seats",
-                    "seats": seats_safe
-                })
+                if result["success"]:
+                    await manager.broadcast_seats(event_id, {
+                        "type": "seat_update",
+                        "action": "reserved",
+                        "seat_ids": result["seat_ids"],
+                        "username": username,
+                        "message": result["message"]
+                    })
+                else:
+                    await websocket.send_json({
+                        "type": "error",
+                        "message": result["message"]
+                    })
+            
+            elif action == "cancel":
+                # 예약 취소
+                result = await run_in_threadpool(cancel_reservation, user_id, seat_id, event_id)
+                
+                if result["success"]:
+                    # 취소 성공 시 같은 공연을 보는 클라이언트에게 최신 좌석 정보 브로드캐스트
+                    await manager.broadcast_seats(event_id, {
+                        "type": "seat_update",
+                        "action": "cancelled",
+                        "seat_id": seat_id,
+                        "username": username,
+                        "message": result["message"]
+                    })
+                else:
+                    await websocket.send_json({
+                        "type": "error",
+                        "message": result["message"]
+                    })
     
     except WebSocketDisconnect:
-        manager.disconnect(websocket)
+        manager.disconnect(websocket, event_id)
     except Exception as e:
-        print(f"❌ WebSocket 에러: {e}")
-        manager.disconnect(websocket)
+        logger.warning("websocket error: %s", e)
+        manager.disconnect(websocket, event_id)
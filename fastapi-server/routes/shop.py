@@ -1,8 +1,8 @@
 """쇼핑몰 관련 라우트"""
 from fastapi import APIRouter, Request, Form
 from fastapi.responses import HTMLResponse, RedirectResponse, JSONResponse
-from fastapi.templating import Jinja2Templates
 from pydantic import BaseModel
+from starlette.concurrency import run_in_threadpool
 
 from database import (
     get_all_items, 
@@ -10,11 +10,15 @@ from database import (
     purchase_item_safe,
     get_user_purchases,
     get_user_id,
-    init_sample_items
+    get_version,
+    get_item_sales
 )
+from utils.templating import templates, get_fragment, render_fragment
+from utils.waiting_room import has_admission
+from utils.rate_limit import check_action_limit, client_ip, rate_limited_response
+from utils.idempotency import idempotent_response
 
 router = APIRouter()
-templates = Jinja2Templates(directory="templates")
 
 
 # ===== Pydantic 모델 =====
@@ -27,15 +31,18 @@ class PurchaseRequest(BaseModel):
 @router.get("/shop", response_class=HTMLResponse)
 async def shop(request: Request):
     """아이템 목록 페이지"""
-    # 샘플 아이템 초기화 (최초 1회)
-    init_sample_items()
-    
-    items = get_all_items()
     username = request.cookies.get("username")
+    logged_in = bool(username)
+    
+    # 아이템 목록 조각은 아이템 버전이 바뀔 때만 DB 조회 후 다시 렌더링
+    item_list_html = get_fragment(
+        "_item_list.html", get_version("items"), logged_in,
+        lambda: render_fragment("_item_list.html", items=get_all_items(), logged_in=logged_in)
+    )
     
     return templates.TemplateResponse("shop.html", {
         "request": request,
-        "items": items,
+        "item_list_html": item_list_html,
         "username": username
     })
 
@@ -48,8 +55,8 @@ async def my_purchases(request: Request):
     if not username:
         return RedirectResponse(url="/login", status_code=303)
     
-    user_id = get_user_id(username)
-    purchases = get_user_purchases(user_id)
+    user_id = await run_in_threadpool(get_user_id, username)
+    purchases = await run_in_threadpool(get_user_purchases, user_id)
     
     return templates.TemplateResponse("purchases.html", {
         "request": request,
@@ -62,14 +69,32 @@ async def my_purchases(request: Request):
 @router.get("/api/items")
 async def get_items_api():
     """아이템 목록 조회 API"""
-    items = get_all_items()
+    # 동시 요청은 하나의 조회를 공유 (database.singleflight)
+    items = await run_in_threadpool(get_all_items)
     return JSONResponse(content={"items": items})
 
 
+@router.get("/api/items/sales")
+async def get_item_sales_api():
+    """아이템별 판매 수량 / 매출 API (database.counters 판매 카운터, 구매 내역을 집계하지 않음)"""
+    return JSONResponse(content=await run_in_threadpool(get_item_sales))
+
+
 @router.post("/api/items/{item_id}/purchase")
-async def purchase_item_api(item_id: int, purchase_data: PurchaseRequest):
+async def purchase_item_api(request: Request, item_id: int, purchase_data: PurchaseRequest):
     """아이템 구매 API"""
-    user_id = get_user_id(purchase_data.username)
+    if not has_admission(request.cookies, purchase_data.username):
+        return JSONResponse(
+            status_code=403,
+            content={"success": False, "message": "대기열을 통해 입장해 주세요",
+                     "waiting_room": "/waiting-room?next=/shop"}
+        )
+    
+    retry_after = check_action_limit(purchase_data.username, client_ip(request))
+    if retry_after:
+        return rate_limited_response(retry_after)
+    
+    user_id = await run_in_threadpool(get_user_id, purchase_data.username)
     
     if not user_id:
         return JSONResponse(
@@ -77,12 +102,15 @@ async def purchase_item_api(item_id: int, purchase_data: PurchaseRequest):
             content={"success": False, "message": "로그인이 필요합니다"}
         )
     
-    # 안전한 버전 vs 불안전한 버전 선택
-    if purchase_data.use_safe:
-        result = purchase_item_safe(user_id, item_id, quantity=1)
-    else:
-        result = purchase_item_unsafe(user_id, item_id, quantity=1)
+    def purchase():
+        # 안전한 버전 vs 불안전한 버전 선택
+        if purchase_data.use_safe:
+            result = purchase_item_safe(user_id, item_id, quantity=1)
+        else:
+            result = purchase_item_unsafe(user_id, item_id, quantity=1)
+        
+        # 성공/실패에 따라 다른 상태 코드 반환
+        return (200 if result["success"] else (503 if result.get("retryable") else 400)), result
     
-    # 성공/실패에 따라 다른 상태 코드 반환
-    status_code = 200 if result["success"] else 400
-    return JSONResponse(status_code=status_code, content=result)
+    # Idempotency-Key가 있으면 재시도/동시 중복 요청은 첫 요청의 결과를 재사용
+    return await idempotent_response(request, purchase_data.username, purchase_data.model_dump(), purchase)
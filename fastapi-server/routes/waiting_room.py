@@ -0,0 +1,100 @@
+"""가상 대기실 관련 라우트"""
+import asyncio
+import logging
+
+from fastapi import APIRouter, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import HTMLResponse, RedirectResponse
+
+from config import WAITING_ROOM_PASS_TTL
+from utils.templating import templates
+from utils.waiting_room import PASS_COOKIE, has_admission, validate_pass, waiting_room
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+# 대기 순서 전송 주기 (초)
+QUEUE_UPDATE_SECONDS = 1
+
+
+def _safe_next(next_url: str) -> str:
+    """입장 후 이동할 경로 (외부 URL로의 리다이렉트 방지)"""
+    if not next_url.startswith("/") or next_url.startswith("//"):
+        return "/seats"
+    return next_url
+
+
+@router.get("/waiting-room", response_class=HTMLResponse)
+async def waiting_room_page(request: Request, next: str = "/seats"):
+    """대기실 페이지"""
+    username = request.cookies.get("username")
+    next_url = _safe_next(next)
+    
+    if not username:
+        return RedirectResponse(url="/login", status_code=303)
+    
+    # 대기실이 꺼져 있거나 이미 입장권이 있으면 바로 이동
+    if has_admission(request.cookies):
+        return RedirectResponse(url=next_url, status_code=303)
+    
+    return templates.TemplateResponse("waiting_room.html", {
+        "request": request,
+        "username": username,
+        "next_url": next_url
+    })
+
+
+@router.get("/waiting-room/enter")
+async def enter(request: Request, token: str, next: str = "/seats"):
+    """대기열에서 받은 입장권을 쿠키로 저장하고 원래 페이지로 이동"""
+    username = request.cookies.get("username")
+    
+    if not validate_pass(username, token):
+        return RedirectResponse(url=f"/waiting-room?next={_safe_next(next)}", status_code=303)
+    
+    response = RedirectResponse(url=_safe_next(next), status_code=303)
+    response.set_cookie(
+        key=PASS_COOKIE,
+        value=token,
+        max_age=WAITING_ROOM_PASS_TTL,
+        httponly=True,
+        samesite="lax"
+    )
+    return response
+
+
+@router.websocket("/ws/queue")
+async def queue_websocket(websocket: WebSocket):
+    """
+    대기열 WebSocket - 대기 순서/예상 대기 시간을 주기적으로 푸시
+    
+    입장 차례가 되면 {"type": "admitted", "token": ...}을 보내고 연결을 닫습니다.
+    연결이 끊기면 대기열에서 빠집니다.
+    """
+    await websocket.accept()
+    username = websocket.cookies.get("username")
+    
+    if not username:
+        await websocket.send_json({"type": "error", "message": "로그인이 필요합니다"})
+        await websocket.close()
+        return
+    
+    waiting_room.join(username)
+    last_status = None
+    try:
+        while True:
+            status = waiting_room.status(username)
+            if status["admitted"]:
+                await websocket.send_json({"type": "admitted", "token": status["token"]})
+                await websocket.close()
+                return
+            if status != last_status:
+                await websocket.send_json(dict(status, type="queue_status"))
+                last_status = status
+            await asyncio.sleep(QUEUE_UPDATE_SECONDS)
+    except WebSocketDisconnect:
+        pass
+    except Exception as e:
+        logger.warning("queue websocket error: %s", e)
+    finally:
+        waiting_room.leave(username)
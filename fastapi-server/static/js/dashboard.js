@@ -0,0 +1,224 @@
+// 좌석 현황 캔버스 초기화
+const seatOverviewCanvas = document.getElementById('seatOverviewCanvas');
+const seatOverviewCtx = seatOverviewCanvas.getContext('2d');
+const seatImage = new Image();
+seatImage.src = SEAT_IMAGE_URL;
+
+function resizeSeatCanvas() {
+    const wrapper = seatOverviewCanvas.parentElement;
+    seatOverviewCanvas.width = wrapper.clientWidth;
+    seatOverviewCanvas.height = wrapper.clientHeight;
+}
+
+function drawSeatOverview(seats) {
+    if (!seatImage.complete || seatImage.naturalWidth === 0) {
+        seatImage.onload = () => drawSeatOverview(seats);
+        return;
+    }
+
+    resizeSeatCanvas();
+
+    const canvasWidth = seatOverviewCanvas.width;
+    const canvasHeight = seatOverviewCanvas.height;
+    const baseWidth = 880;
+    const baseHeight = 800;
+    const scaleX = canvasWidth / baseWidth;
+    const scaleY = canvasHeight / baseHeight;
+
+    seatOverviewCtx.clearRect(0, 0, canvasWidth, canvasHeight);
+    seatOverviewCtx.drawImage(seatImage, 0, 0, canvasWidth, canvasHeight);
+
+    seats.forEach(seat => {
+        if (seat.status !== 'available') {
+            seatOverviewCtx.fillStyle = seat.status === 'held' ? 'rgba(253, 126, 20, 0.7)' : 'rgba(220, 53, 69, 0.7)';
+            seatOverviewCtx.fillRect(
+                seat.x_pos * scaleX,
+                seat.y_pos * scaleY,
+                seat.width * scaleX,
+                seat.height * scaleY
+            );
+        }
+    });
+}
+
+const timelineChart = new Chart(
+    document.getElementById('timelineChart'),
+    {
+        type: 'line',
+        data: {
+            labels: [],
+            datasets: [{
+                label: '예약 좌석 수',
+                data: [],
+                borderColor: 'rgba(102, 126, 234, 1)',
+                backgroundColor: 'rgba(102, 126, 234, 0.1)',
+                tension: 0.4,
+                fill: true
+            }]
+        },
+        options: {
+            responsive: true,
+            maintainAspectRatio: false,
+            scales: {
+                y: {
+                    beginAtZero: true,
+                    ticks: {
+                        stepSize: 1
+                    }
+                }
+            },
+            plugins: {
+                legend: {
+                    display: false
+                }
+            }
+        }
+    }
+);
+
+// 이전 데이터 저장
+let previousData = null;  // null로 초기화하여 첫 로드 구분
+
+// 캔버스용 좌석 (처음 한 번만 전체 조회, 이후 seat_update로 갱신)
+const seatsById = new Map();
+const ACTION_STATUS = { reserved: 'reserved', held: 'held', cancelled: 'available', released: 'available' };
+
+// WebSocket 연결 (좌석 목록 대신 점유 카운터를 occupancy 메시지로 수신)
+const socket = SeatCodec.connect('occupancy');
+
+socket.onopen = () => {
+    console.log('✅ WebSocket 연결 성공');
+    addActivity('시스템', 'WebSocket 연결 성공');
+};
+
+socket.onmessage = (event) => {
+    const data = JSON.parse(event.data);
+
+    if (data.type === 'occupancy') {
+        // seat_update 다음에 오는 최신 점유 현황
+        updateDashboard(data);
+    } else if (data.type === 'seat_update') {
+        applySeatUpdate(data);
+        const actionText = { reserved: '예약', held: '선점', cancelled: '취소', released: '선점 만료' }[data.action] || data.action;
+        const seatText = data.seat_ids ? data.seat_ids.map(id => `#${id}`).join(', ') : `#${data.seat_id}`;
+        addActivity(
+            data.username || '시스템',
+            `좌석 ${actionText} (좌석 ${seatText})`
+        );
+    }
+};
+
+socket.onerror = (error) => {
+    console.error('❌ WebSocket 에러:', error);
+    addActivity('시스템', '연결 오류 발생');
+};
+
+socket.onclose = () => {
+    console.log('🔌 WebSocket 연결 종료');
+    addActivity('시스템', 'WebSocket 연결 종료');
+};
+
+// 초기 데이터로 대시보드 업데이트 (점유 현황 + 캔버스용 좌석, ETag 캐시)
+fetch(`/api/seats/occupancy?event_id=${EVENT_ID}`)
+    .then(response => response.json())
+    .then(occupancy => {
+        console.log('📊 초기 데이터 로드:', occupancy.total, '석');
+        updateDashboard(occupancy, true);
+        addActivity('시스템', '페이지 로드 완료');
+    });
+
+SeatCodec.fetchSeats().then(initialSeats => {
+    initialSeats.forEach(seat => seatsById.set(seat.id, seat));
+    drawSeatOverview([...seatsById.values()]);
+});
+
+// seat_update 메시지의 좌석 상태를 캔버스에 반영
+function applySeatUpdate(data) {
+    const status = ACTION_STATUS[data.action];
+    const seatIds = data.seat_ids || [data.seat_id];
+    if (!status || seatsById.size === 0) {
+        return;
+    }
+    seatIds.forEach(id => {
+        const seat = seatsById.get(id);
+        if (seat) {
+            seat.status = status;
+        }
+    });
+    drawSeatOverview([...seatsById.values()]);
+}
+
+// 대시보드 업데이트 (occupancy: /api/seats/occupancy 또는 occupancy 메시지)
+function updateDashboard(occupancy, isInitialLoad = false) {
+    const { total, reserved, available } = occupancy;
+    const utilization = total > 0 ? Math.round((reserved / total) * 100) : 0;
+
+    // 통계 업데이트
+    document.getElementById('totalSeats').textContent = total;
+    document.getElementById('reservedSeats').textContent = reserved;
+    document.getElementById('availableSeats').textContent = available;
+    document.getElementById('utilizationRate').textContent = utilization + '%';
+
+    // 변화량 표시 (초기 로드가 아닌 경우에만)
+    if (isInitialLoad || previousData === null) {
+        // 초기 로드 시 변화량 대신 현재 상태 표시
+        document.getElementById('reservedChange').innerHTML = '<span>현재 상태</span>';
+        document.getElementById('availableChange').innerHTML = '<span>현재 상태</span>';
+        document.getElementById('utilizationChange').innerHTML = '<span>현재 상태</span>';
+    } else {
+        const reservedChange = reserved - previousData.reserved;
+        const availableChange = available - previousData.available;
+        const utilizationChange = utilization - previousData.utilization;
+
+        document.getElementById('reservedChange').innerHTML = 
+            reservedChange > 0 ? `<span class="positive">▲ ${reservedChange}</span>` :
+            reservedChange < 0 ? `<span class="negative">▼ ${Math.abs(reservedChange)}</span>` :
+            '<span>-</span>';
+
+        document.getElementById('availableChange').innerHTML = 
+            availableChange > 0 ? `<span class="positive">▲ ${availableChange}</span>` :
+            availableChange < 0 ? `<span class="negative">▼ ${Math.abs(availableChange)}</span>` :
+            '<span>-</span>';
+
+        document.getElementById('utilizationChange').innerHTML = 
+            utilizationChange > 0 ? `<span class="positive">▲ ${utilizationChange}%</span>` :
+            utilizationChange < 0 ? `<span class="negative">▼ ${Math.abs(utilizationChange)}%</span>` :
+            '<span>-</span>';
+    }
+
+    // 타임라인 차트 업데이트
+    const now = new Date().toLocaleTimeString('ko-KR', { hour: '2-digit', minute: '2-digit', second: '2-digit' });
+    timelineChart.data.labels.push(now);
+    timelineChart.data.datasets[0].data.push(reserved);
+
+    // 최대 20개 데이터만 유지
+    if (timelineChart.data.labels.length > 20) {
+        timelineChart.data.labels.shift();
+        timelineChart.data.datasets[0].data.shift();
+    }
+
+    timelineChart.update();
+
+    // 이전 데이터 저장
+    previousData = { reserved, available, utilization };
+}
+
+// 활동 로그 추가
+function addActivity(user, action) {
+    const logContainer = document.getElementById('activityLog');
+    const now = new Date().toLocaleString('ko-KR');
+
+    const activityItem = document.createElement('div');
+    activityItem.className = 'activity-item';
+    activityItem.innerHTML = `
+        <div class="activity-time">${now}</div>
+        <div class="activity-text"><strong>${user}</strong> - ${action}</div>
+    `;
+
+    logContainer.insertBefore(activityItem, logContainer.firstChild);
+
+    // 최대 50개 로그만 유지
+    while (logContainer.children.length > 50) {
+        logContainer.removeChild(logContainer.lastChild);
+    }
+}
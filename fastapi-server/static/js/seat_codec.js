@@ -0,0 +1,113 @@
+// 좌석 상태 바이너리 디코더 (utils/seat_codec.py와 같은 포맷)
+// - 레이아웃(/api/seats/layout)은 한 번만 받아 캐시
+// - 상태(/api/seats?format=binary, /ws/seats?encoding=binary)는 2비트 상태 배열 + 예약자 id
+// - 큰 공연장은 격자 정보(/api/seats/grid)로 화면에 걸친 타일(/api/seats/tile)만 조회
+// - 모든 요청은 페이지의 공연(EVENT_ID) 기준
+const SeatCodec = (() => {
+    const HEADER_SIZE = 10;
+    const STATUS_NAMES = ['available', 'reserved', 'held', 'reserved'];
+    let layout = null;
+
+    async function loadLayout() {
+        const response = await fetch(`/api/seats/layout?event_id=${EVENT_ID}`);
+        layout = await response.json();
+        return layout;
+    }
+
+    // 레이아웃이 맞지 않으면 null 반환
+    function decodeWithLayout(buffer) {
+        const view = new DataView(buffer);
+        const layoutId = view.getUint32(2, true);
+        const count = view.getUint32(6, true);
+        if (!layout || layout.layout_id !== layoutId || layout.seats.length !== count) {
+            return null;
+        }
+
+        const packed = new Uint8Array(buffer, HEADER_SIZE, (count + 3) >> 2);
+        let ownerOffset = HEADER_SIZE + packed.length;
+        const fields = layout.fields;
+        const seats = new Array(count);
+
+        for (let i = 0; i < count; i++) {
+            const code = (packed[i >> 2] >> ((i & 3) * 2)) & 0b11;
+            const row = layout.seats[i];
+            const seat = {};
+            for (let f = 0; f < fields.length; f++) {
+                seat[fields[f]] = row[f];
+            }
+            seat.status = STATUS_NAMES[code];
+            seat.reserved_by = null;
+            if (code !== 0) {
+                seat.reserved_by = view.getUint32(ownerOffset, true) || null;
+                ownerOffset += 4;
+            }
+            seats[i] = seat;
+        }
+        return seats;
+    }
+
+    // 바이너리 상태 프레임 -> 좌석 객체 배열 (레이아웃이 바뀌었으면 다시 조회)
+    async function decode(buffer) {
+        let seats = decodeWithLayout(buffer);
+        if (seats === null) {
+            await loadLayout();
+            seats = decodeWithLayout(buffer);
+        }
+        return seats || [];
+    }
+
+    async function fetchSeats() {
+        if (!layout) {
+            await loadLayout();
+        }
+        const response = await fetch(`/api/seats?format=binary&event_id=${EVENT_ID}`);
+        return decode(await response.arrayBuffer());
+    }
+
+    // 격자 정보 (타일 크기, 최대 줌, 좌석 범위), 좌석이 없으면 null
+    async function loadGrid() {
+        const response = await fetch(`/api/seats/grid?event_id=${EVENT_ID}`);
+        return response.ok ? response.json() : null;
+    }
+
+    // 타일/뷰포트 응답의 좌석 행 -> 좌석 객체 배열
+    function fromRows(fields, rows) {
+        return rows.map(row => {
+            const seat = {};
+            for (let f = 0; f < fields.length; f++) {
+                seat[fields[f]] = row[f];
+            }
+            return seat;
+        });
+    }
+
+    // 화면 범위 [x0, y0, x1, y1]에 걸친 최대 줌 타일의 좌석 (타일은 ETag로 캐시)
+    // revalidate면 브라우저 캐시를 쓰지 않고 서버에 ETag로 확인
+    async function fetchViewport(grid, rect, revalidate = false) {
+        const size = grid.tile_size;
+        const requests = [];
+        for (let tx = Math.floor(rect[0] / size); tx * size < rect[2]; tx++) {
+            for (let ty = Math.floor(rect[1] / size); ty * size < rect[3]; ty++) {
+                const url = `/api/seats/tile?event_id=${EVENT_ID}&z=${grid.max_zoom}&x=${tx}&y=${ty}`;
+                requests.push(fetch(url, { cache: revalidate ? 'no-cache' : 'default' }).then(r => r.json()));
+            }
+        }
+        const tiles = await Promise.all(requests);
+        const seats = new Map();
+        tiles.forEach(tile => {
+            fromRows(tile.fields, tile.seats).forEach(seat => seats.set(seat.id, seat));
+        });
+        return { seats: [...seats.values()], versions: tiles.map(tile => tile.version) };
+    }
+
+    // stream을 주면 (예: 'occupancy') 좌석 상태 대신 해당 JSON 메시지를 받는 연결
+    function connect(stream = null) {
+        const protocol = window.location.protocol === 'https:' ? 'wss:' : 'ws:';
+        const query = stream ? `stream=${stream}` : 'encoding=binary';
+        const socket = new WebSocket(`${protocol}//${window.location.host}/ws/seats?${query}&event_id=${EVENT_ID}`);
+        socket.binaryType = 'arraybuffer';
+        return socket;
+    }
+
+    return { loadLayout, decode, fetchSeats, loadGrid, fromRows, fetchViewport, connect };
+})();
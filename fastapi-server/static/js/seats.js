@@ -0,0 +1,314 @@
+const canvas = document.getElementById('seatCanvas');
+const ctx = canvas.getContext('2d');
+let seats = [];
+
+// 타일 모드: 좌석 범위가 캔버스보다 큰 공연장은 화면에 보이는 타일만 받고 드래그로 이동
+let grid = null;
+let tileMode = false;
+let offset = { x: 0, y: 0 };  // 캔버스 왼쪽 위의 공연장 좌표
+let tileVersions = [];
+
+// 이미지 로드 + 좌석 스냅샷(레이아웃 + 바이너리 상태, ETag 캐시) 조회 후 좌석 그리기
+const img = new Image();
+const imageLoaded = new Promise(resolve => { img.onload = resolve; });
+img.src = SEAT_IMAGE_URL;
+const seatsLoaded = SeatCodec.loadGrid().then(loaded => {
+    grid = loaded;
+    tileMode = grid !== null && (grid.bounds[2] > canvas.width || grid.bounds[3] > canvas.height);
+    if (tileMode) {
+        offset = { x: grid.bounds[0], y: grid.bounds[1] };
+        canvas.style.touchAction = 'none';
+        return loadViewport().then(subscribeViewport);
+    }
+    return SeatCodec.fetchSeats().then(loaded => { seats = loaded; });
+});
+Promise.all([imageLoaded, seatsLoaded]).then(() => {
+    drawSeats();
+    updateMyReservationUI();
+});
+
+function viewportRect() {
+    return [offset.x, offset.y, offset.x + canvas.width, offset.y + canvas.height];
+}
+
+// 화면에 걸친 타일의 좌석 조회
+async function loadViewport(revalidate = false) {
+    const loaded = await SeatCodec.fetchViewport(grid, viewportRect(), revalidate);
+    seats = loaded.seats;
+    tileVersions = loaded.versions;
+    drawSeats();
+}
+
+// 화면 범위 구독 (이후 범위 안 좌석 변경분만 수신, 좌석은 타일로 받았으므로 snapshot 생략)
+function subscribeViewport() {
+    if (socket.readyState === WebSocket.OPEN) {
+        socket.send(JSON.stringify({ action: 'viewport', rect: viewportRect(), snapshot: false }));
+    }
+}
+
+function drawSeats() {
+    if (tileMode) {
+        // 큰 공연장은 배경 이미지 대신 빈 좌석도 직접 그림
+        ctx.setTransform(1, 0, 0, 1, 0, 0);
+        ctx.clearRect(0, 0, canvas.width, canvas.height);
+        ctx.setTransform(1, 0, 0, 1, -offset.x, -offset.y);
+        ctx.fillStyle = 'rgba(108, 117, 125, 0.3)';
+        seats.forEach(seat => {
+            if (seat.status === 'available') {
+                ctx.fillRect(seat.x_pos, seat.y_pos, seat.width, seat.height);
+            }
+        });
+    } else {
+        // 배경 이미지 그리기
+        ctx.drawImage(img, 0, 0, canvas.width, canvas.height);
+    }
+
+    // 각 좌석 상태에 따라 색상 칠하기
+    seats.forEach(seat => {
+        if (seat.status === 'reserved') {
+            // 내가 예약한 좌석인지 확인
+            if (isMine(seat)) {
+                ctx.fillStyle = 'rgba(0, 0, 0, 0.7)';  // 검정색 (내 예약)
+            } else {
+                ctx.fillStyle = 'rgba(220, 53, 69, 0.7)';  // 빨간색 (다른 사람 예약)
+            }
+            ctx.fillRect(seat.x_pos, seat.y_pos, seat.width, seat.height);
+        } else if (seat.status === 'held') {
+            ctx.fillStyle = 'rgba(253, 126, 20, 0.7)';  // 주황색 (임시 선점)
+            ctx.fillRect(seat.x_pos, seat.y_pos, seat.width, seat.height);
+        }
+    });
+    ctx.setTransform(1, 0, 0, 1, 0, 0);
+}
+
+// 내 예약 좌석인지 (단체 예매로 여러 좌석일 수 있음)
+function isMine(seat) {
+    return myReservations.some(reservation => reservation.id === seat.id);
+}
+
+// 좌석 상태로 내 예약 목록 갱신 (예약 시간은 같은 좌석의 기존 정보에서 유지)
+function setMyReservations(mySeats) {
+    const previous = new Map(myReservations.map(reservation => [reservation.id, reservation]));
+    myReservations = mySeats.map(seat => {
+        const before = previous.get(seat.id);
+        return before ? Object.assign(seat, { reserved_at: before.reserved_at }) : seat;
+    });
+}
+
+// 내 예약 정보 UI 업데이트 (좌석마다 취소 버튼)
+function updateMyReservationUI() {
+    const panel = document.getElementById('myReservationPanel');
+    const list = document.getElementById('myReservationList');
+    list.innerHTML = '';
+
+    if (myReservations.length === 0) {
+        panel.style.display = 'none';
+        return;
+    }
+    panel.style.display = 'block';
+    myReservations.forEach(reservation => {
+        const item = document.createElement('li');
+        item.style.marginBottom = '8px';
+        item.textContent = `좌석 번호: ${reservation.seat_number} (예약 시간: ${reservation.reserved_at || '-'}) `;
+        const cancelButton = document.createElement('button');
+        cancelButton.textContent = '예약 취소';
+        cancelButton.style.cssText = 'padding: 4px 12px; background: #dc3545; color: white; border: none; border-radius: 4px; cursor: pointer;';
+        cancelButton.onclick = () => {
+            if (confirm(`좌석 ${reservation.seat_number} 예약을 취소하시겠습니까?`)) {
+                reserveSeatWS(reservation.id, 'cancel');
+            }
+        };
+        item.appendChild(cancelButton);
+        list.appendChild(item);
+    });
+}
+
+// WebSocket 연결 (좌석 상태는 바이너리 프레임으로 수신)
+const socket = SeatCodec.connect();
+let pendingUpdate = null;  // 바이너리 상태 프레임 직전에 오는 seat_update 메타데이터
+
+socket.onopen = () => {
+    console.log('✅ WebSocket 연결 성공');
+    showMessage('실시간 업데이트 연결됨', 'success');
+    if (tileMode) {
+        subscribeViewport();
+    }
+};
+
+// 화면 범위 안에서 바뀐 좌석 반영 (타일 모드)
+function applyViewportUpdate(data) {
+    SeatCodec.fromRows(grid.fields, data.seats).forEach(changed => {
+        const index = seats.findIndex(seat => seat.id === changed.id);
+        if (index >= 0) {
+            seats[index] = changed;
+        }
+        const others = myReservations.filter(reservation => reservation.id !== changed.id);
+        if (changed.status === 'reserved' && changed.reserved_by === USER_ID) {
+            others.push(changed);
+        }
+        setMyReservations(others);
+    });
+    drawSeats();
+    updateMyReservationUI();
+    showUpdateMessage(data);
+}
+
+function showUpdateMessage(update) {
+    if (update.action === 'released') {
+        showMessage(update.message, 'success');
+    } else {
+        const actionText = { reserved: '예약', held: '선점', cancelled: '취소' }[update.action] || update.action;
+        showMessage(`${update.username}님이 좌석을 ${actionText}했습니다`, 'success');
+    }
+}
+
+socket.onmessage = async (event) => {
+    if (event.data instanceof ArrayBuffer) {
+        if (tileMode) {
+            // 화면 범위 구독 전에 도착한 전체 상태 프레임은 무시
+            return;
+        }
+        // 좌석 상태 프레임 (seat_update 또는 get_all 응답)
+        seats = await SeatCodec.decode(event.data);
+
+        // 내 예약 좌석 찾기 (단체 예매면 여러 좌석)
+        setMyReservations(seats.filter(seat =>
+            seat.status === 'reserved' &&
+            seat.reserved_by === USER_ID
+        ));
+
+        drawSeats();
+        updateMyReservationUI();
+
+        if (pendingUpdate) {
+            showUpdateMessage(pendingUpdate);
+            pendingUpdate = null;
+        }
+        return;
+    }
+
+    const data = JSON.parse(event.data);
+    console.log('📨 서버 메시지:', data);
+
+    if (data.type === 'seat_update') {
+        // 최신 좌석 상태는 다음 바이너리 프레임으로 도착
+        pendingUpdate = data;
+    } else if (data.type === 'viewport') {
+        // 타일을 받은 뒤 구독하기 전까지의 변경을 놓쳤으면 타일을 다시 확인
+        if (tileVersions.some(version => version !== data.version)) {
+            loadViewport(true);
+        }
+    } else if (data.type === 'viewport_update') {
+        applyViewportUpdate(data);
+    } else if (data.type === 'error') {
+        console.log('❌ 에러:', data.message);
+        if (data.waiting_room) {
+            window.location.href = data.waiting_room;
+            return;
+        }
+        showMessage(data.message, 'error');
+    }
+};
+
+socket.onerror = (error) => {
+    console.error('❌ WebSocket 에러:', error);
+};
+
+socket.onclose = () => {
+    console.log('🔌 WebSocket 연결 종료');
+};
+
+// 타일 모드 드래그로 화면 이동 (놓으면 새 범위의 타일 조회 + 구독 변경)
+let drag = null;
+let dragged = false;
+
+function clampOffset(x, y) {
+    const [left, top, right, bottom] = grid.bounds;
+    return {
+        x: Math.max(left, Math.min(x, Math.max(left, right - canvas.width))),
+        y: Math.max(top, Math.min(y, Math.max(top, bottom - canvas.height)))
+    };
+}
+
+canvas.addEventListener('pointerdown', (e) => {
+    if (tileMode) {
+        drag = { x: e.clientX, y: e.clientY, offset: { ...offset } };
+        dragged = false;
+    }
+});
+
+canvas.addEventListener('pointermove', (e) => {
+    if (!drag) {
+        return;
+    }
+    const dx = e.clientX - drag.x;
+    const dy = e.clientY - drag.y;
+    if (Math.abs(dx) + Math.abs(dy) > 3) {
+        dragged = true;
+    }
+    offset = clampOffset(drag.offset.x - dx, drag.offset.y - dy);
+    drawSeats();
+});
+
+window.addEventListener('pointerup', () => {
+    if (drag && dragged) {
+        loadViewport().then(subscribeViewport);
+    }
+    drag = null;
+});
+
+// 캔버스 클릭 이벤트
+canvas.addEventListener('click', (e) => {
+    if (dragged) {
+        // 드래그 끝의 클릭은 좌석 선택으로 처리하지 않음
+        dragged = false;
+        return;
+    }
+    const rect = canvas.getBoundingClientRect();
+    const x = e.clientX - rect.left + offset.x;
+    const y = e.clientY - rect.top + offset.y;
+
+    // 클릭한 좌석 찾기
+    const clickedSeat = seats.find(seat => 
+        x >= seat.x_pos && x <= seat.x_pos + seat.width &&
+        y >= seat.y_pos && y <= seat.y_pos + seat.height
+    );
+
+    if (clickedSeat) {
+        // 내가 예약한 좌석이면 취소
+        if (isMine(clickedSeat)) {
+            reserveSeatWS(clickedSeat.id, 'cancel');
+        } else if (clickedSeat.status === 'available' ||
+                   (clickedSeat.status === 'held' && clickedSeat.reserved_by === USER_ID)) {
+            // 예약 가능한 좌석(또는 내가 선점한 좌석)이면 예약
+            reserveSeatWS(clickedSeat.id, 'reserve');
+        } else if (clickedSeat.status === 'held') {
+            showMessage('다른 사용자가 선점 중인 좌석입니다', 'error');
+        } else {
+            showMessage('이미 예약된 좌석입니다', 'error');
+        }
+    }
+});
+
+function reserveSeatWS(seatId, action) {
+    const useSafe = document.querySelector('input[name="mode"]:checked').value === 'safe';
+
+    const message = {
+        action: action,
+        username: username,
+        seat_id: seatId,
+        use_safe: useSafe
+    };
+    console.log('📤 WebSocket 메시지 전송:', message);
+    socket.send(JSON.stringify(message));
+}
+
+function showMessage(msg, type) {
+    const msgDiv = document.getElementById('message');
+    msgDiv.textContent = msg;
+    msgDiv.className = `message ${type}`;
+    setTimeout(() => {
+        msgDiv.textContent = '';
+        msgDiv.className = '';
+    }, 3000);
+}
@@ -0,0 +1,23 @@
+// 대기열 WebSocket - 대기 순서/예상 대기 시간 표시, 입장 차례가 되면 입장권을 받아 이동
+const protocol = window.location.protocol === 'https:' ? 'wss:' : 'ws:';
+const queueSocket = new WebSocket(`${protocol}//${window.location.host}/ws/queue`);
+
+queueSocket.onmessage = (event) => {
+    const data = JSON.parse(event.data);
+
+    if (data.type === 'queue_status') {
+        document.getElementById('position').textContent =
+            data.position !== null ? Math.max(data.position - 1, 0) : '-';
+        document.getElementById('eta').textContent =
+            data.eta_seconds !== null ? `예상 대기 시간: 약 ${Math.ceil(data.eta_seconds)}초` : '';
+    } else if (data.type === 'admitted') {
+        const params = new URLSearchParams({ token: data.token, next: NEXT_URL });
+        window.location.href = `/waiting-room/enter?${params}`;
+    } else if (data.type === 'error') {
+        document.getElementById('eta').textContent = data.message;
+    }
+};
+
+queueSocket.onclose = () => {
+    console.log('🔌 대기열 연결 종료');
+};
@@ -77,6 +77,41 @@ async def run_concurrent_reservations(seat_id, users, use_safe=False):
         print(f"   SELECT seat_number, reserved_by FROM seats WHERE reserved_by IS NOT NULL;")
 
 
+async def check_held_seat_listing(seat_id, username):
+    """선점 좌석이 있을 때 /api/seats(JSON) 조회 확인 - held_until(datetime) 직렬화 회귀 테스트"""
+    from utils.waiting_room import PASS_COOKIE, issue_pass
+    
+    print(f"\n{'='*70}")
+    print(f"🧪 선점 좌석 목록 조회 테스트 (좌석 ID: {seat_id}, 계정: {username})")
+    print(f"{'='*70}")
+    
+    # 대기실 입장권은 서버와 같은 WAITING_ROOM_SECRET(.env)으로 직접 발급
+    cookies = {"username": username, PASS_COOKIE: issue_pass(username)}
+    async with aiohttp.ClientSession(cookies=cookies) as session:
+        async with session.post("http://localhost:8000/api/seats/hold",
+                                json={"username": username, "seat_id": seat_id}) as response:
+            result = await response.json()
+            if response.status != 200:
+                print(f"\n⚠️  선점 실패 ({response.status}): {result.get('message')}")
+                return False
+        
+        async with session.get("http://localhost:8000/api/seats") as response:
+            status = response.status
+            seats = (await response.json()).get("seats", []) if status == 200 else []
+        
+        # 다음 테스트를 위해 선점 해제
+        async with session.post("http://localhost:8000/api/seats/cancel",
+                                json={"username": username, "seat_id": seat_id}) as response:
+            await response.read()
+    
+    held = next((seat for seat in seats if seat["id"] == seat_id), None)
+    if status == 200 and held and held["status"] == "held" and isinstance(held["held_until"], str):
+        print(f"\n✅ 조회 성공: 좌석 {held['seat_number']} held_until = {held['held_until']}")
+        return True
+    print(f"\n❌ 조회 실패: HTTP {status}, 좌석 = {held}")
+    return False
+
+
 async def cleanup_reservations():
     """테스트 후 예약 초기화"""
     print("\n🧹 예약 데이터 정리 중...")
@@ -99,7 +134,7 @@ async def main():
     print("🔬 좌석 예약 동시성 테스트 도구")
     print("="*70)
     
-    # 테스트할 사용자들 (test1 ~ test10)
+    # 테스트할 사용자들 (test1 ~ test10, python provision_users.py --prefix test --count 10 으로 생성)
     users = [f"test{i}" for i in range(1, 11)]
     
     print(f"\n📌 테스트 계정: {', '.join(users)}")
@@ -113,6 +148,7 @@ async def main():
     print("1. 위험한 예약 (Race Condition 테스트)")
     print("2. 안전한 예약 (FOR UPDATE 락 테스트)")
     print("3. 둘 다 비교")
+    print("4. 선점 좌석이 있을 때 좌석 목록(JSON) 조회")
     
     choice = input("\n선택 (1/2/3): ").strip()
     
@@ -130,6 +166,8 @@ async def main():
         print("\n\n안전한 예약을 테스트합니다...")
         await asyncio.sleep(1)
         await run_concurrent_reservations(seat_id, users, use_safe=True)
+    elif choice == "4":
+        await check_held_seat_listing(seat_id, users[0])
     else:
         print("잘못된 선택입니다.")
     
@@ -82,7 +82,7 @@ async def main():
     print("🔬 아이템 구매 동시성 테스트 도구")
     print("="*70)
     
-    # 테스트할 사용자들 (test1 ~ test10)
+    # 테스트할 사용자들 (test1 ~ test10, python provision_users.py --prefix test --count 10 으로 생성)
     users = [f"test{i}" for i in range(1, 11)]
     
     print(f"\n📌 테스트 계정: {', '.join(users)}")
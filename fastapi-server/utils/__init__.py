@@ -0,0 +1,102 @@
+"""공통 유틸리티 모음 - 모든 함수를 여기서 import"""
+
+from .log import (
+    setup_logging,
+    shutdown_logging,
+    log_event,
+    audit
+)
+from .http_cache import (
+    HttpCacheMiddleware,
+    version_refresh_loop
+)
+from .static_assets import (
+    build_static_assets,
+    load_static_manifest,
+    asset_url,
+    PrecompressedStaticFiles
+)
+from .seat_index import (
+    availability_index,
+    find_adjacent_seats,
+    allocate_group
+)
+from .seat_grid import (
+    seat_grids,
+    get_seat_tile
+)
+from .seat_holds import (
+    hold_scheduler
+)
+from .waiting_room import (
+    waiting_room,
+    has_admission,
+    check_waiting_room_secret
+)
+from .rate_limit import (
+    check_action_limit,
+    check_login_limit,
+    get_rate_limit_stats
+)
+from .idempotency import (
+    idempotent_response,
+    get_idempotency_stats
+)
+from .templating import (
+    templates,
+    precompile_templates,
+    render_static_page,
+    get_fragment,
+    render_fragment
+)
+
+__all__ = [
+    # log
+    'setup_logging',
+    'shutdown_logging',
+    'log_event',
+    'audit',
+    
+    # http_cache
+    'HttpCacheMiddleware',
+    'version_refresh_loop',
+    
+    # static_assets
+    'build_static_assets',
+    'load_static_manifest',
+    'asset_url',
+    'PrecompressedStaticFiles',
+    
+    # seat_index
+    'availability_index',
+    'find_adjacent_seats',
+    'allocate_group',
+    
+    # seat_grid
+    'seat_grids',
+    'get_seat_tile',
+    
+    # seat_holds
+    'hold_scheduler',
+    
+    # waiting_room
+    'waiting_room',
+    'has_admission',
+    'check_waiting_room_secret',
+    
+    # rate_limit
+    'check_action_limit',
+    'check_login_limit',
+    'get_rate_limit_stats',
+    
+    # idempotency
+    'idempotent_response',
+    'get_idempotency_stats',
+    
+    # templating
+    'templates',
+    'precompile_templates',
+    'render_static_page',
+    'get_fragment',
+    'render_fragment',
+]
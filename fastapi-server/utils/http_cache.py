@@ -0,0 +1,186 @@
+"""HTTP 캐시 미들웨어 - ETag / Last-Modified / Cache-Control
+
+- /api/items, /api/items/sales, /api/events, /api/seats, /api/seats/layout, /api/seats/grid,
+  /api/seats/tile, /api/seats/available, /api/seats/occupancy, /shop:
+  데이터 버전(database.versions) 기반 ETag (좌석 API는 event_id 쿼리의 공연별 버전)
+- /, /login: 템플릿 파일 기반 ETag + Last-Modified (익명 페이지)
+- /static/*: 장기 Cache-Control
+
+조건부 요청이 현재 ETag와 일치하면 라우트를 실행하지 않고 바로 304를 반환하며,
+버전 판단은 메모리 스냅샷만 사용하므로 DB를 조회하지 않습니다.
+"""
+import asyncio
+import hashlib
+import logging
+import os
+from email.utils import formatdate, parsedate_to_datetime
+from urllib.parse import parse_qs
+
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.requests import cookie_parser
+from starlette.responses import Response
+
+from config import (
+    TEMPLATES_DIR, CACHE_VERSION_REFRESH_SECONDS, DEFAULT_EVENT_ID,
+    API_CACHE_MAX_AGE, PAGE_CACHE_MAX_AGE, STATIC_CACHE_MAX_AGE
+)
+from database.versions import get_version, refresh_versions, versions_ready, scoped_name
+
+logger = logging.getLogger(__name__)
+
+# 경로별 캐시 규칙
+# versions: ETag를 구성하는 데이터 버전 / per_user: 로그인 사용자별로 내용이 달라지는 페이지
+# per_event: event_id 쿼리 파라미터의 공연별 버전 사용 (다른 공연의 쓰기로 무효화되지 않음)
+VERSIONED_ROUTES = {
+    "/api/items": {"versions": ("items",), "per_user": False},
+    "/api/items/sales": {"versions": ("items",), "per_user": False},
+    "/api/events": {"versions": ("events",), "per_user": False},
+    "/api/seats": {"versions": ("seats",), "per_user": False, "per_event": True},
+    "/api/seats/layout": {"versions": ("layout",), "per_user": False, "per_event": True,
+                          "max_age": PAGE_CACHE_MAX_AGE},
+    "/api/seats/grid": {"versions": ("layout",), "per_user": False, "per_event": True,
+                        "max_age": PAGE_CACHE_MAX_AGE},
+    "/api/seats/tile": {"versions": ("seats", "layout"), "per_user": False, "per_event": True},
+    "/api/seats/available": {"versions": ("seats", "layout"), "per_user": False, "per_event": True},
+    "/api/seats/occupancy": {"versions": ("seats", "layout"), "per_user": False, "per_event": True},
+    "/shop": {"versions": ("items",), "per_user": True},
+}
+
+# 요청 데이터와 무관한 익명 페이지 (경로 -> 템플릿)
+STATIC_PAGES = {
+    "/": "signup.html",
+    "/login": "login.html",
+}
+
+
+def _page_validators(template: str):
+    """템플릿 파일 mtime/size 기반 (ETag, Last-Modified, mtime)"""
+    stat = os.stat(os.path.join(TEMPLATES_DIR, template))
+    etag = f'W/"page-{int(stat.st_mtime)}-{stat.st_size}"'
+    return etag, formatdate(stat.st_mtime, usegmt=True), int(stat.st_mtime)
+
+
+def _event_id(query_string: bytes):
+    """쿼리의 event_id (없으면 기본 공연, 숫자가 아니면 None)"""
+    values = parse_qs(query_string.decode("latin-1")).get("event_id")
+    if not values:
+        return DEFAULT_EVENT_ID
+    return int(values[0]) if values[0].isdigit() else None
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    # 약한 비교: W/ 접두사 무시
+    plain = etag[2:] if etag.startswith("W/") else etag
+    return "*" in candidates or any(
+        (tag[2:] if tag.startswith("W/") else tag) == plain for tag in candidates
+    )
+
+
+def _not_modified_since(if_modified_since: str, mtime: int) -> bool:
+    if not if_modified_since:
+        return False
+    try:
+        return int(parsedate_to_datetime(if_modified_since).timestamp()) >= mtime
+    except (TypeError, ValueError):
+        return False
+
+
+class HttpCacheMiddleware:
+    """GET/HEAD 응답에 캐시 헤더를 붙이고 조건부 요청에 304로 응답하는 ASGI 미들웨어"""
+
+    def __init__(self, app):
+        self.app = app
+        self._pages = {}
+
+    def _page(self, path: str):
+        validators = self._pages.get(path)
+        if validators is None:
+            validators = self._pages[path] = _page_validators(STATIC_PAGES[path])
+        return validators
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] not in ("GET", "HEAD"):
+            await self.app(scope, receive, send)
+            return
+
+        path = scope["path"]
+        request_headers = Headers(scope=scope)
+        extra = {}
+        not_modified = False
+
+        if path.startswith("/static/"):
+            extra["cache-control"] = f"public, max-age={STATIC_CACHE_MAX_AGE}"
+
+        elif path in STATIC_PAGES:
+            etag, last_modified, mtime = self._page(path)
+            extra = {
+                "etag": etag,
+                "last-modified": last_modified,
+                "cache-control": f"public, max-age={PAGE_CACHE_MAX_AGE}",
+            }
+            if_none_match = request_headers.get("if-none-match")
+            not_modified = (_etag_matches(if_none_match, etag) if if_none_match
+                            else _not_modified_since(request_headers.get("if-modified-since"), mtime))
+
+        elif path in VERSIONED_ROUTES and versions_ready():
+            rule = VERSIONED_ROUTES[path]
+            names = rule["versions"]
+            if rule.get("per_event"):
+                event_id = _event_id(scope["query_string"])
+                if event_id is None:
+                    # 잘못된 event_id는 라우트의 검증 오류 응답으로
+                    await self.app(scope, receive, send)
+                    return
+                names = [scoped_name(name, event_id) for name in names]
+            tag = "-".join(f"{name}.{get_version(name)}" for name in names)
+            if scope["query_string"]:
+                # 같은 경로라도 표현(format=binary 등)이 다르면 ETag도 달라야 함
+                tag += "-" + hashlib.sha1(scope["query_string"]).hexdigest()[:8]
+            cache_control = f"public, max-age={rule.get('max_age', API_CACHE_MAX_AGE)}"
+
+            if rule["per_user"]:
+                username = cookie_parser(request_headers.get("cookie", "")).get("username")
+                if username:
+                    tag += "-" + hashlib.sha1(username.encode()).hexdigest()[:12]
+                    cache_control = "private, no-cache"
+                extra["vary"] = "Cookie"
+
+            extra["etag"] = f'W/"{path.strip("/").replace("/", "-")}-{tag}"'
+            extra["cache-control"] = cache_control
+            not_modified = _etag_matches(request_headers.get("if-none-match"), extra["etag"])
+
+        if not extra:
+            await self.app(scope, receive, send)
+            return
+
+        if not_modified:
+            await Response(status_code=304, headers=extra)(scope, receive, send)
+            return
+
+        async def send_with_cache_headers(message):
+            if message["type"] == "http.response.start" and message["status"] == 200:
+                headers = MutableHeaders(scope=message)
+                for key, value in extra.items():
+                    if key not in headers:
+                        headers[key] = value
+            await send(message)
+
+        await self.app(scope, receive, send_with_cache_headers)
+
+
+async def version_refresh_loop():
+    """
+    다른 워커의 쓰기를 반영하기 위해 주기적으로 버전 스냅샷 갱신
+
+    워커 간 ETag 불일치는 최대 CACHE_VERSION_REFRESH_SECONDS 동안만 유지됩니다.
+    """
+    while True:
+        try:
+            await run_in_threadpool(refresh_versions)
+        except Exception as e:
+            logger.warning("version refresh failed: %s", e)
+        await asyncio.sleep(CACHE_VERSION_REFRESH_SECONDS)
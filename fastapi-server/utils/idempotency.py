@@ -0,0 +1,182 @@
+"""Idempotency-Key 처리 (single-flight + TTL 결과 캐시)
+
+같은 사용자/엔드포인트/Idempotency-Key 조합에 대해
+- 첫 요청만 실제로 실행하고 (구매/예약 트랜잭션)
+- 동시에 들어온 중복 요청은 첫 요청의 결과를 기다렸다가 같은 응답을 받으며
+- 이후 재시도는 TTL 동안 캐시된 응답으로 즉시 답합니다 (재고/좌석 행을 건드리지 않음).
+
+같은 키로 본문이 다른 요청이 오면 422로 거절합니다.
+IDEMPOTENCY_PERSIST=True면 database.idempotency 테이블에도 결과를 저장해
+다른 워커/서버로 간 재시도도 중복 실행되지 않게 합니다.
+"""
+import asyncio
+import hashlib
+import json
+import time
+from collections import OrderedDict
+
+from fastapi.responses import JSONResponse
+from starlette.concurrency import run_in_threadpool
+
+from config import IDEMPOTENCY_TTL_SECONDS, IDEMPOTENCY_MAX_ENTRIES, IDEMPOTENCY_PERSIST
+from database.idempotency import (
+    get_idempotency_record, claim_idempotency_key,
+    complete_idempotency_key, release_idempotency_key
+)
+
+HEADER = "idempotency-key"
+MAX_KEY_LENGTH = 255
+
+
+class IdempotencyConflict(Exception):
+    """같은 키로 다른 내용의 요청이 들어옴 / 다른 워커에서 처리 중"""
+
+    def __init__(self, status_code: int, message: str):
+        super().__init__(message)
+        self.status_code = status_code
+        self.message = message
+
+
+class _Entry:
+    __slots__ = ("fingerprint", "future", "expires_at")
+
+    def __init__(self, fingerprint, future):
+        self.fingerprint = fingerprint
+        self.future = future
+        self.expires_at = None  # 처리 중이면 None
+
+
+def _run_persistent(key: str, fingerprint: str, func):
+    """DB에 키를 선점한 뒤 실행 (다른 워커가 이미 처리했으면 저장된 결과 반환)"""
+    record = get_idempotency_record(key, IDEMPOTENCY_TTL_SECONDS)
+    if record is None and claim_idempotency_key(key, fingerprint, IDEMPOTENCY_TTL_SECONDS):
+        try:
+            status_code, content = func()
+        except Exception:
+            release_idempotency_key(key)
+            raise
+        if status_code >= 500:
+            release_idempotency_key(key)
+        else:
+            complete_idempotency_key(key, status_code, content)
+        return status_code, content, False
+
+    record = record or get_idempotency_record(key, IDEMPOTENCY_TTL_SECONDS)
+    if record is None or record["status_code"] is None:
+        raise IdempotencyConflict(409, "같은 요청을 처리 중입니다. 잠시 후 다시 시도해 주세요")
+    if record["fingerprint"] != fingerprint:
+        raise IdempotencyConflict(422, "같은 Idempotency-Key로 다른 요청을 보낼 수 없습니다")
+    return record["status_code"], record["response"], True
+
+
+class IdempotencyCache:
+    """키별 single-flight + 완료 결과 LRU/TTL 캐시 (이벤트 루프에서만 사용)"""
+
+    def __init__(self, ttl: float, max_entries: int):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.coalesced = 0
+        self.executed = 0
+
+    def _evict(self):
+        """오래된 완료 항목부터 제거 (처리 중인 항목은 중복 실행 방지를 위해 남김)"""
+        while len(self._entries) > self.max_entries:
+            entry = next(iter(self._entries.values()))
+            if entry.expires_at is None:
+                break
+            self._entries.popitem(last=False)
+
+    async def run(self, key: str, fingerprint: str, func):
+        """
+        func()를 키당 한 번만 실행하고 (status_code, content, replayed) 반환
+
+        func는 (status_code, content)를 반환하는 동기 함수이며 스레드 풀에서 실행됩니다.
+        """
+        entry = self._entries.get(key)
+        if entry is not None and entry.expires_at is not None and entry.expires_at < time.monotonic():
+            del self._entries[key]
+            entry = None
+
+        if entry is not None:
+            if entry.fingerprint != fingerprint:
+                raise IdempotencyConflict(422, "같은 Idempotency-Key로 다른 요청을 보낼 수 없습니다")
+            if entry.future.done():
+                self.hits += 1
+            else:
+                self.coalesced += 1
+            status_code, content, _ = await asyncio.shield(entry.future)
+            return status_code, content, True
+
+        future = asyncio.get_running_loop().create_future()
+        # 기다리는 요청이 없을 때 예외가 '조회되지 않음' 경고로 남지 않도록
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        entry = self._entries[key] = _Entry(fingerprint, future)
+        self._evict()
+        self.executed += 1
+
+        try:
+            if IDEMPOTENCY_PERSIST:
+                result = await run_in_threadpool(_run_persistent, key, fingerprint, func)
+            else:
+                result = (*await run_in_threadpool(func), False)
+        except BaseException as e:
+            self._entries.pop(key, None)
+            future.set_exception(e)
+            raise
+
+        if result[0] >= 500:
+            # 서버 오류는 캐시하지 않음 (재시도 시 다시 실행)
+            self._entries.pop(key, None)
+        else:
+            entry.expires_at = time.monotonic() + self.ttl
+        future.set_result(result)
+        return result
+
+    def stats(self) -> dict:
+        return {"entries": len(self._entries), "executed": self.executed,
+                "hits": self.hits, "coalesced": self.coalesced}
+
+
+idempotency_cache = IdempotencyCache(IDEMPOTENCY_TTL_SECONDS, IDEMPOTENCY_MAX_ENTRIES)
+
+
+def request_fingerprint(path: str, body) -> str:
+    """요청 경로 + 본문 해시 (같은 키로 다른 요청이 오는 것을 감지)"""
+    payload = json.dumps(body, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(f"{path}\n{payload}".encode()).hexdigest()
+
+
+async def idempotent_response(request, username: str, body, func):
+    """
+    Idempotency-Key 헤더가 있으면 캐시/single-flight를 거쳐, 없으면 그대로 func() 실행
+
+    func는 (status_code, content)를 반환하는 동기 함수이며, 키 유무와 관계없이 스레드풀에서 실행합니다
+    (DB 트랜잭션과 재시도 백오프가 이벤트 루프를 막지 않도록).
+    재사용된 응답에는 Idempotent-Replayed: true 헤더를 붙입니다.
+    """
+    idem_key = request.headers.get(HEADER)
+    if not idem_key:
+        status_code, content = await run_in_threadpool(func)
+        return JSONResponse(status_code=status_code, content=content)
+
+    if len(idem_key) > MAX_KEY_LENGTH:
+        return JSONResponse(status_code=400, content={"success": False, "message": "Idempotency-Key가 너무 깁니다"})
+
+    path = request.url.path
+    key = hashlib.sha256(f"{username}\n{path}\n{idem_key}".encode()).hexdigest()
+    try:
+        status_code, content, replayed = await idempotency_cache.run(
+            key, request_fingerprint(path, body), func
+        )
+    except IdempotencyConflict as e:
+        return JSONResponse(status_code=e.status_code, content={"success": False, "message": e.message})
+
+    headers = {"Idempotent-Replayed": "true"} if replayed else None
+    return JSONResponse(status_code=status_code, content=content, headers=headers)
+
+
+def get_idempotency_stats() -> dict:
+    """실행 / 캐시 적중 / 동시 중복 합류 횟수"""
+    return idempotency_cache.stats()
@@ -0,0 +1,131 @@
+"""비동기 구조화 로깅
+
+요청 처리 경로에서는 LogRecord를 큐에 넣기만 하고, 포맷팅과 stdout/파일 쓰기는
+QueueListener 스레드가 담당합니다.
+
+- log_event(): 이벤트 이름 + 필드를 JSON 한 줄로 기록 (sampled=True면 샘플링)
+- audit(): 구매/예약 성공 같은 감사 이벤트를 별도 스트림(AUDIT_LOG_FILE)에 기록
+"""
+import atexit
+import json
+import logging
+import logging.handlers
+import queue
+import random
+import time
+
+from config import LOG_LEVEL, LOG_FORMAT, LOG_SUCCESS_SAMPLE_RATE, AUDIT_LOG_FILE
+
+audit_logger = logging.getLogger("audit")
+
+_listeners = []
+
+
+class JsonFormatter(logging.Formatter):
+    """LogRecord를 JSON 한 줄로 변환"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "ts": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(record.created))
+                  + f".{int(record.msecs):03d}",
+            "level": record.levelname,
+            "logger": record.name,
+        }
+        fields = getattr(record, "fields", None)
+        if fields is not None:
+            payload["event"] = record.msg
+            payload.update(fields)
+        else:
+            payload["message"] = record.getMessage()
+        if record.exc_info:
+            payload["exc"] = self.formatException(record.exc_info)
+        return json.dumps(payload, ensure_ascii=False, default=str)
+
+
+class TextFormatter(logging.Formatter):
+    """개발용 텍스트 포맷 (이벤트 필드는 key=value로 덧붙임)"""
+
+    def __init__(self):
+        super().__init__("%(asctime)s %(levelname)s %(name)s %(message)s")
+
+    def format(self, record: logging.LogRecord) -> str:
+        line = super().format(record)
+        fields = getattr(record, "fields", None)
+        if fields:
+            line += " " + " ".join(f"{key}={value}" for key, value in fields.items())
+        return line
+
+
+class _LazyQueueHandler(logging.handlers.QueueHandler):
+    """
+    포맷팅을 리스너 스레드로 미루는 QueueHandler
+
+    기본 QueueHandler.prepare()는 호출 스레드에서 메시지를 포맷하므로,
+    같은 프로세스 안에서만 쓰는 큐라는 점을 이용해 레코드를 그대로 넘깁니다.
+    """
+
+    def prepare(self, record):
+        return record
+
+
+def _build_formatter() -> logging.Formatter:
+    if LOG_FORMAT == "json":
+        return JsonFormatter()
+    return TextFormatter()
+
+
+def _attach_queue(logger: logging.Logger, *handlers: logging.Handler):
+    log_queue = queue.SimpleQueue()
+    logger.addHandler(_LazyQueueHandler(log_queue))
+    listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    _listeners.append(listener)
+
+
+def setup_logging():
+    """루트 로거와 감사 로거를 큐 기반으로 설정 (프로세스당 1회)"""
+    if _listeners:
+        return
+
+    root = logging.getLogger()
+    root.setLevel(LOG_LEVEL)
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(_build_formatter())
+    _attach_queue(root, stream_handler)
+
+    # 감사 로그는 샘플링/레벨과 무관하게 모두 별도 파일로 기록
+    audit_logger.setLevel(logging.INFO)
+    audit_logger.propagate = False
+    audit_handler = logging.FileHandler(AUDIT_LOG_FILE, encoding="utf-8")
+    audit_handler.setFormatter(JsonFormatter())
+    _attach_queue(audit_logger, audit_handler)
+
+    atexit.register(shutdown_logging)
+
+
+def shutdown_logging():
+    """큐에 남은 로그를 모두 내보내고 리스너 종료"""
+    while _listeners:
+        _listeners.pop().stop()
+
+
+def log_event(logger: logging.Logger, level: int, event: str, sampled: bool = False, **fields):
+    """
+    구조화 이벤트 기록
+
+    sampled=True인 고빈도 성공 이벤트는 LOG_SUCCESS_SAMPLE_RATE 비율만 기록되며,
+    레벨이 꺼져 있거나 샘플링에서 제외되면 LogRecord를 만들지 않습니다.
+    """
+    if not logger.isEnabledFor(level):
+        return
+    if sampled and LOG_SUCCESS_SAMPLE_RATE < 1.0 and random.random() >= LOG_SUCCESS_SAMPLE_RATE:
+        return
+    logger.log(level, event, extra={"fields": fields})
+
+
+def audit(event: str, **fields):
+    """감사 스트림에 이벤트 기록 (샘플링 없음)"""
+    audit_logger.info(event, extra={"fields": fields})
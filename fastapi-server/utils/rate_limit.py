@@ -0,0 +1,130 @@
+"""메모리 기반 요청 속도 제한 (sliding window counter)
+
+키(사용자/IP)마다 현재 창과 직전 창의 카운트만 저장하고,
+직전 창 카운트를 겹치는 비율만큼 더해 최근 window초 동안의 요청 수를 근사합니다.
+키당 메모리는 O(1)이며, 키 수가 RATE_LIMIT_MAX_KEYS를 넘으면 가장 오래 안 쓰인 키부터 버립니다.
+
+제한에 걸린 요청은 DB 연결을 열기 전에 429로 응답합니다.
+"""
+import math
+import threading
+import time
+from collections import OrderedDict
+
+from fastapi.responses import JSONResponse
+
+from config import (
+    RATE_LIMIT_ENABLED, RATE_LIMIT_MAX_KEYS,
+    RATE_LIMIT_WINDOW_SECONDS, RATE_LIMIT_USER_ACTIONS, RATE_LIMIT_IP_ACTIONS,
+    RATE_LIMIT_LOGIN_WINDOW_SECONDS, RATE_LIMIT_LOGIN_ATTEMPTS, RATE_LIMIT_LOGIN_IP
+)
+
+
+class SlidingWindowLimiter:
+    """키별 sliding window counter"""
+
+    def __init__(self, limit: int, window: float, max_keys: int = RATE_LIMIT_MAX_KEYS):
+        self.limit = limit
+        self.window = window
+        self.max_keys = max_keys
+        self._lock = threading.Lock()
+        self._counters = OrderedDict()  # key -> [현재 창 시작, 현재 창 카운트, 직전 창 카운트]
+        self.rejected = 0
+
+    def hit(self, key, now: float = None) -> float:
+        """
+        요청 1건 기록
+
+        허용되면 0, 제한에 걸리면 다시 시도할 수 있을 때까지의 초를 반환합니다.
+        제한에 걸린 요청은 카운트하지 않습니다.
+        """
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            counter = self._counters.get(key)
+            if counter is None:
+                counter = self._counters[key] = [now - now % self.window, 0, 0]
+                if len(self._counters) > self.max_keys:
+                    self._counters.popitem(last=False)
+            else:
+                self._counters.move_to_end(key)
+
+            # 창 이동 (두 창 이상 지났으면 직전 창도 비움)
+            elapsed_windows = int((now - counter[0]) // self.window)
+            if elapsed_windows >= 1:
+                counter[2] = counter[1] if elapsed_windows == 1 else 0
+                counter[1] = 0
+                counter[0] += elapsed_windows * self.window
+
+            overlap = 1 - (now - counter[0]) / self.window
+            estimated = counter[2] * overlap + counter[1]
+            if estimated + 1 > self.limit:
+                self.rejected += 1
+                # 직전 창의 가중치가 줄어 한 건이 들어갈 자리가 생기는 시점 (없으면 다음 창 시작)
+                if counter[2] and counter[1] + 1 <= self.limit:
+                    needed = 1 - (self.limit - counter[1] - 1) / counter[2]
+                    return max((needed - (1 - overlap)) * self.window, 0.001)
+                return counter[0] + self.window - now
+            counter[1] += 1
+            return 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"keys": len(self._counters), "rejected": self.rejected,
+                    "limit": self.limit, "window": self.window}
+
+
+# 예약/구매/취소 (REST + WebSocket 액션)
+_action_user = SlidingWindowLimiter(RATE_LIMIT_USER_ACTIONS, RATE_LIMIT_WINDOW_SECONDS)
+_action_ip = SlidingWindowLimiter(RATE_LIMIT_IP_ACTIONS, RATE_LIMIT_WINDOW_SECONDS)
+# 로그인 (비밀번호 대입 방지, scrypt 해싱 비용 보호)
+_login_user = SlidingWindowLimiter(RATE_LIMIT_LOGIN_ATTEMPTS, RATE_LIMIT_LOGIN_WINDOW_SECONDS)
+_login_ip = SlidingWindowLimiter(RATE_LIMIT_LOGIN_IP, RATE_LIMIT_LOGIN_WINDOW_SECONDS)
+
+
+def _check(ip_limiter, user_limiter, username, ip) -> float:
+    if not RATE_LIMIT_ENABLED:
+        return 0
+    retry_after = ip_limiter.hit(ip) if ip else 0
+    if not retry_after and username:
+        retry_after = user_limiter.hit(username)
+    return retry_after
+
+
+def client_ip(connection):
+    """요청/WebSocket의 클라이언트 IP (nginx 뒤에서는 uvicorn proxy_headers가 X-Forwarded-For 반영)"""
+    return connection.client.host if connection.client else None
+
+
+def check_action_limit(username, ip) -> float:
+    """예약/구매/취소 요청 제한 확인 (허용이면 0, 아니면 재시도까지 남은 초)"""
+    return _check(_action_ip, _action_user, username, ip)
+
+
+def check_login_limit(username, ip) -> float:
+    """로그인 시도 제한 확인 (허용이면 0, 아니면 재시도까지 남은 초)"""
+    return _check(_login_ip, _login_user, username, ip)
+
+
+def retry_after_seconds(retry_after: float) -> int:
+    """Retry-After 값 (정수 초, 최소 1)"""
+    return max(math.ceil(retry_after), 1)
+
+
+def rate_limited_response(retry_after: float) -> JSONResponse:
+    """429 응답 (Retry-After 헤더 포함)"""
+    seconds = retry_after_seconds(retry_after)
+    return JSONResponse(
+        status_code=429,
+        headers={"Retry-After": str(seconds)},
+        content={"success": False, "message": f"요청이 너무 많습니다. {seconds}초 후 다시 시도해 주세요"}
+    )
+
+
+def get_rate_limit_stats() -> dict:
+    """제한기별 키 수 / 거절 횟수"""
+    return {
+        "action_user": _action_user.stats(),
+        "action_ip": _action_ip.stats(),
+        "login_user": _login_user.stats(),
+        "login_ip": _login_ip.stats(),
+    }
@@ -0,0 +1,80 @@
+"""좌석 상태 바이너리 인코딩
+
+좌석마다 11개 키를 반복하는 JSON 대신
+- 정적 레이아웃(좌표/크기/번호)은 /api/seats/layout으로 한 번만 받고 (캐시 가능)
+- 상태는 좌석당 2비트로 묶은 상태 배열 + 예약자 id 목록만 바이너리로 전송합니다.
+
+바이너리 포맷 (little-endian):
+    [0]      uint8   포맷 버전 (1)
+    [1]      uint8   예약 (0)
+    [2:6]    uint32  레이아웃 id (레이아웃이 바뀌면 클라이언트가 다시 조회)
+    [6:10]   uint32  좌석 수 N
+    [10:..]  ceil(N/4) bytes  좌석 i의 상태 = (byte[i >> 2] >> ((i & 3) * 2)) & 0b11
+    [..]     uint32 x (available이 아닌 좌석 수)  좌석 순서대로 reserved_by (선점자 포함, 없으면 0)
+
+상태 코드: 0 = available, 1 = reserved, 2 = held (3은 예약)
+
+좌석 순서는 get_all_seats()의 정렬 순서(row_num, col_num)를 따르며 레이아웃과 동일합니다.
+레이아웃 id는 공연별 레이아웃 버전("layout:3")마다 한 번만 계산해 둡니다.
+static/js/seat_codec.js가 같은 포맷을 디코딩합니다.
+"""
+import struct
+import zlib
+
+from database.versions import get_version, scoped_name
+
+FORMAT_VERSION = 1
+HEADER = struct.Struct("<BBII")
+
+# 상태 코드 (2비트)
+STATUS_CODES = {"available": 0, "reserved": 1, "held": 2}
+
+LAYOUT_FIELDS = ("id", "seat_number", "row_num", "col_num", "x_pos", "y_pos", "width", "height")
+
+# 공연별 레이아웃 id 캐시: event_id -> (레이아웃 버전, 좌석 수, 레이아웃 id)
+_layout_ids = {}
+
+
+def build_layout(seats) -> dict:
+    """좌석 목록에서 정적 레이아웃과 레이아웃 id 생성"""
+    rows = [[seat[field] for field in LAYOUT_FIELDS] for seat in seats]
+    layout_id = zlib.crc32(repr(rows).encode())
+    return {"layout_id": layout_id, "fields": list(LAYOUT_FIELDS), "seats": rows}
+
+
+def layout_id_of(seats) -> int:
+    """build_layout()과 같은 레이아웃 id (레이아웃 전체를 만들지 않고 계산)"""
+    return zlib.crc32(repr([[seat[field] for field in LAYOUT_FIELDS] for seat in seats]).encode())
+
+
+def event_layout_id(event_id: int, seats) -> int:
+    """공연의 레이아웃 id (레이아웃 버전과 좌석 수가 같으면 캐시 사용)"""
+    key = (get_version(scoped_name("layout", event_id)), len(seats))
+    cached = _layout_ids.get(event_id)
+    if cached is not None and cached[:2] == key:
+        return cached[2]
+    layout_id = layout_id_of(seats)
+    _layout_ids[event_id] = key + (layout_id,)
+    return layout_id
+
+
+def encode_state(seats, event_id: int = None) -> bytes:
+    """좌석 상태를 바이너리 프레임으로 인코딩 (event_id를 주면 레이아웃 id를 캐시에서)"""
+    if event_id is None:
+        layout_id = layout_id_of(seats)
+    else:
+        layout_id = event_layout_id(event_id, seats)
+
+    count = len(seats)
+    packed = bytearray((count + 3) // 4)
+    owners = []
+    for i, seat in enumerate(seats):
+        code = STATUS_CODES.get(seat["status"], 1)
+        if code:
+            packed[i >> 2] |= code << ((i & 3) * 2)
+            owners.append(seat["reserved_by"] or 0)
+
+    return (HEADER.pack(FORMAT_VERSION, 0, layout_id, count)
+            + bytes(packed)
+            + struct.pack(f"<{len(owners)}I", *owners))
+
@@ -0,0 +1,222 @@
+"""좌석 공간 격자 인덱스 (뷰포트/타일 단위 좌석 조회)
+
+좌석 사각형(x_pos, y_pos, width, height)을 한 변이 SEAT_TILE_SIZE인 균일 격자 칸에 나눠 담고,
+화면 범위(뷰포트)나 타일과 겹치는 좌석만 찾습니다. 칸에 걸친 좌석은 겹치는 모든 칸에 들어가므로
+조회는 범위와 겹치는 칸만 훑고, 중복만 걸러냅니다.
+
+타일 좌표는 지도 타일과 같은 방식입니다.
+- 줌 z 타일의 한 변 = SEAT_TILE_SIZE * 2^(SEAT_TILE_MAX_ZOOM - z), 타일 (x, y)는 왼쪽 위부터
+- z == SEAT_TILE_MAX_ZOOM: 타일과 겹치는 좌석 (좌석 번호/좌표/상태)
+- z < SEAT_TILE_MAX_ZOOM: 좌석 대신 격자 칸별 (전체, 예약 가능) 좌석 수 (축소 화면의 개요)
+
+휴대폰에서 스타디움의 한 구역만 볼 때 전체 좌석 대신 화면에 걸친 타일 몇 개만 받게 되며,
+타일 API(/api/seats/tile)는 공연별 좌석/레이아웃 버전으로 ETag를 붙여 캐시됩니다 (utils.http_cache).
+
+좌석 상태는 utils.seat_index와 같은 방식으로 이 워커의 쓰기는 변경 리스너로 즉시,
+다른 워커의 쓰기는 버전 스냅샷 차이로 감지해 다음 조회 때 다시 적재합니다.
+"""
+import threading
+
+from config import SEAT_TILE_SIZE, SEAT_TILE_MAX_ZOOM
+from database.seats import get_all_seats
+from database.versions import get_version, scoped_name
+from utils.seat_index import EventSeatIndexes
+
+# 타일/뷰포트 응답의 좌석 행 필드 순서
+TILE_FIELDS = ("id", "seat_number", "row_num", "col_num", "x_pos", "y_pos", "width", "height",
+               "status", "reserved_by")
+
+_STATUS = TILE_FIELDS.index("status")
+_RESERVED_BY = TILE_FIELDS.index("reserved_by")
+
+
+def tile_bounds(z: int, x: int, y: int):
+    """타일의 좌표 범위 (x0, y0, x1, y1)"""
+    size = SEAT_TILE_SIZE << (SEAT_TILE_MAX_ZOOM - z)
+    return (x * size, y * size, (x + 1) * size, (y + 1) * size)
+
+
+class SeatGrid:
+    """한 공연 좌석의 균일 격자 인덱스 + 좌석 상태"""
+
+    def __init__(self, event_id: int, cell_size: int = SEAT_TILE_SIZE):
+        self.event_id = event_id
+        self.cell_size = cell_size
+        self._lock = threading.Lock()
+        self._rows = []       # TILE_FIELDS 순서의 좌석 행
+        self._positions = {}  # seat_id -> _rows 위치
+        self._cells = {}      # (칸 x, 칸 y) -> 칸과 겹치는 좌석 위치 목록
+        self._bounds = None
+        self._tiles = {}      # (z, x, y) -> 타일 응답 (좌석 상태가 바뀌면 비움)
+        self._version = None
+        self._layout_version = None
+
+    def load(self, seats, version: int = None, layout_version: int = None):
+        """좌석 목록(get_all_seats() 형식)으로 격자 전체를 다시 구성"""
+        size = self.cell_size
+        rows = []
+        positions = {}
+        cells = {}
+        for i, seat in enumerate(seats):
+            rows.append([seat[field] for field in TILE_FIELDS])
+            positions[seat["id"]] = i
+            x0, y0 = seat["x_pos"], seat["y_pos"]
+            x1, y1 = x0 + max(seat["width"], 1), y0 + max(seat["height"], 1)
+            for cx in range(x0 // size, (x1 - 1) // size + 1):
+                for cy in range(y0 // size, (y1 - 1) // size + 1):
+                    cells.setdefault((cx, cy), []).append(i)
+
+        bounds = None
+        if seats:
+            bounds = (min(seat["x_pos"] for seat in seats), min(seat["y_pos"] for seat in seats),
+                      max(seat["x_pos"] + seat["width"] for seat in seats),
+                      max(seat["y_pos"] + seat["height"] for seat in seats))
+
+        with self._lock:
+            self._rows = rows
+            self._positions = positions
+            self._cells = cells
+            self._bounds = bounds
+            self._tiles = {}
+            self._version = version
+            self._layout_version = layout_version
+
+    def ensure_fresh(self):
+        """버전 스냅샷이 격자와 다르면 (다른 워커의 쓰기 등) DB에서 다시 적재"""
+        version = get_version(scoped_name("seats", self.event_id))
+        layout_version = get_version(scoped_name("layout", self.event_id))
+        if self._version == version and self._layout_version == layout_version:
+            return
+        self.load(get_all_seats(self.event_id), version, layout_version)
+
+    def on_seats_changed(self, version: int, change: dict):
+        """database.versions 변경 리스너 - 이 워커의 쓰기를 증분 반영"""
+        with self._lock:
+            if change is None or self._version is None or version != self._version + 1:
+                # 변경분을 모르거나 사이에 다른 워커의 쓰기가 있었으면 다음 조회 때 다시 적재
+                return
+            owner = None if change["status"] == "available" else change.get("user_id")
+            for seat_id in change["seat_ids"]:
+                position = self._positions.get(seat_id)
+                if position is not None:
+                    self._rows[position][_STATUS] = change["status"]
+                    self._rows[position][_RESERVED_BY] = owner
+            self._tiles = {}
+            self._version = version
+
+    def _query(self, x0, y0, x1, y1):
+        """범위와 겹치는 좌석 위치 (좌석 순서대로, lock 안에서 호출)"""
+        if self._bounds is None:
+            return []
+        # 좌석이 있는 범위 밖의 칸은 훑지 않음 (아주 넓은 범위 요청 대비)
+        x0, y0 = max(x0, self._bounds[0]), max(y0, self._bounds[1])
+        x1, y1 = min(x1, self._bounds[2]), min(y1, self._bounds[3])
+        size = self.cell_size
+        found = set()
+        for cx in range(int(x0 // size), int((x1 - 1) // size) + 1):
+            for cy in range(int(y0 // size), int((y1 - 1) // size) + 1):
+                for i in self._cells.get((cx, cy), ()):
+                    row = self._rows[i]
+                    x, y = row[4], row[5]
+                    if x < x1 and x + row[6] > x0 and y < y1 and y + row[7] > y0:
+                        found.add(i)
+        return sorted(found)
+
+    def viewport(self, x0, y0, x1, y1, limit: int = None):
+        """
+        범위와 겹치는 좌석 행 목록
+
+        좌석이 limit개를 넘으면 None을 반환합니다 (클라이언트가 확대하거나 개요 타일을 쓰도록).
+        """
+        with self._lock:
+            positions = self._query(x0, y0, x1, y1)
+            if limit is not None and len(positions) > limit:
+                return None
+            return [list(self._rows[i]) for i in positions]
+
+    def changed_in(self, seat_ids, x0, y0, x1, y1):
+        """변경된 좌석 중 범위와 겹치는 좌석 행 목록 (뷰포트 구독자에게 보낼 변경분)"""
+        with self._lock:
+            rows = []
+            for seat_id in seat_ids:
+                position = self._positions.get(seat_id)
+                if position is None:
+                    continue
+                row = self._rows[position]
+                if row[4] < x1 and row[4] + row[6] > x0 and row[5] < y1 and row[5] + row[7] > y0:
+                    rows.append(list(row))
+            return rows
+
+    def tile(self, z: int, x: int, y: int) -> dict:
+        """타일 응답 (최대 줌이면 좌석, 아니면 격자 칸별 좌석 수)"""
+        key = (z, x, y)
+        with self._lock:
+            cached = self._tiles.get(key)
+            if cached is not None:
+                return cached
+
+            x0, y0, x1, y1 = bounds = tile_bounds(z, x, y)
+            tile = {"event_id": self.event_id, "z": z, "x": x, "y": y,
+                    "bounds": list(bounds), "version": self._version}
+            positions = self._query(*bounds)
+            if z >= SEAT_TILE_MAX_ZOOM:
+                tile["fields"] = list(TILE_FIELDS)
+                tile["seats"] = [list(self._rows[i]) for i in positions]
+            else:
+                # 좌석은 왼쪽 위 모서리가 있는 칸에서만 셈 (여러 칸/타일에 걸쳐도 한 번)
+                counts = {}
+                for i in positions:
+                    row = self._rows[i]
+                    if not (x0 <= row[4] < x1 and y0 <= row[5] < y1):
+                        continue
+                    cell = (row[4] // self.cell_size, row[5] // self.cell_size)
+                    count = counts.setdefault(cell, [0, 0])
+                    count[0] += 1
+                    if row[_STATUS] == "available":
+                        count[1] += 1
+                tile["cell_size"] = self.cell_size
+                tile["cells"] = [[cx, cy, total, available]
+                                 for (cx, cy), (total, available) in sorted(counts.items())]
+            if positions:
+                # 좌석이 없는 타일은 캐시하지 않음 (임의 좌표 요청으로 캐시가 커지지 않도록)
+                self._tiles[key] = tile
+            return tile
+
+    @property
+    def version(self):
+        """격자에 반영된 좌석 버전"""
+        return self._version
+
+    def meta(self) -> dict:
+        """클라이언트가 타일 범위를 계산하는 데 필요한 정보"""
+        with self._lock:
+            return {
+                "event_id": self.event_id,
+                "tile_size": self.cell_size,
+                "max_zoom": SEAT_TILE_MAX_ZOOM,
+                "bounds": list(self._bounds) if self._bounds else None,
+                "seat_count": len(self._rows),
+                "fields": list(TILE_FIELDS),
+            }
+
+    def summary(self) -> dict:
+        with self._lock:
+            return {"version": self._version, "seats": len(self._rows),
+                    "cells": len(self._cells), "cached_tiles": len(self._tiles)}
+
+    def is_empty(self) -> bool:
+        return not self._positions
+
+
+seat_grids = EventSeatIndexes(SeatGrid)
+
+
+def get_seat_grid_meta(event_id: int) -> dict:
+    """공연의 격자 정보 (좌석이 없으면 None)"""
+    grid = seat_grids.get(event_id)
+    return None if grid.is_empty() else grid.meta()
+
+
+def get_seat_tile(event_id: int, z: int, x: int, y: int) -> dict:
+    """공연의 타일 (인덱스가 오래됐으면 먼저 다시 적재)"""
+    return seat_grids.get(event_id).tile(z, x, y)
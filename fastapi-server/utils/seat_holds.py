@@ -0,0 +1,113 @@
+"""좌석 임시 선점(held) 만료 스케줄러
+
+선점 만료 시각을 최소 힙에 넣어 두고, 가장 이른 만료 시각까지만 잠들었다가
+만료된 항목만 꺼내 database.expire_holds()로 한 번에 해제합니다.
+DB 전체를 주기적으로 훑지 않으므로 처리 비용은 만료된 선점 수에 비례합니다 (O(k log n)).
+
+- 새 선점/연장은 database.versions 변경 리스너로 등록됩니다 (모든 공연, status == "held").
+- 확정/취소/연장으로 무효가 된 힙 항목은 지우지 않고 expire_holds()의 조건에서 걸러냅니다.
+- 워커 시작 시 DB의 선점 목록으로 힙을 복구하므로, 선점한 워커가 재시작돼도 만료됩니다.
+  여러 워커가 같은 좌석을 해제하려 해도 조건부 UPDATE라 한 번만 해제됩니다.
+"""
+import asyncio
+import heapq
+import logging
+import threading
+import time
+from datetime import datetime, timedelta
+
+from starlette.concurrency import run_in_threadpool
+
+from config import SEAT_HOLD_EXPIRY_BATCH
+from database.seats import expire_holds
+from database.versions import add_change_listener
+
+logger = logging.getLogger(__name__)
+
+# DB 오류로 해제하지 못한 선점의 재시도 간격 (초)
+RETRY_DELAY_SECONDS = 1
+
+
+class HoldScheduler:
+    """선점 만료 시각 최소 힙 + 만료 처리 루프"""
+
+    def __init__(self):
+        self._heap = []  # (만료 시각 epoch 초, seat_id)
+        self._lock = threading.Lock()
+        self._loop = None
+        self._wakeup = None
+
+    def schedule(self, seat_id: int, held_until):
+        """선점 만료 예약 (held_until: datetime)"""
+        expires_at = held_until.timestamp()
+        with self._lock:
+            heapq.heappush(self._heap, (expires_at, seat_id))
+            earliest = self._heap[0][0] == expires_at
+        # 가장 이른 만료가 바뀌었으면 대기 중인 루프를 깨워 타이머 재설정
+        if earliest and self._loop is not None:
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+
+    def load(self, holds):
+        """DB의 선점 목록 [(seat_id, held_until), ...]으로 힙 복구"""
+        for seat_id, held_until in holds:
+            if held_until is not None:
+                self.schedule(seat_id, held_until)
+
+    def on_seats_changed(self, version: int, change: dict):
+        """database.versions 변경 리스너 - 이 워커에서 생긴 선점 등록"""
+        if change and change["status"] == "held":
+            for seat_id in change["seat_ids"]:
+                self.schedule(seat_id, change["held_until"])
+
+    def pop_due(self, now: float, limit: int):
+        """만료 시각이 지난 좌석 id를 최대 limit개 꺼냄"""
+        due = []
+        with self._lock:
+            while self._heap and self._heap[0][0] <= now and len(due) < limit:
+                due.append(heapq.heappop(self._heap)[1])
+        return due
+
+    def next_delay(self):
+        """다음 만료까지 남은 초 (선점이 없으면 None)"""
+        with self._lock:
+            if not self._heap:
+                return None
+            return max(self._heap[0][0] - time.time(), 0)
+
+    def pending(self) -> int:
+        return len(self._heap)
+
+    async def run(self, on_expired):
+        """
+        만료 처리 루프 (워커 lifespan 동안 실행)
+
+        on_expired(event_id, seat_ids)는 공연별로 실제로 해제된 좌석 id 목록과 함께 호출되는 코루틴 함수입니다.
+        """
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.next_delay())
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+            due = self.pop_due(time.time(), SEAT_HOLD_EXPIRY_BATCH)
+            while due:
+                released = await run_in_threadpool(expire_holds, due)
+                if released is None:
+                    retry_at = datetime.now() + timedelta(seconds=RETRY_DELAY_SECONDS)
+                    for seat_id in due:
+                        self.schedule(seat_id, retry_at)
+                    break
+                for event_id, seat_ids in released.items():
+                    logger.info("expired %d seat holds (event %s)", len(seat_ids), event_id)
+                    try:
+                        await on_expired(event_id, seat_ids)
+                    except Exception as e:
+                        logger.warning("hold expiry broadcast failed: %s", e)
+                due = self.pop_due(time.time(), SEAT_HOLD_EXPIRY_BATCH)
+
+
+hold_scheduler = HoldScheduler()
+add_change_listener("seats", hold_scheduler.on_seats_changed)
@@ -0,0 +1,341 @@
+"""좌석 예약 가능 여부 비트셋 인덱스
+
+행(row_num)마다 좌석을 x 좌표 순으로 정렬해 위치 i를 부여하고, 두 개의 정수 비트셋을 둡니다.
+- free: 위치 i 좌석이 예약 가능하면 비트 i = 1
+- adjacent: 위치 i와 i+1 좌석이 통로 없이 붙어 있으면 비트 i = 1
+
+블록은 좌석 사이 가로 간격이 좌석 너비보다 넓은 곳(통로)을 경계로 나눕니다.
+init_sample_seats() 기준으로 행마다 2석짜리 블록 5개가 만들어집니다.
+
+N석 연속 검색은 행마다 비트 연산 N번으로 끝나므로 좌석 목록 전체를 훑지 않습니다.
+단체 예매(allocate_group)는 좌석별 품질 점수(가운데/앞쪽일수록 높음)의 구간 합으로
+후보를 고른 뒤 database.reserve_seats_group()으로 한 번에 예약합니다.
+이 워커의 예약/취소는 database.versions 변경 리스너로 즉시 반영하고,
+다른 워커의 쓰기는 버전 스냅샷 차이로 감지해 다음 조회 때 다시 적재합니다.
+
+인덱스는 공연마다 따로 두고 (EventSeatIndexes) 처음 조회된 공연만 적재하며,
+공연별 버전("seats:3")을 보므로 다른 공연의 예약으로 다시 적재되지 않습니다.
+"""
+import threading
+
+from config import GROUP_ALLOCATION_ATTEMPTS
+from database.seats import get_all_seats, reserve_seats_group
+from database.versions import add_change_listener, get_version, scoped_name
+
+# 좌석 사이 간격이 좌석 너비 x 이 비율보다 넓으면 통로로 간주
+AISLE_GAP_RATIO = 1.0
+
+# 좌석 품질 점수 가중치 (가로 중앙 / 앞쪽 행) 와 통로를 사이에 둔 경우의 감점
+CENTER_WEIGHT = 0.6
+FRONT_WEIGHT = 0.4
+AISLE_PENALTY = 0.25
+
+
+def _runs(free: int, adjacent: int, count: int) -> int:
+    """count석 연속 빈자리가 시작되는 위치의 비트셋"""
+    starts = free
+    for k in range(1, count):
+        starts &= (free >> k) & (adjacent >> (k - 1))
+    return starts
+
+
+class _Row:
+    """한 행의 좌석 배치와 비트셋"""
+    __slots__ = ("row_num", "seats", "blocks", "block_masks", "adjacent", "free", "quality_sums")
+
+    def __init__(self, row_num: int, seats, quality):
+        self.row_num = row_num
+        self.seats = seats
+        self.blocks = []
+        self.adjacent = 0
+        self.free = 0
+        # 구간 품질 합을 O(1)로 구하기 위한 누적 합
+        self.quality_sums = [0.0]
+        for seat in seats:
+            self.quality_sums.append(self.quality_sums[-1] + quality(seat))
+
+        block = 1
+        for i, seat in enumerate(seats):
+            if i > 0:
+                prev = seats[i - 1]
+                gap = seat["x_pos"] - (prev["x_pos"] + prev["width"])
+                if gap > prev["width"] * AISLE_GAP_RATIO:
+                    block += 1
+                else:
+                    self.adjacent |= 1 << (i - 1)
+            self.blocks.append(block)
+            if seat["status"] == "available":
+                self.free |= 1 << i
+
+        self.block_masks = {}
+        for i, block in enumerate(self.blocks):
+            self.block_masks[block] = self.block_masks.get(block, 0) | (1 << i)
+
+
+class SeatIndex:
+    """한 공연의 행별 비트셋 기반 예약 가능 좌석 인덱스"""
+
+    def __init__(self, event_id: int):
+        self.event_id = event_id
+        self._lock = threading.Lock()
+        self._rows = {}
+        self._positions = {}  # seat_id -> (row_num, 위치)
+        self._version = None
+        self._layout_version = None
+
+    def load(self, seats, version: int = None, layout_version: int = None):
+        """좌석 목록(get_all_seats() 형식)으로 인덱스 전체를 다시 구성"""
+        by_row = {}
+        for seat in seats:
+            by_row.setdefault(seat["row_num"], []).append(seat)
+
+        # 좌석 품질: 공연장 가로 중앙에 가깝고 앞 행일수록 1에 가까움
+        if seats:
+            left = min(seat["x_pos"] for seat in seats)
+            right = max(seat["x_pos"] + seat["width"] for seat in seats)
+        else:
+            left, right = 0, 1
+        center, half_width = (left + right) / 2, max((right - left) / 2, 1)
+        row_rank = {row_num: rank for rank, row_num in enumerate(sorted(by_row))}
+        row_span = max(len(row_rank) - 1, 1)
+
+        def quality(seat):
+            off_center = abs(seat["x_pos"] + seat["width"] / 2 - center) / half_width
+            depth = row_rank[seat["row_num"]] / row_span
+            return CENTER_WEIGHT * (1 - off_center) + FRONT_WEIGHT * (1 - depth)
+
+        rows = {}
+        positions = {}
+        for row_num, row_seats in by_row.items():
+            row_seats.sort(key=lambda seat: (seat["x_pos"], seat["col_num"]))
+            rows[row_num] = _Row(row_num, row_seats, quality)
+            for i, seat in enumerate(row_seats):
+                positions[seat["id"]] = (row_num, i)
+
+        with self._lock:
+            self._rows = rows
+            self._positions = positions
+            self._version = version
+            self._layout_version = layout_version
+
+    def ensure_fresh(self):
+        """버전 스냅샷이 인덱스와 다르면 (다른 워커의 쓰기 등) DB에서 다시 적재"""
+        version = get_version(scoped_name("seats", self.event_id))
+        layout_version = get_version(scoped_name("layout", self.event_id))
+        if self._version == version and self._layout_version == layout_version:
+            return
+        # 버전을 먼저 읽어야 적재 도중의 쓰기를 놓치지 않음 (다음 조회 때 다시 적재)
+        self.load(get_all_seats(self.event_id), version, layout_version)
+
+    def apply(self, seat_ids, available: bool):
+        """좌석 상태 변경을 비트셋에 반영"""
+        with self._lock:
+            for seat_id in seat_ids:
+                position = self._positions.get(seat_id)
+                if position is None:
+                    continue
+                row = self._rows[position[0]]
+                if available:
+                    row.free |= 1 << position[1]
+                else:
+                    row.free &= ~(1 << position[1])
+
+    def on_seats_changed(self, version: int, change: dict):
+        """database.versions 변경 리스너 - 이 워커의 쓰기를 증분 반영"""
+        with self._lock:
+            in_sequence = self._version is not None and version == self._version + 1
+        if change is None or not in_sequence:
+            # 변경분을 모르거나 사이에 다른 워커의 쓰기가 있었으면 다음 조회 때 다시 적재
+            return
+        self.apply(change["seat_ids"], change["status"] == "available")
+        with self._lock:
+            self._version = version
+
+    def is_available(self, seat_id: int) -> bool:
+        position = self._positions.get(seat_id)
+        if position is None:
+            return False
+        return bool(self._rows[position[0]].free >> position[1] & 1)
+
+    def find_adjacent(self, count: int, row: int = None, block: int = None, limit: int = 10):
+        """
+        count석 연속 빈자리 검색
+
+        row/block을 주면 해당 행/블록 안에서만 찾습니다. 블록 번호는 행 안에서 왼쪽부터 1, 2, ...
+        이며 block만 주면 모든 행의 같은 번호 블록에서 찾습니다.
+        한 행에서 겹치지 않는 후보만, 행 번호 -> 왼쪽부터 순서로 최대 limit개 반환합니다.
+        """
+        if count < 1:
+            return []
+
+        with self._lock:
+            rows = self._rows
+            if row is not None:
+                rows = {row: rows[row]} if row in rows else {}
+
+            results = []
+            for row_num in sorted(rows):
+                current = rows[row_num]
+                free = current.free
+                if block is not None:
+                    free &= current.block_masks.get(block, 0)
+                starts = _runs(free, current.adjacent, count)
+
+                while starts and len(results) < limit:
+                    start = (starts & -starts).bit_length() - 1
+                    seats = current.seats[start:start + count]
+                    results.append({
+                        "row": row_num,
+                        "block": current.blocks[start],
+                        "seat_ids": [seat["id"] for seat in seats],
+                        "seat_numbers": [seat["seat_number"] for seat in seats],
+                    })
+                    # 겹치는 후보 제외
+                    starts &= ~((1 << (start + count)) - 1)
+
+                if len(results) >= limit:
+                    break
+            return results
+
+    def best_available(self, count: int, row_from: int = None, row_to: int = None,
+                       block: int = None, allow_split: bool = True, limit: int = 1):
+        """
+        단체 예매용 최적 좌석 후보 (점수 내림차순)
+
+        같은 행의 연속된 빈자리만 후보로 삼고, 점수는 좌석 품질 평균입니다.
+        allow_split이면 통로를 사이에 둔 자리도 허용하되 통로 하나마다 AISLE_PENALTY만큼 감점합니다.
+        """
+        if count < 1:
+            return []
+
+        candidates = []
+        with self._lock:
+            for row_num, current in self._rows.items():
+                if (row_from is not None and row_num < row_from) or (row_to is not None and row_num > row_to):
+                    continue
+                free = current.free
+                if block is not None:
+                    free &= current.block_masks.get(block, 0)
+                adjacent = (1 << len(current.seats)) - 1 if allow_split else current.adjacent
+                starts = _runs(free, adjacent, count)
+
+                window = (1 << (count - 1)) - 1
+                while starts:
+                    start = (starts & -starts).bit_length() - 1
+                    starts &= starts - 1
+                    aisles = count - 1 - bin((current.adjacent >> start) & window).count("1")
+                    quality = (current.quality_sums[start + count] - current.quality_sums[start]) / count
+                    candidates.append((quality - AISLE_PENALTY * aisles, row_num, start, aisles))
+
+            candidates.sort(key=lambda candidate: (-candidate[0], candidate[1], candidate[2]))
+            results = []
+            for score, row_num, start, aisles in candidates[:limit]:
+                current = self._rows[row_num]
+                seats = current.seats[start:start + count]
+                results.append({
+                    "row": row_num,
+                    "block": current.blocks[start],
+                    "seat_ids": [seat["id"] for seat in seats],
+                    "seat_numbers": [seat["seat_number"] for seat in seats],
+                    "score": round(score, 4),
+                    "aisles": aisles,
+                })
+            return results
+
+    def summary(self) -> dict:
+        """행별 남은 좌석 수"""
+        with self._lock:
+            return {
+                "version": self._version,
+                "rows": {row_num: bin(row.free).count("1") for row_num, row in sorted(self._rows.items())},
+            }
+
+    def block_occupancy(self):
+        """행/블록별 전체 / 남은 좌석 수 (블록은 DB에 없는 배치 정보라 점유 카운터 대신 비트셋으로 계산)"""
+        with self._lock:
+            return [
+                {"row_num": row_num, "block": block, "total": bin(mask).count("1"),
+                 "available": bin(row.free & mask).count("1")}
+                for row_num, row in sorted(self._rows.items())
+                for block, mask in sorted(row.block_masks.items())
+            ]
+
+    def is_empty(self) -> bool:
+        return not self._positions
+
+
+class EventSeatIndexes:
+    """
+    공연별 인덱스 모음 (조회된 공연만 적재)
+
+    factory(event_id)로 만드는 인덱스는 ensure_fresh / on_seats_changed / is_empty / summary를
+    구현해야 합니다 (SeatIndex, utils.seat_grid.SeatGrid).
+    """
+
+    def __init__(self, factory=SeatIndex):
+        self._factory = factory
+        self._lock = threading.Lock()
+        self._indexes = {}
+
+    def get(self, event_id: int):
+        """
+        공연의 최신 인덱스 (처음이면 적재 후 변경 리스너 등록)
+
+        좌석이 없는 공연(존재하지 않는 event_id 등)의 인덱스는 보관하지 않습니다.
+        """
+        index = self._indexes.get(event_id)
+        if index is not None:
+            index.ensure_fresh()
+            return index
+
+        index = self._factory(event_id)
+        index.ensure_fresh()
+        if index.is_empty():
+            return index
+        with self._lock:
+            if event_id in self._indexes:
+                return self._indexes[event_id]
+            self._indexes[event_id] = index
+        add_change_listener(scoped_name("seats", event_id), index.on_seats_changed)
+        return index
+
+    def summary(self) -> dict:
+        """공연별 인덱스 요약"""
+        return {event_id: index.summary() for event_id, index in list(self._indexes.items())}
+
+
+availability_index = EventSeatIndexes()
+
+
+def find_adjacent_seats(event_id: int, count: int, row: int = None, block: int = None, limit: int = 10):
+    """공연의 연속 빈자리 검색 (인덱스가 오래됐으면 먼저 다시 적재)"""
+    return availability_index.get(event_id).find_adjacent(count, row=row, block=block, limit=limit)
+
+
+def allocate_group(user_id: int, event_id: int, count: int, row_from: int = None, row_to: int = None,
+                   block: int = None, allow_split: bool = True):
+    """
+    최적 좌석 자동 배정 + 일괄 예약
+
+    점수 상위 후보부터 reserve_seats_group()으로 예약을 시도하고, 다른 요청에 선점된 좌석이
+    있으면 인덱스에 반영한 뒤 다음 후보로 넘어갑니다 (최대 GROUP_ALLOCATION_ATTEMPTS회).
+    """
+    index = availability_index.get(event_id)
+    tried = set()
+    for _ in range(GROUP_ALLOCATION_ATTEMPTS):
+        candidates = index.best_available(count, row_from=row_from, row_to=row_to, block=block,
+                                          allow_split=allow_split, limit=len(tried) + 1)
+        candidates = [c for c in candidates if tuple(c["seat_ids"]) not in tried]
+        if not candidates:
+            break
+        candidate = candidates[0]
+        tried.add(tuple(candidate["seat_ids"]))
+
+        result = reserve_seats_group(user_id, candidate["seat_ids"], event_id)
+        if result["success"]:
+            return dict(result, seats=candidate)
+        if not result.get("unavailable_seat_ids"):
+            return result
+        index.apply(result["unavailable_seat_ids"], available=False)
+
+    return {"success": False, "message": "조건에 맞는 연속 좌석이 없습니다"}
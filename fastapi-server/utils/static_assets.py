@@ -0,0 +1,191 @@
+"""정적 파일 파이프라인 - 지문(content hash) + 사전 압축 + immutable 캐시
+
+build_static_assets()가 STATIC_DIR의 파일을 STATIC_BUILD_DIR로 복사하면서
+- 내용 해시가 들어간 이름(seats.png -> seats.3fa2b1c9d0.png)을 추가로 만들고
+- 텍스트 계열 파일은 .gz (brotli 패키지가 있으면 .br도) 압축본을 미리 생성합니다.
+  brotli는 선택 의존성이며, 없으면 .gz만 만들고 br 요청에도 gzip으로 응답합니다.
+
+템플릿은 asset_url('seats.png')로 지문 이름을 참조하고,
+PrecompressedStaticFiles가 Accept-Encoding에 맞는 압축본을 그대로 전송합니다.
+
+빌드(파일 기록)는 워커를 띄우기 전에 한 번만 하고 (main.prepare()),
+워커는 load_static_manifest()로 지문 이름 목록만 계산합니다.
+"""
+import gzip
+import hashlib
+import logging
+import mimetypes
+import os
+
+from starlette.datastructures import Headers
+from starlette.staticfiles import StaticFiles
+
+from config import STATIC_DIR, STATIC_BUILD_DIR
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+COMPRESSIBLE_EXTENSIONS = {".css", ".js", ".mjs", ".json", ".svg", ".html", ".txt", ".map", ".xml"}
+MIN_COMPRESS_SIZE = 512
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+# 논리 이름 -> 지문 이름 (예: "css/seats.css" -> "css/seats.1a2b3c4d5e.css")
+_manifest = {}
+_fingerprinted = set()
+
+
+def _write_atomic(path: str, data: bytes):
+    """여러 워커가 동시에 빌드해도 깨진 파일이 보이지 않도록 임시 파일 후 교체"""
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def _emit(rel_path: str, data: bytes, immutable: bool):
+    """
+    빌드 디렉터리에 원본 + 압축본 기록
+
+    지문 이름(immutable)은 내용이 이름에 고정되므로 이미 있으면 스킵하고,
+    원래 이름은 내용이 바뀌었을 때만 다시 기록합니다.
+    """
+    target = os.path.join(STATIC_BUILD_DIR, rel_path)
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    changed = not os.path.exists(target)
+    if not changed and not immutable:
+        with open(target, "rb") as f:
+            changed = f.read() != data
+    if changed:
+        _write_atomic(target, data)
+
+    ext = os.path.splitext(rel_path)[1].lower()
+    if ext not in COMPRESSIBLE_EXTENSIONS or len(data) < MIN_COMPRESS_SIZE:
+        return
+    if changed or not os.path.exists(target + ".gz"):
+        _write_atomic(target + ".gz", gzip.compress(data, compresslevel=9, mtime=0))
+    if brotli is not None and (changed or not os.path.exists(target + ".br")):
+        _write_atomic(target + ".br", brotli.compress(data, quality=11))
+
+
+def _scan(emit: bool) -> int:
+    """STATIC_DIR을 훑어 지문 이름 목록을 만들고, emit이면 빌드 디렉터리에 기록"""
+    _manifest.clear()
+    _fingerprinted.clear()
+    if not os.path.isdir(STATIC_DIR):
+        if emit:
+            os.makedirs(STATIC_BUILD_DIR, exist_ok=True)
+        return 0
+
+    for root, _, files in os.walk(STATIC_DIR):
+        for filename in files:
+            source = os.path.join(root, filename)
+            rel_path = os.path.relpath(source, STATIC_DIR).replace(os.sep, "/")
+            with open(source, "rb") as f:
+                data = f.read()
+
+            digest = hashlib.sha256(data).hexdigest()[:10]
+            stem, ext = os.path.splitext(rel_path)
+            hashed_path = f"{stem}.{digest}{ext}"
+
+            if emit:
+                _emit(rel_path, data, immutable=False)
+                _emit(hashed_path, data, immutable=True)
+            _manifest[rel_path] = hashed_path
+            _fingerprinted.add(hashed_path)
+    return len(_manifest)
+
+
+def build_static_assets() -> int:
+    """STATIC_DIR 전체를 지문/압축 처리해 STATIC_BUILD_DIR에 기록 (워커 시작 전 1회)"""
+    count = _scan(emit=True)
+    logger.info("static assets built: %d files (brotli=%s)", count, brotli is not None)
+    return count
+
+
+def load_static_manifest() -> int:
+    """파일을 쓰지 않고 지문 이름 목록만 계산 (워커용, 빌드는 build_static_assets()가 미리 수행)"""
+    return _scan(emit=False)
+
+
+def _media_type(path: str) -> str:
+    """압축본 대신 원본 파일 기준 Content-Type"""
+    media_type = mimetypes.guess_type(path)[0] or "application/octet-stream"
+    if media_type.startswith("text/"):
+        media_type += "; charset=utf-8"
+    return media_type
+
+
+def _accepted_encodings(header: str) -> dict:
+    """
+    Accept-Encoding 헤더를 {토큰: q값}으로 파싱 (예: "br;q=0, gzip" -> {"br": 0.0, "gzip": 1.0})
+
+    q값이 잘못된 항목은 0으로 취급합니다.
+    """
+    accepted = {}
+    for part in header.split(","):
+        token, _, params = part.partition(";")
+        token = token.strip().lower()
+        if not token:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value.strip())
+                except ValueError:
+                    q = 0.0
+        accepted[token] = q
+    return accepted
+
+
+def _preferred_encodings(header: str) -> list:
+    """사전 압축본 중 클라이언트가 허용(q > 0)하는 인코딩을 q값 높은 순으로 (같으면 br 우선)"""
+    accepted = _accepted_encodings(header)
+    wildcard = accepted.get("*", 0.0)
+    candidates = []
+    for rank, (encoding, suffix) in enumerate((("br", ".br"), ("gzip", ".gz"))):
+        q = accepted.get(encoding, wildcard)
+        if q > 0:
+            candidates.append((-q, rank, encoding, suffix))
+    return [(encoding, suffix) for _, _, encoding, suffix in sorted(candidates)]
+
+
+def asset_url(path: str, fallback: str = None) -> str:
+    """템플릿용 - 지문 이름의 /static URL (빌드에 없으면 fallback 또는 원래 경로)"""
+    hashed = _manifest.get(path)
+    if hashed is not None:
+        return f"/static/{hashed}"
+    return fallback or f"/static/{path}"
+
+
+class PrecompressedStaticFiles(StaticFiles):
+    """사전 압축본(.br/.gz)을 우선 전송하고, 지문 파일에는 immutable 캐시 헤더를 붙이는 StaticFiles"""
+
+    async def get_response(self, path: str, scope):
+        rel_path = path.replace(os.sep, "/")
+        accept_encoding = Headers(scope=scope).get("accept-encoding", "")
+
+        response = None
+        for encoding, suffix in _preferred_encodings(accept_encoding):
+            full_path, stat_result = self.lookup_path(path + suffix)
+            if stat_result is None:
+                continue
+            response = self.file_response(full_path, stat_result, scope)
+            if response.status_code == 200:
+                response.headers["content-type"] = _media_type(path)
+                response.headers["content-encoding"] = encoding
+            break
+
+        if response is None:
+            response = await super().get_response(path, scope)
+
+        if response.status_code in (200, 304):
+            response.headers["vary"] = "Accept-Encoding"
+            if rel_path in _fingerprinted:
+                response.headers["cache-control"] = IMMUTABLE_CACHE_CONTROL
+        return response
@@ -0,0 +1,75 @@
+"""공유 Jinja2 템플릿 환경
+
+- 모든 라우트가 하나의 Environment를 공유 (템플릿 컴파일 결과 재사용)
+- 바이트코드 캐시 + 시작 시 전체 템플릿 사전 컴파일
+- 요청과 무관한 페이지(회원가입/로그인)는 렌더링 결과 전체를 캐시
+- 데이터 버전 기반 조각(fragment) 캐시
+"""
+import os
+import threading
+
+from fastapi.responses import HTMLResponse
+from fastapi.templating import Jinja2Templates
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader
+
+from config import TEMPLATES_DIR, TEMPLATE_CACHE_DIR, SERVER_MODE
+from .static_assets import asset_url
+
+os.makedirs(TEMPLATE_CACHE_DIR, exist_ok=True)
+
+env = Environment(
+    loader=FileSystemLoader(TEMPLATES_DIR),
+    autoescape=True,
+    bytecode_cache=FileSystemBytecodeCache(TEMPLATE_CACHE_DIR),
+    # 운영 모드에서는 템플릿 파일 변경 확인(stat)을 생략
+    auto_reload=SERVER_MODE == "dev",
+    cache_size=-1,
+)
+env.globals["asset_url"] = asset_url
+templates = Jinja2Templates(env=env)
+
+_pages = {}
+_fragments = {}
+_fragments_lock = threading.Lock()
+
+
+def precompile_templates() -> int:
+    """모든 템플릿을 미리 컴파일해 메모리/바이트코드 캐시에 올림"""
+    names = env.list_templates(extensions=["html"])
+    for name in names:
+        env.get_template(name)
+    return len(names)
+
+
+def render_static_page(name: str) -> HTMLResponse:
+    """요청 컨텍스트가 필요 없는 페이지를 한 번만 렌더링하고 재사용"""
+    body = _pages.get(name)
+    if body is None:
+        body = _pages[name] = env.get_template(name).render().encode("utf-8")
+    return HTMLResponse(content=body)
+
+
+def get_fragment(name: str, version: int, variant, render) -> str:
+    """
+    조각 캐시 조회
+
+    (name, variant)마다 가장 최근 version의 렌더링 결과만 보관합니다.
+    캐시 미스일 때만 render()를 호출하므로, 데이터 조회도 render 안에서 하면
+    버전이 바뀌지 않는 동안에는 DB를 조회하지 않습니다.
+    """
+    key = (name, variant)
+    cached = _fragments.get(key)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+
+    html = render()
+    with _fragments_lock:
+        current = _fragments.get(key)
+        if current is None or current[0] <= version:
+            _fragments[key] = (version, html)
+    return html
+
+
+def render_fragment(name: str, **context) -> str:
+    """조각 템플릿 렌더링"""
+    return env.get_template(name).render(**context)
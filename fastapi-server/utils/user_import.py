@@ -0,0 +1,26 @@
+"""사용자 대량 생성 입력 (CSV 파일 / 규칙 기반 생성기)
+
+두 입력 모두 (username, password)를 하나씩 내보내는 제너레이터라서
+database.bulk_create_users()가 배치 단위로 읽어 가며, 100만 명도 한꺼번에 메모리에 올리지 않습니다.
+"""
+import csv
+
+
+def iter_csv_users(lines):
+    """
+    CSV 줄 -> (username, password)
+
+    첫 줄이 username,password 헤더면 건너뛰고, 빈 줄과 열이 모자란 줄은 무시합니다.
+    """
+    reader = csv.reader(lines)
+    for i, row in enumerate(reader):
+        if i == 0 and [value.strip().lower() for value in row[:2]] == ["username", "password"]:
+            continue
+        if len(row) >= 2 and row[0].strip():
+            yield row[0].strip(), row[1]
+
+
+def generate_users(prefix: str, count: int, start: int = 1, password: str = "1234"):
+    """prefix{start} ~ prefix{start + count - 1} 사용자 (모두 같은 비밀번호, 동시성 테스트 계정용)"""
+    for i in range(start, start + count):
+        yield f"{prefix}{i}", password
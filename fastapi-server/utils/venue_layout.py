@@ -0,0 +1,147 @@
+"""공연장 좌석 배치 생성기 (선언형 스펙 -> 좌석 목록)
+
+구역(section)마다 행 수 / 행당 좌석 수 / 통로 간격 / 곡률을 적으면
+좌표가 계산된 좌석을 생성합니다. 최대 MAX_VENUE_SEATS석까지 지원하며,
+좌석은 제너레이터로 하나씩 만들어 database.create_event()의 대량 적재로 바로 흘려 보냅니다.
+
+스펙 예시 (JSON):
+    {
+        "seat_width": 10, "seat_height": 10, "seat_gap": 2, "row_gap": 4,
+        "sections": [
+            {"name": "A", "x": 0, "y": 0, "rows": 40, "seats_per_row": 50,
+             "row_increment": 1, "aisle_every": 10, "aisle_width": 16, "curvature": 0.2}
+        ]
+    }
+
+- seat_width/height/gap, row_gap, aisle_*, curvature는 구역마다 덮어쓸 수 있습니다.
+- row_increment: 뒷줄로 갈수록 늘어나는 좌석 수 (부채꼴 배치, 행은 가운데 정렬)
+- aisle_every: 이 좌석 수마다 aisle_width 너비의 통로 (utils.seat_index가 블록 경계로 인식)
+- curvature: 0이면 직선, 클수록 행 가운데가 뒤로 밀려 무대를 감싸는 호 모양
+
+row_num은 구역을 이어서 공연장 전체에서 유일하게 매기므로 (한 행 = 한 구역의 한 줄)
+빈자리 인덱스가 서로 다른 구역의 좌석을 같은 행으로 묶지 않습니다.
+"""
+import re
+
+# 공연장 하나의 최대 좌석 수
+MAX_VENUE_SEATS = 100_000
+
+# seats.seat_number VARCHAR(10)
+SEAT_NUMBER_MAX_LENGTH = 10
+
+_SECTION_NAME = re.compile(r"^[A-Za-z0-9]{1,4}$")
+
+DEFAULTS = {
+    "seat_width": 10,
+    "seat_height": 10,
+    "seat_gap": 2,
+    "row_gap": 4,
+    "row_increment": 0,
+    "aisle_every": 0,
+    "aisle_width": 16,
+    "curvature": 0.0,
+}
+
+
+def _tiers(names, tiers: int, columns: int, rows: int, seats_per_row: int, **options) -> dict:
+    """같은 크기의 구역을 columns개씩 tiers층으로 배치한 스펙"""
+    pitch = options.get("seat_width", DEFAULTS["seat_width"]) + options.get("seat_gap", DEFAULTS["seat_gap"])
+    row_pitch = options.get("seat_height", DEFAULTS["seat_height"]) + options.get("row_gap", DEFAULTS["row_gap"])
+    section_width = (seats_per_row + rows * options.get("row_increment", 0)) * pitch * 1.2
+    section_depth = rows * row_pitch * 1.2 + section_width * options.get("curvature", 0)
+    sections = []
+    for i, name in enumerate(names[:tiers * columns]):
+        sections.append(dict(options, name=name, rows=rows, seats_per_row=seats_per_row,
+                             x=round((i % columns) * section_width), y=round((i // columns) * section_depth)))
+    return {"sections": sections}
+
+
+# 성능 테스트용 기본 공연장
+PRESETS = {
+    # 소극장: 1구역 20행 x 25석 = 500석
+    "theater": _tiers(["A"], 1, 1, 20, 25, aisle_every=5, curvature=0.1),
+    # 아레나: 8구역 x 50행 x (40~89석) = 25,800석
+    "arena": _tiers(list("ABCDEFGH"), 2, 4, 50, 40, row_increment=1, aisle_every=10, curvature=0.15),
+    # 스타디움: 10구역 x 100행 x 100석 = 100,000석
+    "stadium": _tiers(list("ABCDEFGHIJ"), 2, 5, 100, 100, aisle_every=20, curvature=0.15),
+}
+
+
+def _section_options(spec: dict, section: dict) -> dict:
+    options = {key: section.get(key, spec.get(key, default)) for key, default in DEFAULTS.items()}
+    for key in ("name", "rows", "seats_per_row"):
+        if key not in section:
+            raise ValueError(f"구역 설정에 {key}가 없습니다")
+    if not _SECTION_NAME.match(str(section["name"])):
+        raise ValueError(f"구역 이름은 영문/숫자 1~4자여야 합니다: {section['name']!r}")
+    if section["rows"] < 1 or section["seats_per_row"] < 1:
+        raise ValueError(f"구역 {section['name']}의 행 수/좌석 수는 1 이상이어야 합니다")
+    if options["seat_width"] < 1 or options["seat_height"] < 1:
+        raise ValueError(f"구역 {section['name']}의 좌석 크기는 1 이상이어야 합니다")
+    options.update(name=str(section["name"]), rows=int(section["rows"]),
+                   seats_per_row=int(section["seats_per_row"]),
+                   x=section.get("x", 0), y=section.get("y", 0))
+    return options
+
+
+def count_seats(spec: dict) -> int:
+    """스펙의 총 좌석 수 (좌석을 만들지 않고 계산)"""
+    total = 0
+    for section in spec.get("sections", []):
+        options = _section_options(spec, section)
+        rows, base, increment = options["rows"], options["seats_per_row"], options["row_increment"]
+        total += rows * base + increment * rows * (rows - 1) // 2
+    return total
+
+
+def validate_spec(spec: dict) -> int:
+    """스펙 검증 후 총 좌석 수 반환 (잘못된 스펙이면 ValueError)"""
+    if not spec.get("sections"):
+        raise ValueError("구역(sections)이 하나 이상 필요합니다")
+    names = [str(section.get("name")) for section in spec["sections"]]
+    if len(set(names)) != len(names):
+        raise ValueError("구역 이름이 중복되었습니다")
+    total = count_seats(spec)
+    if total > MAX_VENUE_SEATS:
+        raise ValueError(f"좌석 수 {total}석이 최대 {MAX_VENUE_SEATS}석을 넘습니다")
+    return total
+
+
+def iter_seats(spec: dict):
+    """
+    스펙의 좌석을 하나씩 생성
+
+    (seat_number, row_num, col_num, x_pos, y_pos, width, height) 튜플을 반환하며
+    database.create_event()가 적재하는 seats 컬럼 순서(event_id 제외)와 같습니다.
+    """
+    validate_spec(spec)
+    row_num = 0
+    for section in spec["sections"]:
+        options = _section_options(spec, section)
+        width, height = options["seat_width"], options["seat_height"]
+        pitch = width + options["seat_gap"]
+        row_pitch = height + options["row_gap"]
+        aisle_every, aisle_width = options["aisle_every"], options["aisle_width"]
+
+        def row_width(count):
+            aisles = (count - 1) // aisle_every if aisle_every else 0
+            return count * pitch - options["seat_gap"] + aisles * aisle_width
+
+        widest = row_width(options["seats_per_row"] + options["row_increment"] * (options["rows"] - 1))
+        for r in range(options["rows"]):
+            row_num += 1
+            count = options["seats_per_row"] + options["row_increment"] * r
+            total_width = row_width(count)
+            # 행은 구역의 가장 넓은 행 기준 가운데 정렬
+            left = options["x"] + (widest - total_width) / 2
+            half = max(total_width / 2, 1)
+            base_y = options["y"] + r * row_pitch
+
+            for c in range(count):
+                x = left + c * pitch + ((c // aisle_every) * aisle_width if aisle_every else 0)
+                offset = (x + width / 2 - (left + half)) / half
+                y = base_y + options["curvature"] * half * (1 - offset * offset)
+                seat_number = f"{options['name']}{r + 1}-{c + 1}"
+                if len(seat_number) > SEAT_NUMBER_MAX_LENGTH:
+                    raise ValueError(f"좌석 번호가 너무 깁니다: {seat_number}")
+                yield (seat_number, row_num, c + 1, round(x), round(y), width, height)
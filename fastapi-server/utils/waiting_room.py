@@ -0,0 +1,158 @@
+"""가상 대기실 (입장 제어)
+
+판매 오픈 순간 모든 사용자가 예약/구매 엔드포인트로 몰리지 않도록
+대기열 번호표를 나눠 주고 초당 WAITING_ROOM_RATE명씩만 입장시킵니다.
+
+- 번호표는 순번(seq)이라 대기 순서/예상 대기 시간을 O(1)로 계산합니다.
+- 입장 처리는 토큰 버킷으로 초당 입장 수를 제한하는 백그라운드 루프가 담당합니다.
+- 입장한 사용자는 HMAC 서명된 입장권(쿠키)을 받고, 보호된 엔드포인트는
+  서명/만료 시각만 확인하므로 DB나 워커 간 공유 상태 없이 검증됩니다.
+
+대기열은 워커마다 따로 관리되며 (대기 중인 사용자는 /ws/queue 연결이 붙은 워커에 줄을 섬)
+WAITING_ROOM_RATE는 워커당 입장 속도입니다.
+"""
+import asyncio
+import hashlib
+import hmac
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+from config import (
+    WAITING_ROOM_ENABLED, WAITING_ROOM_RATE, WAITING_ROOM_PASS_TTL, WAITING_ROOM_SECRET
+)
+
+logger = logging.getLogger(__name__)
+
+PASS_COOKIE = "admission_pass"
+
+# .env.example의 예시 값 (그대로 쓰면 누구나 입장권을 위조할 수 있음)
+EXAMPLE_SECRET = "change-this-waiting-room-secret"
+
+# 입장 처리 주기 (초)
+TICK_SECONDS = 0.1
+
+
+def check_waiting_room_secret():
+    """대기실을 켰는데 비밀 키가 없거나 예시 값이면 시작 실패 (워커 시작 시 호출)"""
+    if WAITING_ROOM_ENABLED and WAITING_ROOM_SECRET in ("", EXAMPLE_SECRET):
+        raise RuntimeError("WAITING_ROOM_ENABLED=True에는 WAITING_ROOM_SECRET을 임의의 긴 값으로 설정해야 합니다")
+
+
+def _sign(username: str, expires_at: int) -> str:
+    message = f"{username}:{expires_at}".encode()
+    return hmac.new(WAITING_ROOM_SECRET.encode(), message, hashlib.sha256).hexdigest()[:32]
+
+
+def issue_pass(username: str) -> str:
+    """입장권 발급 ("만료시각.서명")"""
+    expires_at = int(time.time()) + WAITING_ROOM_PASS_TTL
+    return f"{expires_at}.{_sign(username, expires_at)}"
+
+
+def validate_pass(username: str, token: str) -> bool:
+    """입장권 검증 (서명 + 만료 시각, DB 조회 없음)"""
+    if not username or not token:
+        return False
+    expires_at, _, signature = token.partition(".")
+    if not expires_at.isdigit() or int(expires_at) < time.time():
+        return False
+    return hmac.compare_digest(signature, _sign(username, int(expires_at)))
+
+
+def has_admission(cookies, username: str = None) -> bool:
+    """
+    요청 쿠키로 입장 여부 확인 (대기실이 꺼져 있으면 항상 True)
+
+    username을 주면 입장권 주인(쿠키 username)과 실제로 액션을 하는 사용자가
+    같은지도 확인합니다 (남의 이름으로 입장권을 쓰는 요청 거절).
+    """
+    if not WAITING_ROOM_ENABLED:
+        return True
+    if username is not None and username != cookies.get("username"):
+        return False
+    return validate_pass(cookies.get("username"), cookies.get(PASS_COOKIE))
+
+
+class WaitingRoom:
+    """순번 기반 대기열 + 토큰 버킷 입장 제어"""
+
+    def __init__(self, rate: float):
+        self.rate = rate
+        self._lock = threading.Lock()
+        self._queue = OrderedDict()  # username -> seq (대기 중)
+        self._passes = {}  # username -> 입장권 (입장했지만 아직 가져가지 않음)
+        self._next_seq = 0
+        self._head_seq = 0  # 다음에 입장할 순번
+        self._tokens = 0.0
+        self._admitted_total = 0
+
+    def join(self, username: str) -> int:
+        """대기열에 줄 서기 (이미 줄 서 있으면 기존 순번 유지)"""
+        with self._lock:
+            if username in self._queue:
+                return self._queue[username]
+            seq = self._queue[username] = self._next_seq
+            self._next_seq += 1
+            return seq
+
+    def leave(self, username: str):
+        """대기 중 이탈 (연결 종료)"""
+        with self._lock:
+            self._queue.pop(username, None)
+            self._passes.pop(username, None)
+
+    def status(self, username: str) -> dict:
+        """대기 순서 / 예상 대기 시간, 입장했으면 입장권"""
+        with self._lock:
+            token = self._passes.pop(username, None)
+            if token is not None:
+                return {"admitted": True, "token": token}
+            seq = self._queue.get(username)
+            if seq is None:
+                return {"admitted": False, "position": None, "eta_seconds": None}
+            # 앞에서 이탈한 사람이 있을 수 있으므로 최대값 (보수적 추정)
+            position = seq - self._head_seq + 1
+            return {
+                "admitted": False,
+                "position": position,
+                "eta_seconds": round(position / self.rate, 1) if self.rate > 0 else None,
+            }
+
+    def admit(self, elapsed: float) -> int:
+        """경과 시간만큼 토큰을 채우고 그만큼 앞에서부터 입장 (입장 인원 반환)"""
+        admitted = 0
+        with self._lock:
+            # 버스트는 최대 1초 분량
+            self._tokens = min(self._tokens + elapsed * self.rate, max(self.rate, 1.0))
+            while self._queue and self._tokens >= 1:
+                username, seq = self._queue.popitem(last=False)
+                self._passes[username] = issue_pass(username)
+                self._head_seq = seq + 1
+                self._tokens -= 1
+                admitted += 1
+            if not self._queue:
+                self._head_seq = self._next_seq
+            self._admitted_total += admitted
+        return admitted
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "waiting": len(self._queue),
+                "admitted_total": self._admitted_total,
+                "rate": self.rate,
+            }
+
+    async def run(self):
+        """입장 처리 루프 (워커 lifespan 동안 실행)"""
+        last = time.monotonic()
+        while True:
+            await asyncio.sleep(TICK_SECONDS)
+            now = time.monotonic()
+            self.admit(now - last)
+            last = now
+
+
+waiting_room = WaitingRoom(WAITING_ROOM_RATE)